@@ -47,16 +47,49 @@ class Connection:
     async def get_pgcon(self):
         return await self._protocol.get_pgcon()
 
-    async def execute(self, query, *args, graphql=False, flags={}):
+    async def get_server_stats(self):
+        """Return statement profile histograms of the server process."""
+        return await self._protocol.get_stats()
+
+    async def execute(self, query, *args, graphql=False, flags={},
+                      variables=None):
         return await self._protocol.execute_script(
             query,
             *args,
             graphql=graphql,
-            flags=flags)
+            flags=flags,
+            variables=variables)
+
+    async def register_graphql(self, query):
+        """Register a persisted GraphQL query.
+
+        Returns the hash by which the query can be executed with
+        :meth:`execute_persisted`.
+        """
+        return await self._protocol.register_graphql(query)
+
+    async def execute_persisted(self, query_hash, *, variables=None,
+                                operation_name=None, query=None):
+        """Execute a persisted GraphQL query by its hash.
+
+        If *query* is given, it is registered first, so that a query
+        can be persisted on first use.
+        """
+        return await self._protocol.execute_persisted_graphql(
+            query_hash, query=query, variables=variables,
+            operation_name=operation_name)
 
     def get_last_timings(self):
         return self._protocol._last_timings
 
+    def get_last_profile(self):
+        """Return the timings and object counts of the last statements.
+
+        The profile is a list with an entry for every statement of the
+        last executed script.
+        """
+        return self._protocol._last_profile
+
     def close(self):
         self._transport.close()
 
@@ -45,6 +45,14 @@ class NoActiveTransactionError(InvalidTransactionStateError):
     code = '25P01'
 
 
+class PersistedQueryNotFoundError(_base.EdgeDBError):
+    code = '26000'
+
+
+class PersistedQueryHashMismatchError(_base.EdgeDBError):
+    code = '26001'
+
+
 class SchemaError(_base.EdgeDBError):
     code = '32000'
 
@@ -77,5 +85,7 @@ __all__ = _base.__all__ + (
     'ConstraintViolationError',
     'EdgeDBLanguageError',
     'EdgeQLError',
-    'EdgeQLSyntaxError'
+    'EdgeQLSyntaxError',
+    'PersistedQueryNotFoundError',
+    'PersistedQueryHashMismatchError',
 )
@@ -53,6 +53,7 @@ class Protocol(asyncio.Protocol):
         self._state = ConnectionState.NOT_CONNECTED
 
         self._last_timings = None
+        self._last_profile = None
 
         self.buffer = bytearray()
 
@@ -89,12 +90,41 @@ class Protocol(asyncio.Protocol):
 
         return self.send_message(msg)
 
-    def execute_script(self, script, *, graphql=False, flags={}):
+    def get_stats(self):
+        msg = {
+            '__type__': 'get_stats',
+        }
+
+        return self.send_message(msg)
+
+    def execute_script(self, script, *, graphql=False, flags={},
+                       variables=None):
         msg = {
             '__type__': 'script',
             '__graphql__': graphql,
             '__flags__': list(flags),
-            'script': script
+            'script': script,
+            'variables': variables
+        }
+
+        return self.send_message(msg)
+
+    def register_graphql(self, query):
+        msg = {
+            '__type__': 'gql_register',
+            'query': query
+        }
+
+        return self.send_message(msg)
+
+    def execute_persisted_graphql(self, query_hash, *, query=None,
+                                  variables=None, operation_name=None):
+        msg = {
+            '__type__': 'gql_persisted',
+            'hash': query_hash,
+            'query': query,
+            'variables': variables,
+            'operation_name': operation_name
         }
 
         return self.send_message(msg)
@@ -132,6 +162,7 @@ class Protocol(asyncio.Protocol):
             if self._waiter is not None:
                 self._waiter.set_result(message['result'])
                 self._last_timings = message['timings']
+                self._last_profile = message.get('profile')
             self._waiter = None
 
     def _init_connection(self):
@@ -20,11 +20,20 @@
 import copy
 import collections.abc
 import functools
+import os
+import types
 import typing
 
 from edb.lang.common import markup
 
 
+# Field type checks are a debugging aid, they are enabled in __debug__
+# mode unless explicitly disabled with EDGEDB_AST_TYPE_CHECKS=0.
+TYPE_CHECKS = (
+    __debug__ and os.environ.get('EDGEDB_AST_TYPE_CHECKS') != '0'
+)
+
+
 class ASTError(Exception):
     pass
 
@@ -45,6 +54,8 @@ class Field:
 
 class MetaAST(type):
     def __new__(mcls, name, bases, dct):
+        field_names = []
+
         if '__annotations__' in dct:
             module_name = dct['__module__']
             fields_attrname = f'_{name}__fields'
@@ -85,6 +96,19 @@ class MetaAST(type):
 
             dct[fields_attrname] = fields
 
+        for field in dct.get(f'_{name}__fields', ()):
+            field_names.append(field[0] if isinstance(field, tuple) else field)
+
+        if not dct.get('__ast_mixin__'):
+            # Fields are stored in slots (along with any explicitly
+            # declared extra slots), unless the class is a mixin: at most
+            # one of the bases of a class may have a non-empty slot
+            # layout.  Fields of mixins are stored in the instance
+            # __dict__.
+            dct['__slots__'] = tuple(dct.get('__slots__', ())) + tuple(
+                f for f in field_names
+                if f not in dct and not _has_slot(bases, f))
+
         return super().__new__(mcls, name, bases, dct)
 
     def __init__(cls, name, bases, dct):
@@ -136,6 +160,7 @@ class MetaAST(type):
 
 
 class AST(object, metaclass=MetaAST):
+    __slots__ = ('parent',)
     __fields = []
 
     def __init__(self, **kwargs):
@@ -175,7 +200,7 @@ class AST(object, metaclass=MetaAST):
             else:
                 value = None
 
-            if __debug__:
+            if TYPE_CHECKS:
                 self.check_field_type(field, value)
 
             # Bypass overloaded setattr
@@ -193,7 +218,7 @@ class AST(object, metaclass=MetaAST):
             setattr(copied, field, copy.deepcopy(value, memo))
         return copied
 
-    if __debug__:
+    if TYPE_CHECKS:
 
         def __setattr__(self, name, value):
             super().__setattr__(name, value)
@@ -247,6 +272,13 @@ def _serialize_to_markup(ast, *, ctx):
     return node
 
 
+def _has_slot(bases, name):
+    for base in bases:
+        if isinstance(getattr(base, name, None), types.MemberDescriptorType):
+            return True
+    return False
+
+
 @functools.lru_cache(1024)
 def _is_ast_node_type(cls):
     return issubclass(cls, AST)
@@ -23,7 +23,19 @@ from .visitor import NodeVisitor
 
 
 class SourceGenerator(NodeVisitor):
-    """Generate source code from an AST tree."""
+    """Generate source code from an AST tree.
+
+    In non-pretty mode the source is generated as a single line and
+    the written chunks are not validated.
+    """
+
+    # Visitor methods by node class, populated lazily for every
+    # generator class.
+    _visitors = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visitors = {}
 
     def __init__(
             self, indent_with=' ' * 4, add_line_information=False,
@@ -37,10 +49,19 @@ class SourceGenerator(NodeVisitor):
         self.current_line = 1
         self.pretty = pretty
 
+        if not pretty:
+            self.write = self._write_compact
+
     def node_visit(self, node):
-        method = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        node_cls = node.__class__
+        try:
+            visitor = self._visitors[node_cls]
+        except KeyError:
+            cls = type(self)
+            visitor = getattr(
+                cls, 'visit_' + node_cls.__name__, cls.generic_visit)
+            self._visitors[node_cls] = visitor
+        return visitor(self, node)
 
     def write(self, *x, delimiter=None):
         if self.new_lines:
@@ -66,6 +87,18 @@ class SourceGenerator(NodeVisitor):
                     'invalid text chunk in codegen: {!r}'.format(chunk))
             self.result.append(chunk)
 
+    def _write_compact(self, *x, delimiter=None):
+        if self.new_lines:
+            self.result.append(' ')
+            self.new_lines = 0
+        if delimiter:
+            self.result.append(x[0])
+            for v in x[1:]:
+                self.result.append(delimiter)
+                self.result.append(v)
+        else:
+            self.result.extend(x)
+
     def visit_list(
             self, items, *,
             separator=',', terminator=None, newlines=True, **kwargs):
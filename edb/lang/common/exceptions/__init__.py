@@ -67,3 +67,11 @@ class InvalidTransactionStateError(_base.EdgeDBError):
 
 class NoActiveTransactionError(InvalidTransactionStateError):
     code = '25P01'
+
+
+class PersistedQueryNotFoundError(_base.EdgeDBError):
+    code = '26000'
+
+
+class PersistedQueryHashMismatchError(_base.EdgeDBError):
+    code = '26001'
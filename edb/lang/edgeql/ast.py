@@ -122,6 +122,12 @@ class Cardinality(s_enum.StrEnum):
     DEFAULT = ''
 
 
+class ShapeOp(s_enum.StrEnum):
+    ASSIGN = ':='
+    APPEND = '+='
+    SUBTRACT = '-='
+
+
 class Base(ast.AST):
     __ast_hidden__ = {'context'}
     context: parsing.ParserContext
@@ -340,6 +346,8 @@ class Statement(Expr):
 
 
 class SubjStatement(Statement):
+    __ast_mixin__ = True
+
     subject: Expr
     subject_alias: str
 
@@ -389,6 +397,7 @@ class ShapeElement(Expr):
     offset: Expr
     limit: Expr
     compexpr: Expr
+    operation: ShapeOp = ShapeOp.ASSIGN
     recurse: bool = False
     recurse_limit: typing.Union[Constant, Parameter]
 
@@ -418,6 +427,14 @@ class RollbackTransaction(Transaction):
     pass
 
 
+# EXPLAIN
+#
+
+class ExplainStmt(Base):
+    query: Statement
+    analyze: bool = False
+
+
 # DDL
 #
 
@@ -56,7 +56,8 @@ class EdgeQLSourceGenerator(codegen.SourceGenerator):
     def _needs_parentheses(self, node):
         return (
             isinstance(node.parent, edgeql_ast.Base) and
-            not isinstance(node.parent, edgeql_ast.DDL)
+            not isinstance(node.parent, (edgeql_ast.DDL,
+                                         edgeql_ast.ExplainStmt))
         )
 
     def generic_visit(self, node, *args, **kwargs):
@@ -475,7 +476,7 @@ class EdgeQLSourceGenerator(codegen.SourceGenerator):
             self.visit(node.limit)
 
         if node.compexpr:
-            self.write(' := ')
+            self.write(f' {node.operation} ')
             self.visit(node.compexpr)
 
     def visit_Parameter(self, node):
@@ -1014,6 +1015,12 @@ class EdgeQLSourceGenerator(codegen.SourceGenerator):
             self.write(' = ')
             self.visit(node.default)
 
+    def visit_ExplainStmt(self, node):
+        self.write('EXPLAIN ')
+        if node.analyze:
+            self.write('ANALYZE ')
+        self.visit(node.query)
+
     def visit_SessionStateDecl(self, node):
         self.write('SET')
         self._block_ws(1)
@@ -98,6 +98,9 @@ class ContextLevel(compiler.ContextLevel):
                             typing.Tuple[qlast.Expr, compiler.ContextLevel]]
     """A mapping of computable pointers to QL source AST and context."""
 
+    shape_ops: typing.Dict[s_pointers.Pointer, qlast.ShapeOp]
+    """A mapping of UPDATE shape pointers to incremental operations."""
+
     view_nodes: typing.Dict[s_name.SchemaName, s_nodes.Node]
     """A dictionary of newly derived Node classes representing views."""
 
@@ -183,6 +186,7 @@ class ContextLevel(compiler.ContextLevel):
             self.arguments = {}
             self.all_sets = []
             self.stmt_metadata = {}
+            self.shape_ops = {}
 
             self.source_map = {}
             self.view_nodes = {}
@@ -221,6 +225,7 @@ class ContextLevel(compiler.ContextLevel):
             self.arguments = prevlevel.arguments
             self.all_sets = prevlevel.all_sets
             self.stmt_metadata = prevlevel.stmt_metadata
+            self.shape_ops = prevlevel.shape_ops
 
             self.source_map = prevlevel.source_map
             self.view_nodes = prevlevel.view_nodes
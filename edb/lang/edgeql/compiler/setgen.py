@@ -620,6 +620,7 @@ def computable_ptr_set(
     subctx.anchors[qlast.Source] = self_
 
     subctx.aliases = ctx.aliases
+    subctx.arguments = ctx.arguments
     subctx.stmt = ctx.stmt
     subctx.view_scls = ptrcls.target
     subctx.view_rptr = context.ViewRPtr(source_scls, ptrcls, rptr=rptr)
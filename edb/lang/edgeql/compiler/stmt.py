@@ -290,6 +290,12 @@ def compile_UpdateQuery(
             is_update=True,
             ctx=ictx)
 
+        stmt.shape_ops = {
+            el.rptr.ptrcls: ictx.shape_ops[el.rptr.ptrcls]
+            for el in stmt.subject.shape
+            if el.rptr.ptrcls in ictx.shape_ops
+        }
+
         stmt.result = setgen.class_set(
             stmt.subject.scls.material_type(), ctx=ctx)
 
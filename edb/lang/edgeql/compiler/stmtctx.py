@@ -101,6 +101,7 @@ def fini_expression(
         scope_tree=ctx.path_scope,
         cardinality=cardinality,
         view_shapes=ctx.class_shapes,
+        set_count=len(ctx.all_sets),
     )
     irutils.infer_type(result, schema=ctx.schema)
     return result
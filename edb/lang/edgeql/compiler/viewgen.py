@@ -31,6 +31,7 @@ from edb.lang.schema import lproperties as s_props
 from edb.lang.schema import name as sn
 from edb.lang.schema import nodes as s_nodes
 from edb.lang.schema import pointers as s_pointers
+from edb.lang.schema import scalars as s_scalars
 from edb.lang.schema import sources as s_sources
 from edb.lang.schema import types as s_types
 
@@ -372,6 +373,11 @@ def _normalize_view_ptr_expr(
         if is_mutation and base_ptrcls.singular():
             pathctx.enforce_singleton(irexpr, ctx=ctx)
 
+        if shape_el.operation != qlast.ShapeOp.ASSIGN:
+            _validate_shape_op(
+                shape_el, base_ptrcls, is_linkprop=is_linkprop,
+                is_update=is_update)
+
     if qlexpr is not None or ptr_target is not ptrcls.target:
         if not ptrcls_is_derived:
             if ptrcls.is_link_property():
@@ -396,6 +402,9 @@ def _normalize_view_ptr_expr(
             ctx.source_map[ptrcls] = (qlexpr, ctx)
             ptrcls.computable = True
 
+    if compexpr is not None and shape_el.operation != qlast.ShapeOp.ASSIGN:
+        ctx.shape_ops[ptrcls] = shape_el.operation
+
     if not is_mutation:
         ptrcls.cardinality = ptr_cardinality
 
@@ -406,6 +415,29 @@ def _normalize_view_ptr_expr(
     return ptrcls
 
 
+def _validate_shape_op(
+        shape_el: qlast.ShapeElement, ptrcls: s_pointers.Pointer, *,
+        is_linkprop: bool, is_update: bool) -> None:
+    op = shape_el.operation
+
+    if not is_update:
+        raise errors.EdgeQLError(
+            f'{op!s} is only allowed in UPDATE shapes',
+            context=shape_el.context)
+
+    if (is_linkprop or not isinstance(ptrcls, s_links.Link) or
+            isinstance(ptrcls.target, s_scalars.ScalarType)):
+        raise errors.EdgeQLError(
+            f'{op!s} can only be applied to links to object types',
+            context=shape_el.context)
+
+    if ptrcls.singular():
+        raise errors.EdgeQLError(
+            f'{op!s} cannot be applied to the singular link '
+            f'{ptrcls.shortname.name!r}, use := instead',
+            context=shape_el.context)
+
+
 def _link_has_shape(
         ptrcls: s_pointers.Pointer, *,
         ctx: context.ContextLevel) -> bool:
@@ -331,6 +331,16 @@ class ShapeElement(Nonterm):
         self.val = kids[0].val
         self.val.compexpr = kids[2].val
 
+    def reduce_ShapePointer_ADDASSIGN_Expr(self, *kids):
+        self.val = kids[0].val
+        self.val.compexpr = kids[2].val
+        self.val.operation = qlast.ShapeOp.APPEND
+
+    def reduce_ShapePointer_REMASSIGN_Expr(self, *kids):
+        self.val = kids[0].val
+        self.val.compexpr = kids[2].val
+        self.val.operation = qlast.ShapeOp.SUBTRACT
+
 
 class ShapeElementList(ListNonterm, element=ShapeElement,
                        separator=tokens.T_COMMA):
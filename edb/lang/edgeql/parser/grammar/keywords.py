@@ -30,6 +30,7 @@ unreserved_keywords = frozenset([
     "abstract",
     "action",
     "after",
+    "analyze",
     "any",
     "array",
     "as",
@@ -91,7 +92,7 @@ reserved_keywords = frozenset([
     "else",
     "empty",
     "exists",
-    "explain",  # future reserved keyword
+    "explain",
     "extending",
     "false",
     "filter",
@@ -38,6 +38,9 @@ class Stmt(Nonterm):
     def reduce_ExprStmt(self, *kids):
         self.val = kids[0].val
 
+    def reduce_ExplainStmt(self, *kids):
+        self.val = kids[0].val
+
 
 class StartTransactionStmt(Nonterm):
     def reduce_START_TRANSACTION(self, *kids):
@@ -52,3 +55,11 @@ class CommitTransactionStmt(Nonterm):
 class RollbackTransactionStmt(Nonterm):
     def reduce_ROLLBACK(self, *kids):
         self.val = qlast.RollbackTransaction()
+
+
+class ExplainStmt(Nonterm):
+    def reduce_EXPLAIN_ExprStmt(self, *kids):
+        self.val = qlast.ExplainStmt(query=kids[1].val)
+
+    def reduce_EXPLAIN_ANALYZE_ExprStmt(self, *kids):
+        self.val = qlast.ExplainStmt(query=kids[2].val, analyze=True)
@@ -133,6 +133,14 @@ class T_TURNSTILE(Token):
     pass
 
 
+class T_ADDASSIGN(Token):
+    pass
+
+
+class T_REMASSIGN(Token):
+    pass
+
+
 class T_ARROW(Token):
     pass
 
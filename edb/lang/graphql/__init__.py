@@ -20,4 +20,4 @@
 from . import ast  # NOQA
 from .codegen import generate_source  # NOQA
 from .parser import parse, parse_fragment  # NOQA
-from .translator import translate  # NOQA
+from .translator import translate, translate_ast  # NOQA
@@ -17,7 +17,8 @@
 #
 
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+import copy
 from graphql import graphql as gql_proc, GraphQLString, GraphQLID
 import json
 import re
@@ -27,6 +28,7 @@ from edb.lang.common import ast
 from edb.lang.edgeql import ast as qlast
 from edb.lang.graphql import ast as gqlast, parser as gqlparser
 from edb.lang.schema import error as s_error
+from edb.lang.schema import types as s_types
 
 from . import types as gt
 from .errors import GraphQLValidationError, GraphQLCoreError
@@ -41,6 +43,8 @@ class GraphQLTranslatorContext:
         self.fragments = {}
         self.validated_fragments = {}
         self.vars = {}
+        self.argtypes = {}
+        self.argdefaults = {}
         self.fields = []
         self.path = []
         self.include_base = [False]
@@ -53,6 +57,9 @@ class GraphQLTranslatorContext:
 
 Step = namedtuple('Step', ['name', 'type'])
 Field = namedtuple('Field', ['name', 'value'])
+TranslatedOperation = namedtuple(
+    'TranslatedOperation',
+    ['name', 'stmt', 'critvars', 'argtypes', 'argdefaults'])
 
 
 class GraphQLTranslator(ast.NodeVisitor):
@@ -124,6 +131,12 @@ class GraphQLTranslator(ast.NodeVisitor):
                 el.compexpr.expr.value = json.dumps(
                     gqlresult.data[name], indent=4)
 
+                # the json is computed using all of the variables, so
+                # every one of them is critical to the query
+                eql[1][:] = sorted(
+                    (name, val)
+                    for name, (val, crit) in self._context.vars.items())
+
         return translated
 
     def visit_FragmentDefinition(self, node):
@@ -136,6 +149,8 @@ class GraphQLTranslator(ast.NodeVisitor):
         self._context.vars = {
             name: [val, False]
             for name, val in self._context.variables.items()}
+        self._context.argtypes = {}
+        self._context.argdefaults = {}
         opname = None
 
         if (self._context.operation_name and
@@ -159,7 +174,8 @@ class GraphQLTranslator(ast.NodeVisitor):
                     in self._context.vars.items() if crit]
         critvars.sort()
 
-        return (opname, (stmt, critvars))
+        return (opname, (stmt, critvars, self._context.argtypes,
+                         self._context.argdefaults))
 
     def _visit_query(self, node):
         # populate input variables with defaults, where applicable
@@ -225,6 +241,27 @@ class GraphQLTranslator(ast.NodeVisitor):
             else:
                 variables[node.name] = [node.value.topython(), False]
 
+        # variables are passed to EdgeQL as typed query parameters
+        argtype = self._get_variable_type(node.type)
+        if argtype is not None:
+            self._context.argtypes[node.name[1:]] = argtype
+
+        if node.value is not None:
+            self._context.argdefaults[node.name[1:]] = node.value.topython()
+
+    def _get_variable_type(self, vartype):
+        if vartype.list:
+            subtype = self._get_variable_type(vartype.name)
+            if subtype is None:
+                return None
+            return s_types.Array.from_subtypes([subtype])
+
+        name = gt.GQL_TO_EDB_SCALARS_MAP.get(vartype.name)
+        if name is None:
+            return None
+
+        return self._context.schema.get(name)
+
     def visit_SelectionSet(self, node):
         elements = []
 
@@ -578,31 +615,114 @@ class GraphQLTranslator(ast.NodeVisitor):
             return results
 
 
-def translate(schema, graphql, *, variables=None, operation_name=None,
-              modules=None):
+# Translations of the most recently used GraphQL documents.
+_translations = OrderedDict()
+_TRANSLATION_CACHE_SIZE = 256
+
+_missing = object()
+
+
+class _CachedTranslation:
+    def __init__(self, schema):
+        self.schema = schema
+        self.variants = []
+
+    def lookup(self, variables):
+        for names, values, translated in self.variants:
+            if tuple(variables.get(n, _missing) for n in names) == values:
+                return translated
+
+    def add(self, names, variables, translated):
+        values = tuple(variables.get(n, _missing) for n in names)
+        self.variants.append((names, values, translated))
+
+
+def translate_ast(schema, graphql, *, variables=None, operation_name=None,
+                  modules=None, schema_version=None):
+    '''Translate a GraphQL document into EdgeQL AST.
+
+    Returns a list of TranslatedOperation tuples sorted by operation
+    name.  Besides the EdgeQL statement, each tuple contains the list
+    of critical variables, and the types and default values of query
+    parameters the variables are translated into.
+
+    Translations are cached by the document text, the operation name
+    and the values of the variables that are critical to the shape of
+    the query (the ones used in @include and @skip directives), other
+    variables are passed to EdgeQL as query parameters.  The returned
+    statements are always fresh copies and may be modified freely.
+
+    The cache is shared by all schema objects with the same
+    *schema_version* (see types.get_core_schema()).
+    '''
+
     if variables is None:
         variables = {}
 
     if modules is None:
         modules = set(modules) | {'default'}
 
-    # HACK
-    query = re.sub(r'@edgedb\(.*?\)', '', graphql)
-    schema2 = gt.GQLCoreSchema(schema, *modules)._gql_schema
+    if schema_version is not None:
+        schema_key = schema_version
+    else:
+        schema_key = id(schema)
+
+    key = (schema_key, frozenset(modules), graphql, operation_name)
+
+    entry = _translations.get(key)
+    if entry is None or (schema_version is None and
+                         entry.schema is not schema):
+        entry = _translations[key] = _CachedTranslation(schema)
+        if len(_translations) > _TRANSLATION_CACHE_SIZE:
+            _translations.popitem(last=False)
+    else:
+        _translations.move_to_end(key)
+
+    translated = entry.lookup(variables)
+
+    if translated is None:
+        # HACK
+        query = re.sub(r'@edgedb\(.*?\)', '', graphql)
+        schema2 = gt.get_core_schema(
+            schema, modules, schema_version=schema_version)._gql_schema
+
+        parser = gqlparser.GraphQLParser()
+        gqltree = parser.parse(graphql)
+        context = GraphQLTranslatorContext(
+            schema=schema, gqlcore=schema2, query=query,
+            variables=variables, operation_name=operation_name,
+            modules=modules)
+        edge_forest_map = GraphQLTranslator(context=context).visit(gqltree)
+
+        translated = [
+            TranslatedOperation(name, *op)
+            for name, op in sorted(edge_forest_map.items())
+        ]
+
+        names = tuple(sorted({
+            vname for op in translated for vname, _ in op.critvars
+        }))
+
+        entry.add(names, variables, translated)
+
+    return [
+        op._replace(stmt=copy.deepcopy(op.stmt)) for op in translated
+    ]
+
+
+def translate(schema, graphql, *, variables=None, operation_name=None,
+              modules=None):
+    translated = translate_ast(
+        schema, graphql, variables=variables,
+        operation_name=operation_name, modules=modules)
 
-    parser = gqlparser.GraphQLParser()
-    gqltree = parser.parse(graphql)
-    context = GraphQLTranslatorContext(
-        schema=schema, gqlcore=schema2, query=query,
-        variables=variables, operation_name=operation_name, modules=modules)
-    edge_forest_map = GraphQLTranslator(context=context).visit(gqltree)
     code = []
-    for name, (tree, critvars) in sorted(edge_forest_map.items()):
-        if name:
-            code.append(f'# {name}')
-        if critvars:
-            crit = [f'{vname}={val!r}' for vname, val in critvars]
+    for op in translated:
+        if op.name:
+            code.append(f'# {op.name}')
+        if op.critvars:
+            crit = [f'{vname}={val!r}' for vname, val in op.critvars]
             code.append(f'# critical variables: {", ".join(crit)}')
-        code += [edgeql.generate_source(tree), ';']
+        code += [edgeql.generate_source(op.stmt), ';']
 
     return '\n'.join(code)
@@ -18,7 +18,7 @@
 
 
 from collections import OrderedDict
-from functools import partial, lru_cache
+from functools import partial
 from graphql import (
     GraphQLSchema,
     GraphQLObjectType,
@@ -64,6 +64,15 @@ EDB_TO_GQL_SCALARS_MAP = {
 }
 
 
+GQL_TO_EDB_SCALARS_MAP = {
+    'String': 'std::str',
+    'Int': 'std::int64',
+    'Float': 'std::float64',
+    'Boolean': 'std::bool',
+    'ID': 'std::uuid',
+}
+
+
 class GQLCoreSchema:
     def __init__(self, edb_schema, *modules):
         '''Create a graphql schema based on specific modules from edgedb.'''
@@ -74,6 +83,7 @@ class GQLCoreSchema:
         self._gql_interfaces = {}
         self._gql_objtypes = {}
         self._gql_fields = {}
+        self._gql_args = {}
 
         self._define_types()
 
@@ -126,8 +136,13 @@ class GQLCoreSchema:
 
         return target
 
-    @lru_cache(maxsize=None)
     def get_fields(self, typename):
+        fields = self._gql_fields.get(typename)
+        if fields is None:
+            fields = self._gql_fields[typename] = self._get_fields(typename)
+        return fields
+
+    def _get_fields(self, typename):
         fields = OrderedDict()
 
         if typename == 'Query':
@@ -155,8 +170,13 @@ class GQLCoreSchema:
 
         return fields
 
-    @lru_cache(maxsize=None)
     def get_args(self, typename):
+        args = self._gql_args.get(typename)
+        if args is None:
+            args = self._gql_args[typename] = self._get_args(typename)
+        return args
+
+    def _get_args(self, typename):
         args = OrderedDict()
 
         edb_type = self.edb_schema.get(typename)
@@ -218,6 +238,38 @@ class GQLCoreSchema:
             self._gql_objtypes[t.name] = gqltype
 
 
+# GQLCoreSchema instances for the most recently used EdgeDB schemas.
+_core_schemas = OrderedDict()
+_CORE_SCHEMA_CACHE_SIZE = 16
+
+
+def get_core_schema(edb_schema, modules, *, schema_version=None):
+    '''Return a (cached) GQLCoreSchema for the given schema and modules.
+
+    The cache is keyed by *schema_version*, which identifies the state
+    of the schema in the database, so the backends of all connections
+    share the same GQLCoreSchema.  If the version is not known, the
+    cache is keyed by the identity of the EdgeDB schema object.
+    '''
+
+    if schema_version is not None:
+        key = (schema_version, frozenset(modules))
+    else:
+        key = (id(edb_schema), frozenset(modules))
+
+    core_schema = _core_schemas.get(key)
+    if core_schema is None or (schema_version is None and
+                               core_schema.edb_schema is not edb_schema):
+        core_schema = GQLCoreSchema(edb_schema, *sorted(modules))
+        _core_schemas[key] = core_schema
+        if len(_core_schemas) > _CORE_SCHEMA_CACHE_SIZE:
+            _core_schemas.popitem(last=False)
+    else:
+        _core_schemas.move_to_end(key)
+
+    return core_schema
+
+
 def get_fkey(*args):
     '''Make a hashable key from args.'''
 
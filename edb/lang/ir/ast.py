@@ -44,6 +44,7 @@ SetOperator = qlast.SetOperator
 SetModifier = qlast.SetModifier
 SetQualifier = qlast.SetQualifier
 Cardinality = qlast.Cardinality
+ShapeOp = qlast.ShapeOp
 
 UNION = qlast.UNION
 
@@ -57,6 +58,9 @@ class ASTError(EdgeDBError):
 
 class Base(ast.AST):
 
+    # Type and cardinality inference caches.
+    __slots__ = ('_inferred_type_', '_inferred_cardinality_')
+
     __ast_hidden__ = {'context'}
 
     context: parsing.ParserContext
@@ -114,6 +118,7 @@ class Statement(Command):
     scope_map: typing.Dict[Set, str]
     source_map: typing.Dict[s_pointers.Pointer,
                             typing.Tuple[qlast.Expr, compiler.ContextLevel]]
+    set_count: int
 
 
 class Expr(Base):
@@ -298,6 +303,7 @@ class InsertStmt(MutatingStmt):
 class UpdateStmt(MutatingStmt):
 
     where: Base
+    shape_ops: typing.Dict[s_pointers.Pointer, qlast.ShapeOp]
 
 
 class DeleteStmt(MutatingStmt):
@@ -26,9 +26,13 @@ from edb.lang.schema import types as s_types
 class PathId:
     """Unique identifier of a path in an expression."""
 
-    __slots__ = ('_path', '_norm_path', '_namespace', '_is_ptr')
+    __slots__ = ('_path', '_norm_path', '_namespace', '_is_ptr', '_hash')
 
     def __init__(self, initializer=None, *, namespace=None):
+        # PathIds are immutable once constructed, so the hash is
+        # computed once on first use (see __hash__).
+        self._hash = None
+
         if isinstance(initializer, PathId):
             self._path = initializer._path
             self._norm_path = initializer._norm_path
@@ -57,13 +61,25 @@ class PathId:
             self._is_ptr = False
 
     def __hash__(self):
-        return hash((
-            self.__class__, self._norm_path, self._namespace, self._is_ptr))
+        if self._hash is None:
+            self._hash = hash((
+                self.__class__, self._norm_path, self._namespace,
+                self._is_ptr))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
+
         if not isinstance(other, PathId):
             return NotImplemented
 
+        # Only use the hashes if both are already computed: computing
+        # them here costs more than comparing the paths.
+        if (self._hash is not None and other._hash is not None and
+                self._hash != other._hash):
+            return False
+
         return (
             self._norm_path == other._norm_path and
             self._namespace == other._namespace and
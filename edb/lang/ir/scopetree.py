@@ -68,8 +68,8 @@ class ScopeTreeNode:
 
     def __init__(self, *, path_id: typing.Optional[pathid.PathId]=None,
                  fenced: bool=False, unique_id: typing.Optional[int]=None):
-        self.unique_id = unique_id
-        self.path_id = path_id
+        self._unique_id = unique_id
+        self._path_id = path_id
         self.fenced = fenced
         self.protect_parent = False
         self.unnest_fence = False
@@ -77,6 +77,9 @@ class ScopeTreeNode:
         self.children = set()
         self.namespaces = set()
         self._parent = None
+        # Path and unique id index of the tree, only maintained
+        # on the root node and built lazily.
+        self._index = None
 
     def __repr__(self):
         return (f'<{type(self).__name__} '
@@ -97,6 +100,32 @@ class ScopeTreeNode:
 
         return cp
 
+    @property
+    def unique_id(self) -> typing.Optional[int]:
+        return self._unique_id
+
+    @unique_id.setter
+    def unique_id(self, unique_id: typing.Optional[int]) -> None:
+        index = self.root._index
+        if index is not None:
+            index.discard(self)
+        self._unique_id = unique_id
+        if index is not None:
+            index.add(self)
+
+    @property
+    def path_id(self) -> typing.Optional[pathid.PathId]:
+        return self._path_id
+
+    @path_id.setter
+    def path_id(self, path_id: typing.Optional[pathid.PathId]) -> None:
+        index = self.root._index
+        if index is not None:
+            index.discard(self)
+        self._path_id = path_id
+        if index is not None:
+            index.add(self)
+
     @property
     def name(self):
         if self.path_id is None:
@@ -357,8 +386,9 @@ class ScopeTreeNode:
 
         matching = set()
 
-        for node in self.descendants:
-            if _paths_equal_to_shortest_ns(node.path_id, path_id):
+        for node in self._get_index().get_nodes(path_id):
+            if (_paths_equal_to_shortest_ns(node.path_id, path_id) and
+                    _is_descendant(node, self)):
                 matching.add(node)
 
         for node in matching:
@@ -426,14 +456,20 @@ class ScopeTreeNode:
     def find_visible(self, path_id: pathid.PathId) \
             -> typing.Optional['ScopeTreeNode']:
         """Find the visible node with the given *path_id*."""
+        candidates = self._get_index().get_nodes(path_id)
+        if not candidates:
+            return None
+
         namespaces = set()
 
         for node, ans in self.ancestors_and_namespaces:
-            if _paths_equal(node.path_id, path_id, namespaces):
+            if (node in candidates and
+                    _paths_equal(node.path_id, path_id, namespaces)):
                 return node
 
-            for child in node.children:
-                if _paths_equal(child.path_id, path_id, namespaces):
+            for child in candidates:
+                if (child.parent is node and
+                        _paths_equal(child.path_id, path_id, namespaces)):
                     return child
 
             namespaces |= ans
@@ -460,21 +496,24 @@ class ScopeTreeNode:
 
     def find_descendant(self, path_id: pathid.PathId) \
             -> typing.Optional['ScopeTreeNode']:
-        for child in self.strict_descendants:
-            if child.path_id == path_id:
-                return child
+        for node in self._get_index().get_nodes(path_id):
+            if (node.path_id == path_id and node is not self and
+                    _is_descendant(node, self)):
+                return node
 
         return None
 
     def find_unfenced(self, path_id: pathid.PathId) \
             -> typing.Tuple[typing.Optional['ScopeTreeNode'], bool]:
         """Find the unfenced node with the given *path_id*."""
+        candidates = self._get_index().get_nodes(path_id)
         namespaces = set()
         unnest_fence_seen = False
 
         for node, ans in self.ancestors_and_namespaces:
-            for descendant in node.unfenced_descendants:
-                if _paths_equal(descendant.path_id, path_id, namespaces):
+            for descendant in candidates:
+                if (_is_unfenced_descendant(descendant, node) and
+                        _paths_equal(descendant.path_id, path_id, namespaces)):
                     return descendant, unnest_fence_seen
 
             namespaces |= ans
@@ -484,8 +523,8 @@ class ScopeTreeNode:
 
     def find_by_unique_id(self, unique_id: int) \
             -> typing.Optional['ScopeTreeNode']:
-        for node in self.descendants:
-            if node.unique_id == unique_id:
+        for node in self._get_index().unique_ids.get(unique_id, ()):
+            if _is_descendant(node, self):
                 return node
 
         return None
@@ -526,6 +565,13 @@ class ScopeTreeNode:
         else:
             return f'"{self.debugname}"'
 
+    def _get_index(self) -> '_ScopeTreeIndex':
+        root = self.root
+        if root._index is None:
+            root._index = _ScopeTreeIndex()
+            root._index.add_subtree(root)
+        return root._index
+
     def _set_parent(self, parent):
         current_parent = self.parent
         if parent is current_parent:
@@ -534,14 +580,94 @@ class ScopeTreeNode:
         if current_parent is not None:
             # Make sure no other node refers to us.
             current_parent.children.remove(self)
+            index = current_parent.root._index
+            if index is not None:
+                index.discard_subtree(self)
+        else:
+            # We are no longer the root of a tree.
+            self._index = None
 
         if parent is not None:
             self._parent = weakref.ref(parent)
             parent.children.add(self)
+            index = parent.root._index
+            if index is not None:
+                index.add_subtree(self)
         else:
             self._parent = None
 
 
+class _ScopeTreeIndex:
+    """Index of scope tree nodes by path id and by unique id.
+
+    Path ids are indexed with their namespace stripped, so a lookup
+    returns a superset of nodes that might match a given path id under
+    any namespace, and callers are expected to do the precise match.
+    """
+
+    __slots__ = ('paths', 'unique_ids')
+
+    def __init__(self):
+        self.paths = {}
+        self.unique_ids = {}
+
+    def get_nodes(self, path_id: pathid.PathId) -> typing.Set[ScopeTreeNode]:
+        return self.paths.get(path_id.replace_namespace(None), frozenset())
+
+    def add(self, node: ScopeTreeNode) -> None:
+        if node.path_id is not None:
+            key = node.path_id.replace_namespace(None)
+            self.paths.setdefault(key, set()).add(node)
+
+        if node.unique_id is not None:
+            self.unique_ids.setdefault(node.unique_id, set()).add(node)
+
+    def discard(self, node: ScopeTreeNode) -> None:
+        if node.path_id is not None:
+            key = node.path_id.replace_namespace(None)
+            nodes = self.paths.get(key)
+            if nodes is not None:
+                nodes.discard(node)
+                if not nodes:
+                    del self.paths[key]
+
+        if node.unique_id is not None:
+            nodes = self.unique_ids.get(node.unique_id)
+            if nodes is not None:
+                nodes.discard(node)
+                if not nodes:
+                    del self.unique_ids[node.unique_id]
+
+    def add_subtree(self, node: ScopeTreeNode) -> None:
+        for descendant in node.descendants:
+            self.add(descendant)
+
+    def discard_subtree(self, node: ScopeTreeNode) -> None:
+        for descendant in node.descendants:
+            self.discard(descendant)
+
+
+def _is_descendant(node: ScopeTreeNode, ancestor: ScopeTreeNode) -> bool:
+    """Return True if *node* is *ancestor* or one of its descendants."""
+    while node is not None:
+        if node is ancestor:
+            return True
+        node = node.parent
+
+    return False
+
+
+def _is_unfenced_descendant(node: ScopeTreeNode,
+                            ancestor: ScopeTreeNode) -> bool:
+    """Return True if *node* is one of *ancestor*'s unfenced_descendants."""
+    while node is not ancestor:
+        if node is None or node.fenced:
+            return False
+        node = node.parent
+
+    return True
+
+
 def _paths_equal(path_id_1: pathid.PathId, path_id_2: pathid.PathId,
                  namespaces: typing.Set[str]) -> bool:
     if path_id_1 is None or path_id_2 is None:
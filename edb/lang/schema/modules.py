@@ -204,6 +204,55 @@ class Module(named.NamedObject):
         return checksum
 
 
+class ModuleOverlay(Module):
+    """A copy-on-write view of a schema module.
+
+    Objects added to, or deleted from the overlay are recorded locally,
+    lookups fall through to the *base* module, which is never modified.
+    """
+
+    def __init__(self, base):
+        super().__init__(name=base.name, imports=base.imports)
+        self.base = base
+        self.deleted = set()
+
+    def add(self, obj):
+        super().add(obj)
+        self.deleted.discard(obj.name)
+
+    def discard(self, obj):
+        existing = super().discard(obj)
+        if existing is None and obj.name not in self.deleted:
+            existing = self.base.lookup_qname(obj.name)
+            if existing is not None:
+                self.deleted.add(obj.name)
+        return existing
+
+    def lookup_qname(self, name):
+        obj = self.index_by_name.get(name)
+        if obj is None and name not in self.deleted:
+            obj = self.base.lookup_qname(name)
+        return obj
+
+    def get_functions(self, name):
+        funcs = [f for f in (self.base.get_functions(name) or ())
+                 if f.name not in self.deleted and
+                 f.name not in self.index_by_name]
+        funcs.extend(self.funcs_by_name.get(name, ()))
+        return funcs or None
+
+    def get_objects(self, *, type=None, include_derived=False):
+        base_objects = self.base.get_objects(
+            type=type, include_derived=include_derived)
+        for obj in base_objects:
+            if (obj.name not in self.deleted and
+                    obj.name not in self.index_by_name):
+                yield obj
+
+        yield from super().get_objects(
+            type=type, include_derived=include_derived)
+
+
 class SchemaIterator:
     def __init__(self, module, type, include_derived=False):
         self.module = module
@@ -253,9 +253,8 @@ class Schema(TypeContainer):
     def _get_descendants(self, scls, *, max_depth=None, depth=0):
         result = set()
 
-        try:
-            children = scls._virtual_children
-        except AttributeError:
+        children = self._get_virtual_children(scls)
+        if children is None:
             try:
                 child_names = self._inheritance_cache[scls.name]
                 raise KeyError
@@ -276,6 +275,9 @@ class Schema(TypeContainer):
         result.update(children)
         return result
 
+    def _get_virtual_children(self, scls):
+        return getattr(scls, '_virtual_children', None)
+
     def _find_children(self, scls):
         flt = lambda p: scls in p.bases
         it = self.get_objects(type=scls._type)
@@ -320,9 +322,19 @@ class Schema(TypeContainer):
 
 
 class SchemaOverlay(Schema):
+    """A copy-on-write delta over a shared base schema.
+
+    Modifications made through the overlay never touch the base schema:
+    objects are added to, or deleted from per-module overlays, and the
+    inheritance caches are copied before being updated.  This allows
+    any number of overlays (e.g. per-query view derivations) to be
+    created over a single schema instance independently.
+    """
+
     def __init__(self, schema, extra=None):
         self.schema = schema
         self.local_modules = collections.OrderedDict()
+        self.deleted_modules = set()
         self.modules = collections.ChainMap(self.local_modules, schema.modules)
         self.deltas = collections.OrderedDict()
 
@@ -330,6 +342,7 @@ class SchemaOverlay(Schema):
         self._local_vic = {}
         self._virtual_inheritance_cache = collections.ChainMap(
             self._local_vic, schema._virtual_inheritance_cache)
+        self._local_virtual_children = {}
         self._local_ic = {}
         self._inheritance_cache = collections.ChainMap(
             self._local_ic, schema._inheritance_cache)
@@ -339,30 +352,128 @@ class SchemaOverlay(Schema):
                 if hasattr(v, '_type'):
                     self.add(v)
 
+    def add_module(self, class_module):
+        name = class_module.name
+        self.local_modules[name] = class_module
+        self.deleted_modules.discard(name)
+        self._policy_schema = None
+
+    def get_module(self, module):
+        modules = self._resolve_module(module)
+        if not modules:
+            raise KeyError(module)
+        return modules[0]
+
     def has_module(self, module):
-        return module in self.modules
+        return bool(self._resolve_module(module))
 
     def get_modules(self):
-        yield from self.local_modules.values()
-        yield from self.schema.get_modules()
+        for module in self.schema.get_modules():
+            if module.name in self.deleted_modules:
+                continue
+            yield self.local_modules.get(module.name, module)
+
+        for name, module in self.local_modules.items():
+            if not self.schema.has_module(name):
+                yield module
+
+    def delete_module(self, class_module):
+        if isinstance(class_module, str):
+            module_name = class_module
+        else:
+            module_name = class_module.name
+
+        local_module = self.local_modules.pop(module_name, None)
+
+        if self.schema.has_module(module_name):
+            self.deleted_modules.add(module_name)
+        elif local_module is None:
+            raise KeyError(module_name)
+
+    def _get_local_module(self, module_name):
+        module = self.local_modules.get(module_name)
+        if module is None:
+            if module_name in self.deleted_modules:
+                base_modules = None
+            else:
+                base_modules = self.schema._resolve_module(module_name)
+
+            if base_modules:
+                module = s_modules.ModuleOverlay(base_modules[0])
+            else:
+                module = s_modules.Module(name=module_name)
+
+            self.local_modules[module_name] = module
+
+        return module
 
     def add(self, obj):
-        if obj.name.module not in self.local_modules:
-            self.local_modules[obj.name.module] = s_modules.Module(
-                name=obj.name.module)
-        super().add(obj)
+        self._get_local_module(obj.name.module).add(obj)
+
+    def discard(self, obj):
+        if not self.has_module(obj.name.module):
+            return
+
+        return self._get_local_module(obj.name.module).discard(obj)
+
+    def delete(self, obj):
+        if not self.has_module(obj.name.module):
+            raise s_err.SchemaModuleNotFoundError(
+                f'module {obj.name.module} is not in this schema')
+
+        return self._get_local_module(obj.name.module).delete(obj)
+
+    def clear(self):
+        self.local_modules.clear()
+        self.deleted_modules.update(m.name for m in self.schema.get_modules())
+        self._local_vic.clear()
+        self._local_virtual_children.clear()
+        self._local_ic.clear()
+        self._policy_schema = None
+
+    def reorder(self, new_order):
+        by_module = {}
+
+        for item in new_order:
+            try:
+                module_order = by_module[item.name.module]
+            except KeyError:
+                module_order = by_module[item.name.module] = []
+            module_order.append(item)
+
+        for module_name, module_order in by_module.items():
+            # Only the locally added objects are reordered, the order
+            # of objects in the base schema is left intact.
+            module = self._get_local_module(module_name)
+            module.reorder(module_order)
+
+    def update_virtual_inheritance(self, scls, children):
+        try:
+            class_children = self._local_vic[scls.name]
+        except KeyError:
+            class_children = self._local_vic[scls.name] = set(
+                self.schema._virtual_inheritance_cache.get(scls.name, ()))
+
+        class_children.update(c.name for c in children if c is not scls)
+        self._local_virtual_children[scls.name] = set(children)
+
+        if self.schema.get(scls.name, default=None) is not scls:
+            # Virtual types created through the overlay are not shared,
+            # and subclass checks read the children from the type itself.
+            scls._virtual_children = set(children)
+
+    def _get_virtual_children(self, scls):
+        try:
+            return self._local_virtual_children[scls.name]
+        except KeyError:
+            return super()._get_virtual_children(scls)
 
     def _resolve_module(self, module_name) -> typing.List[s_modules.Module]:
-        modules = []
-        if module_name is not None:
-            local_module = self.local_modules.get(module_name)
-            if local_module is not None:
-                modules.append(local_module)
+        if module_name is None or module_name in self.deleted_modules:
+            return []
 
-            their_modules = self.schema._resolve_module(module_name)
-            if their_modules:
-                for their_module in their_modules:
-                    if their_module is not local_module:
-                        modules.append(their_module)
+        local_module = self.local_modules.get(module_name)
+        if local_module is not None:
+            return [local_module]
 
-        return modules
+        return self.schema._resolve_module(module_name)
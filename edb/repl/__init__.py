@@ -394,8 +394,14 @@ class Cli:
             buf['EdgeQL->IR'] = r(timings.get('compile_eql_to_ir'))
         if timings.get('compile_ir_to_sql'):
             buf['IR->SQL'] = r(timings.get('compile_ir_to_sql'))
+        if timings.get('generate_sql'):
+            buf['SQL Codegen'] = r(timings.get('generate_sql'))
+        if timings.get('prepare'):
+            buf['Prepare'] = r(timings.get('prepare'))
         if timings.get('execution'):
             buf['Exec'] = r(timings.get('execution'))
+        if timings.get('decode_result'):
+            buf['Decode'] = r(timings.get('decode_result'))
 
         if buf:
             tokens = []
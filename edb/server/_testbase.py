@@ -126,7 +126,7 @@ _default_cluster = None
 
 
 def _init_cluster(data_dir_or_pg_cluster=None, *,
-                  cleanup_atexit=True, init_settings={}):
+                  cleanup_atexit=True, init_settings={}, server_settings={}):
     if (not os.environ.get('EDGEDB_DEBUG_SERVER') and
             not os.environ.get('EDGEDB_LOG_LEVEL')):
         _env = {'EDGEDB_LOG_LEVEL': 'silent'}
@@ -143,7 +143,7 @@ def _init_cluster(data_dir_or_pg_cluster=None, *,
     if cluster.get_status() == 'not-initialized':
         cluster.init(server_settings=init_settings)
 
-    cluster.start(port='dynamic', timezone='UTC')
+    cluster.start(port='dynamic', timezone='UTC', **server_settings)
 
     if cleanup_atexit:
         atexit.register(_shutdown_cluster, cluster, destroy=destroy)
@@ -558,13 +558,28 @@ def get_test_cases_setup(cases):
     return result
 
 
+def _get_pg_dsn(cluster):
+    pg_conn_args = dict(cluster._pg_cluster.get_connection_spec())
+    pg_conn_args['user'] = edgedb_defines.EDGEDB_SUPERUSER
+    return connect_utils.render_dsn('postgres', pg_conn_args)
+
+
+def start_server(cluster, **server_settings):
+    """Start another EdgeDB server on the Postgres cluster of *cluster*.
+
+    *server_settings* are passed to the server as command line options,
+    the caller is expected to stop the returned server.
+    """
+    return _init_cluster(
+        _get_pg_dsn(cluster), cleanup_atexit=False,
+        server_settings=server_settings)
+
+
 def start_worker_servers(master_cluster, num_workers):
     servers = [master_cluster]
     conns = []
 
-    pg_conn_args = dict(master_cluster._pg_cluster.get_connection_spec())
-    pg_conn_args['user'] = edgedb_defines.EDGEDB_SUPERUSER
-    pg_dsn = connect_utils.render_dsn('postgres', pg_conn_args)
+    pg_dsn = _get_pg_dsn(master_cluster)
 
     if num_workers > 1:
         for i in range(num_workers - 1):
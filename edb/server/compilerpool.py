@@ -0,0 +1,295 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""A pool of processes compiling EdgeQL queries to SQL.
+
+EdgeQL compilation is CPU-bound and would otherwise block the server
+event loop.  Each worker process keeps its own connection to every
+database it has seen along with the introspected schema.  The server
+tracks a schema version for each database and bumps it whenever DDL is
+executed; workers re-read their copy of the schema when the version
+sent along with a compilation request does not match their own.
+"""
+
+
+import asyncio
+import collections
+import concurrent.futures
+import logging
+
+import asyncpg
+
+from edb.lang import edgeql
+from edb.lang.common import exceptions
+from edb.lang.schema import objects as s_obj
+
+from edb.server import planner
+from edb.server import protocol
+from edb.server.pgsql import backend as pgsql_backend
+
+
+logger = logging.getLogger('edb.server')
+
+
+class CompilerPool:
+    """A pool of compiler processes.
+
+    The worker processes are forked when the pool is created, which
+    must happen before the server opens any client or Postgres
+    connections, as the workers would inherit them otherwise.
+    """
+
+    def __init__(self, pg_cluster, *, size, loop, batch_shapes=False,
+                 extract_constants=True):
+        self._connection_spec = pg_cluster.get_connection_spec()
+        self._batch_shapes = batch_shapes
+        self._extract_constants = extract_constants
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=size)
+        # The executor forks all of its processes on the first
+        # submission, make it happen now rather than on the first
+        # compilation request.
+        self._executor.submit(_start_worker).result()
+        self._schema_versions = collections.defaultdict(int)
+        self._loop = loop
+        self.size = size
+        # The number of scripts being compiled or waiting for a worker.
+        self.pending = 0
+
+    def invalidate_schema(self, database):
+        """Make workers re-read the schema of *database*."""
+        self._schema_versions[database] += 1
+
+    async def compile_script(self, script, *, database, user, schema,
+                             modaliases, flags=None):
+        """Compile an EdgeQL *script* in one of the worker processes.
+
+        Returns a tuple of a list of compiled queries (resolved against
+        *schema*), a dict of script parsing timings and a list of
+        compilation profiles of the queries, or (None, None, None) if
+        the script cannot be compiled out of process, in which case the
+        caller is expected to compile the script in-process.
+        """
+        if self._executor is None:
+            return None, None, None
+
+        schema_version = self._schema_versions[database]
+
+        self.pending += 1
+        try:
+            result = await self._loop.run_in_executor(
+                self._executor, _compile_script, self._connection_spec,
+                self._batch_shapes, self._extract_constants, database, user,
+                schema_version, script, dict(modaliases),
+                frozenset(flags or ()))
+        except concurrent.futures.process.BrokenProcessPool:
+            if self._executor is not None:
+                # Forking a new pool would copy the connections of the
+                # running server into it, so compile in-process from now.
+                logger.warning(
+                    'compiler pool worker died, compiling queries in '
+                    'the server process from now on', exc_info=True)
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self.size = 0
+            return None, None, None
+        except Exception:
+            # E.g. the result could not be transferred from the worker.
+            logger.warning('could not compile script in the compiler pool',
+                           exc_info=True)
+            return None, None, None
+        finally:
+            self.pending -= 1
+
+        if result is None:
+            return None, None, None
+
+        exported_queries, timings, profiles = result
+
+        if self._schema_versions[database] != schema_version:
+            # DDL has been executed while we were compiling.
+            return None, None, None
+
+        queries = [_import_query(q, schema) for q in exported_queries]
+        return queries, timings, profiles
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+def _import_query(exported, schema):
+    (text, argmap, argument_types, output_desc, output_format,
+     constants) = exported
+
+    argument_types = {
+        k: _import_type(v, schema) for k, v in argument_types.items()
+    }
+
+    tuple_registry = {}
+    type_desc = _import_type_desc(output_desc, schema, tuple_registry)
+
+    return pgsql_backend.Query(
+        text=text, argmap=argmap, argument_types=argument_types,
+        output_desc=pgsql_backend.OutputDescriptor(
+            type_desc=type_desc, tuple_registry=tuple_registry),
+        output_format=output_format,
+        constants=constants)
+
+
+def _export_query(query):
+    # Schema objects are replaced by their names, as the worker's
+    # copy of the schema is not the one the server is using.
+    argument_types = {
+        k: _export_type(v) for k, v in query.argument_types.items()
+    }
+
+    return (
+        query.text,
+        query.argmap,
+        argument_types,
+        _export_type_desc(query.output_desc.type_desc),
+        query.output_format,
+        query.constants,
+    )
+
+
+def _export_type(schema_type):
+    if isinstance(schema_type, s_obj.NamedObject):
+        return schema_type.name
+    else:
+        return None
+
+
+def _import_type(name, schema):
+    if name is not None:
+        return schema.get(name, default=None)
+    else:
+        return None
+
+
+def _export_type_desc(desc):
+    if desc.subtypes is not None:
+        subtypes = [_export_type_desc(st) for st in desc.subtypes]
+    else:
+        subtypes = None
+
+    return (desc.type_id, _export_type(desc.schema_type), subtypes,
+            desc.element_names, desc.cardinality)
+
+
+def _import_type_desc(exported, schema, tuple_registry):
+    type_id, schema_type, subtypes, element_names, cardinality = exported
+
+    if subtypes is not None:
+        subtypes = [_import_type_desc(st, schema, tuple_registry)
+                    for st in subtypes]
+
+    desc = pgsql_backend.TypeDescriptor(
+        type_id=type_id, schema_type=_import_type(schema_type, schema),
+        subtypes=subtypes, element_names=element_names)
+    desc.cardinality = cardinality
+
+    if subtypes is not None:
+        tuple_registry[type_id] = desc
+
+    return desc
+
+
+# Worker process state.
+_worker_loop = None
+_worker_backends = {}
+
+
+def _start_worker():
+    pass
+
+
+def _get_worker_backend(connection_spec, batch_shapes, extract_constants,
+                        database, user, schema_version):
+    global _worker_loop
+
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+
+    loop = _worker_loop
+    key = (database, user)
+    entry = _worker_backends.get(key)
+
+    if entry is None:
+        conn_info = dict(connection_spec, database=database, user=user)
+        conn = loop.run_until_complete(
+            asyncpg.connect(loop=loop, **conn_info))
+        bk = loop.run_until_complete(
+            pgsql_backend.open_database(
+                conn, batch_shapes=batch_shapes,
+                extract_constants=extract_constants))
+        entry = _worker_backends[key] = [schema_version, bk]
+
+    elif entry[0] != schema_version:
+        bk = entry[1]
+        loop.run_until_complete(bk.invalidate_schema_cache())
+        loop.run_until_complete(bk.getschema())
+        entry[0] = schema_version
+
+    return entry[1]
+
+
+def _compile_script(connection_spec, batch_shapes, extract_constants,
+                    database, user, schema_version, script, modaliases,
+                    flags):
+    try:
+        bk = _get_worker_backend(
+            connection_spec, batch_shapes, extract_constants, database,
+            user, schema_version)
+        bk.modaliases = modaliases
+
+        timer = protocol.Timer()
+
+        with timer.timeit('parse_eql'):
+            statements = edgeql.parse_block(script)
+
+        if not all(planner.is_query(stmt) for stmt in statements):
+            # Statements with side effects on the schema or
+            # the session must be executed by the server.
+            return None
+
+        queries = []
+        profiles = []
+        for statement in statements:
+            stmt_timer = protocol.Timer()
+            query = planner.plan_statement(
+                statement, bk, flags, timer=stmt_timer)
+            queries.append(_export_query(query))
+            profiles.append(stmt_timer.as_profile())
+
+        return queries, timer.as_dict(), profiles
+
+    except exceptions.EdgeDBError:
+        # Errors in the script are reported by compiling it in the
+        # server, which produces a proper error context.
+        logger.debug('could not compile script in a worker', exc_info=True)
+        return None
+
+    except Exception:
+        # The worker is broken, e.g. cannot connect to Postgres,
+        # and every script it gets is compiled twice.
+        logger.warning('compiler pool worker failed', exc_info=True)
+        return None
@@ -17,6 +17,8 @@
 #
 
 
+import json
+
 import asyncpg
 
 from edb.lang.ir import ast as irast
@@ -28,7 +30,109 @@ from edb.server import query as edgedb_query
 from . import planner
 
 
-async def execute_plan(plan, protocol):
+async def execute_plan(plan, protocol, *, timer, variables=None):
+    if isinstance(plan, edgedb_query.Query):
+        return await _execute_query(
+            plan, protocol.backend, timer=timer, variables=variables)
+
+    elif isinstance(plan, planner.ExplainStatement):
+        return await _execute_explain(
+            plan, protocol.backend, timer=timer, variables=variables)
+
+    with timer.timeit('execution'):
+        return await _execute_command(plan, protocol)
+
+
+def _get_args(query, variables):
+    # The literals extracted from the query text are passed as
+    # arguments along with the query variables.
+    if variables is None and not query.constants:
+        return []
+
+    args = dict(query.constants)
+    if variables is not None:
+        args.update(variables)
+    return [args.get(name) for name in query.argmap]
+
+
+async def _execute_query(plan, backend, *, timer, variables):
+    try:
+        args = _get_args(plan, variables)
+
+        # Connection.fetch() goes through the statement cache of the
+        # connection, so queries compiled into the same SQL are only
+        # prepared once, and statements invalidated by DDL are
+        # re-prepared by asyncpg.
+        with timer.timeit('execution'):
+            return [r[0] for r in await backend.connection.fetch(
+                plan.text, *args)]
+
+    except asyncpg.PostgresError as e:
+        _error = await backend.translate_pg_error(plan, e)
+        if _error is not None:
+            raise _error from e
+        else:
+            raise
+
+
+async def _execute_explain(plan, backend, *, timer, variables):
+    query = plan.query
+
+    args = _get_args(query, variables)
+
+    options = 'FORMAT JSON, VERBOSE'
+    if plan.analyze:
+        options += ', ANALYZE'
+
+    try:
+        if plan.analyze:
+            # EXPLAIN ANALYZE runs the query, make sure that it
+            # has no side effects.
+            transaction = backend.connection.transaction()
+            await transaction.start()
+
+        try:
+            with timer.timeit('execution'):
+                pg_plan = await backend.connection.fetchval(
+                    f'EXPLAIN ({options}) {query.text}', *args)
+        finally:
+            if plan.analyze:
+                await transaction.rollback()
+
+    except asyncpg.PostgresError as e:
+        _error = await backend.translate_pg_error(query, e)
+        if _error is not None:
+            raise _error from e
+        else:
+            raise
+
+    pg_plan = json.loads(pg_plan)
+    for entry in pg_plan:
+        _annotate_plan_node(entry['Plan'], query.path_aliases)
+
+    return [{
+        'sql': query.text,
+        'plan': pg_plan,
+        'paths': query.path_aliases,
+        'timings': {k: v for k, v in timer.as_dict().items() if v},
+    }]
+
+
+def _annotate_plan_node(node, path_aliases):
+    paths = set()
+    for key in ('Alias', 'CTE Name'):
+        alias = node.get(key)
+        if alias is not None:
+            paths.update(path_aliases.get(alias, ()))
+
+    if paths:
+        node['EdgeQL Paths'] = sorted(paths)
+
+    for subnode in node.get('Plans', ()):
+        _annotate_plan_node(subnode, path_aliases)
+
+
+async def _execute_command(plan, protocol):
     backend = protocol.backend
 
     if isinstance(plan, s_deltas.DeltaCommand):
@@ -62,18 +166,6 @@ async def execute_plan(plan, protocol):
             raise exceptions.InternalError(
                 'unexpected transaction statement: {!r}'.format(plan))
 
-    elif isinstance(plan, edgedb_query.Query):
-        try:
-            ps = await backend.connection.prepare(plan.text)
-            return [r[0] for r in await ps.fetch()]
-
-        except asyncpg.PostgresError as e:
-            _error = await backend.translate_pg_error(plan, e)
-            if _error is not None:
-                raise _error from e
-            else:
-                raise
-
     elif isinstance(plan, irast.SessionStateCmd):
         # SET command
 
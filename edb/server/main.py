@@ -18,6 +18,7 @@
 
 
 import asyncio
+import functools
 import getpass
 import ipaddress
 import logging
@@ -35,6 +36,11 @@ from . import cluster as edgedb_cluster
 from . import daemon
 from . import defines
 from . import logsetup
+from . import metrics
+from . import persistedqueries
+from . import querystats
+from . import slowlog
+from . import workers
 
 
 logger = logging.getLogger('edb.server')
@@ -65,21 +71,75 @@ def _init_cluster(cluster, args):
 
 
 def _run_server(cluster, args):
-    loop = asyncio.get_event_loop()
-    srv = None
-
     _init_cluster(cluster, args)
 
+    if args['workers'] > 1:
+        workers.run_workers(
+            args['workers'], functools.partial(_serve, cluster, args))
+    else:
+        _serve(cluster, args, loop=asyncio.get_event_loop())
+
+
+def _serve(cluster, args, *, loop=None, channel=None, worker_id=0):
+    if loop is None:
+        # Forked server workers must not share the event loop
+        # with the parent process.
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    srv = None
+    metrics_srv = None
+
     from edb.server import protocol as edgedb_protocol
 
+    # The compiler pool forks its processes right away, so it must be
+    # created before the server accepts connections.
+    compiler_pool = None
+    if args['compiler_pool_size']:
+        from edb.server import compilerpool
+
+        compiler_pool = compilerpool.CompilerPool(
+            cluster, size=args['compiler_pool_size'], loop=loop,
+            batch_shapes=args['batch_shapes'],
+            extract_constants=args['extract_constants'])
+
+    persisted_queries = persistedqueries.PersistedQueries()
+    query_stats = querystats.QueryStats()
+
+    slow_log = None
+    if args['slow_query_threshold'] is not None:
+        slow_log = slowlog.SlowQueryLog(
+            threshold=args['slow_query_threshold'] / 1000,
+            sample_rate=args['slow_query_sample_rate'],
+            rate_limit=args['slow_query_rate_limit'])
+
+    coordinator = workers.Coordinator(
+        loop=loop, channel=channel, compiler_pool=compiler_pool,
+        persisted_queries=persisted_queries)
+
     def protocol_factory():
-        return edgedb_protocol.Protocol(cluster, loop=loop)
+        return edgedb_protocol.Protocol(
+            cluster, loop=loop, compiler_pool=compiler_pool,
+            coordinator=coordinator, persisted_queries=persisted_queries,
+            query_stats=query_stats, slow_log=slow_log,
+            batch_shapes=args['batch_shapes'],
+            extract_constants=args['extract_constants'])
 
     try:
         srv = loop.run_until_complete(
             loop.create_server(
                 protocol_factory,
-                host=args['bind_address'], port=args['port']))
+                host=args['bind_address'], port=args['port'],
+                reuse_port=channel is not None))
+
+        if args['metrics_port']:
+            # Every server worker has its own metrics, so workers
+            # listen on consecutive ports.
+            metrics_srv = loop.run_until_complete(
+                metrics.start_server(
+                    query_stats, host=args['bind_address'],
+                    port=args['metrics_port'] + worker_id, loop=loop,
+                    compiler_pool=compiler_pool))
 
         loop.add_signal_handler(signal.SIGTERM, terminate_server, srv, loop)
         logger.info('Serving on %s:%s', args['bind_address'], args['port'])
@@ -96,6 +156,14 @@ def _run_server(cluster, args):
             logger.info('Shutting down.')
             srv.close()
 
+        if metrics_srv is not None:
+            metrics_srv.close()
+
+        coordinator.close()
+
+        if compiler_pool is not None:
+            compiler_pool.close()
+
 
 def run_server(args):
     logger.info('EdgeDB server starting.')
@@ -105,7 +173,7 @@ def run_server(args):
     if args['data_dir']:
         server_settings = {
             'log_connections': 'yes',
-            'log_statement': 'all',
+            'log_statement': 'all' if args['log_pg_statements'] else 'none',
             'log_disconnections': 'yes',
             'log_min_messages': 'INFO',
         }
@@ -192,6 +260,38 @@ def run_server(args):
 @click.option(
     '-p', '--port', type=int, default=defines.EDGEDB_PORT,
     help='port to listen on')
+@click.option(
+    '--workers', type=int, default=1,
+    help='number of server processes sharing the listening port')
+@click.option(
+    '--compiler-pool-size', type=int, default=0,
+    help='number of EdgeQL compiler worker processes (0 compiles '
+         'queries in the server process)')
+@click.option(
+    '--metrics-port', type=int,
+    help='serve Prometheus metrics over HTTP on this port (with '
+         '--workers, worker N listens on the port + N)')
+@click.option(
+    '--batch-shapes', is_flag=True,
+    help='fetch multi links in shapes for all selected objects at once '
+         'instead of for every object separately')
+@click.option(
+    '--extract-constants/--no-extract-constants', default=True,
+    help='pass literals in queries to Postgres as query arguments, '
+         'so that queries differing only in literals share a plan')
+@click.option(
+    '--slow-query-threshold', type=float, metavar='MS',
+    help='log statements that take longer than MS milliseconds')
+@click.option(
+    '--slow-query-sample-rate', type=float, default=1.0,
+    help='fraction of slow statements to log')
+@click.option(
+    '--slow-query-rate-limit', type=int, metavar='N',
+    help='log at most N slow statements per minute')
+@click.option(
+    '--log-pg-statements/--no-log-pg-statements', default=True,
+    help='make the Postgres cluster started by the server log every '
+         'SQL statement')
 @click.option(
     '-b', '--background', is_flag=True, help='daemonize')
 @click.option(
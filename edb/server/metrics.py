@@ -0,0 +1,185 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""HTTP endpoint exposing server metrics in the Prometheus text format.
+
+Metrics are rendered from the QueryStats of the server process on every
+request to /metrics, so collecting them costs nothing between scrapes.
+"""
+
+
+import asyncio
+import logging
+
+
+logger = logging.getLogger('edb.server')
+
+
+COUNTERS = (
+    ('connections', 'edgedb_connections_total',
+     'Client connections accepted.'),
+    ('bytes_received', 'edgedb_received_bytes_total',
+     'Bytes received from clients.'),
+    ('bytes_sent', 'edgedb_sent_bytes_total',
+     'Bytes sent to clients.'),
+    ('errors', 'edgedb_errors_total',
+     'Requests that resulted in an error.'),
+    ('statements', 'edgedb_statements_total',
+     'Statements executed.'),
+    ('schema_reloads', 'edgedb_schema_reloads_total',
+     'Schema reloads caused by DDL in other connections.'),
+    ('persisted_plan_hits', 'edgedb_persisted_plan_hits_total',
+     'Persisted GraphQL queries executed with cached plans.'),
+    ('persisted_plan_misses', 'edgedb_persisted_plan_misses_total',
+     'Persisted GraphQL queries that had to be compiled.'),
+    ('pool_compilations', 'edgedb_pool_compilations_total',
+     'Scripts compiled by the compiler pool.'),
+    ('local_compilations', 'edgedb_local_compilations_total',
+     'Scripts compiled in the server process.'),
+)
+
+
+def render(stats, *, compiler_pool=None):
+    lines = []
+
+    for attr, name, doc in COUNTERS:
+        lines.append(f'# HELP {name} {doc}')
+        lines.append(f'# TYPE {name} counter')
+        lines.append(f'{name} {getattr(stats, attr)}')
+
+    _add_gauge(lines, 'edgedb_connections', 'Open client connections.',
+               stats.connections_active)
+
+    if compiler_pool is not None:
+        _add_gauge(lines, 'edgedb_compiler_pool_size',
+                   'Compiler pool worker processes.', compiler_pool.size)
+        _add_gauge(lines, 'edgedb_compiler_pool_pending',
+                   'Scripts being compiled or waiting for a compiler.',
+                   compiler_pool.pending)
+
+    lines.append('# HELP edgedb_messages_total Protocol messages received.')
+    lines.append('# TYPE edgedb_messages_total counter')
+    for msg_type, count in sorted(stats.messages.items()):
+        lines.append(
+            f'edgedb_messages_total{{{_label("type", msg_type)}}} {count}')
+
+    name = 'edgedb_statement_stage_duration_seconds'
+    lines.append(f'# HELP {name} Time spent in statement processing stages.')
+    lines.append(f'# TYPE {name} histogram')
+    for stage, hist in sorted(stats.stages.items()):
+        _add_histogram(lines, name, hist, _label('stage', stage))
+
+    name = 'edgedb_statement_objects'
+    lines.append(f'# HELP {name} Objects produced by statements.')
+    lines.append(f'# TYPE {name} histogram')
+    for kind, hist in sorted(stats.counts.items()):
+        _add_histogram(lines, name, hist, _label('kind', kind))
+
+    name = 'edgedb_ddl_duration_seconds'
+    lines.append(f'# HELP {name} Execution time of DDL statements.')
+    lines.append(f'# TYPE {name} histogram')
+    _add_histogram(lines, name, stats.ddl)
+
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def _label(name, value):
+    # Backslashes, double quotes and line feeds must be escaped
+    # in label values.
+    value = str(value).replace('\\', '\\\\').replace(
+        '"', '\\"').replace('\n', '\\n')
+    return f'{name}="{value}"'
+
+
+def _add_gauge(lines, name, doc, value):
+    lines.append(f'# HELP {name} {doc}')
+    lines.append(f'# TYPE {name} gauge')
+    lines.append(f'{name} {value}')
+
+
+def _add_histogram(lines, name, hist, labels=None):
+    prefix = f'{labels},' if labels else ''
+    for bound, count in hist.as_dict()['buckets']:
+        lines.append(
+            f'{name}_bucket{{{prefix}{_label("le", bound)}}} {count}')
+
+    suffix = f'{{{labels}}}' if labels else ''
+    lines.append(f'{name}_sum{suffix} {hist.sum}')
+    lines.append(f'{name}_count{suffix} {hist.count}')
+
+
+class MetricsProtocol(asyncio.Protocol):
+    """A minimal HTTP/1.0 server answering GET /metrics."""
+
+    def __init__(self, stats, *, compiler_pool=None):
+        self._stats = stats
+        self._compiler_pool = compiler_pool
+        self._buffer = bytearray()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self._buffer.extend(data)
+        if b'\r\n\r\n' not in self._buffer and b'\n\n' not in self._buffer:
+            if len(self._buffer) > 8192:
+                self._respond(431, 'Request Header Fields Too Large')
+            return
+
+        request_line = self._buffer.split(b'\n', 1)[0].decode(
+            'latin-1').split()
+
+        if len(request_line) < 2 or request_line[0] not in ('GET', 'HEAD'):
+            self._respond(405, 'Method Not Allowed')
+        elif request_line[1].split('?', 1)[0] != '/metrics':
+            self._respond(404, 'Not Found')
+        else:
+            body = render(self._stats, compiler_pool=self._compiler_pool)
+            self._respond(
+                200, 'OK', body,
+                content_type='text/plain; version=0.0.4; charset=utf-8',
+                head=request_line[0] == 'HEAD')
+
+    def _respond(self, status, reason, body='', *,
+                 content_type='text/plain; charset=utf-8', head=False):
+        body = body.encode('utf-8')
+        headers = (
+            f'HTTP/1.0 {status} {reason}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: close\r\n'
+            f'\r\n'
+        ).encode('latin-1')
+
+        self.transport.write(headers if head else headers + body)
+        self.transport.close()
+
+
+async def start_server(stats, *, host, port, loop, compiler_pool=None,
+                       reuse_port=False):
+    def protocol_factory():
+        return MetricsProtocol(stats, compiler_pool=compiler_pool)
+
+    srv = await loop.create_server(
+        protocol_factory, host=host, port=port, reuse_port=reuse_port)
+
+    logger.info('Serving metrics on http://%s:%s/metrics', host, port)
+    return srv
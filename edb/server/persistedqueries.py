@@ -0,0 +1,144 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Persisted GraphQL queries.
+
+GraphQL documents are registered under the SHA-256 hash of their text,
+either explicitly or on first use, after which clients refer to them
+by the hash alone.  The SQL plans compiled for a document are kept
+along with it and are reused for every execution with the same values
+of critical variables (the ones that change the shape of the query),
+all other variables are passed to Postgres as query arguments.
+"""
+
+
+import collections
+import hashlib
+
+from edb.lang.common import exceptions
+
+
+_missing = object()
+
+
+def get_query_hash(document):
+    return hashlib.sha256(document.encode('utf-8')).hexdigest()
+
+
+class PersistedQueries:
+
+    def __init__(self, *, size=1024, max_variants=16):
+        self._size = size
+        self._max_variants = max_variants
+        self._documents = collections.OrderedDict()
+        # Plan variants by (database, query hash, operation name), in
+        # the order of use, with the number of variants of all keys
+        # limited by *size* as well.
+        self._plans = collections.OrderedDict()
+        self._plan_count = 0
+
+    def register(self, document, *, query_hash=None):
+        """Register a GraphQL *document* and return its hash.
+
+        If *query_hash* is given, it must match the hash of the document.
+        """
+        document_hash = get_query_hash(document)
+        if query_hash is not None and query_hash != document_hash:
+            raise exceptions.PersistedQueryHashMismatchError(
+                f'persisted query hash mismatch: expected {document_hash}, '
+                f'got {query_hash}')
+
+        self._documents[document_hash] = document
+        self._documents.move_to_end(document_hash)
+
+        if len(self._documents) > self._size:
+            evicted, _ = self._documents.popitem(last=False)
+            for key in [k for k in self._plans if k[1] == evicted]:
+                self._drop_plans(key)
+
+        return document_hash
+
+    def get_document(self, query_hash):
+        try:
+            document = self._documents[query_hash]
+        except KeyError:
+            raise exceptions.PersistedQueryNotFoundError(
+                f'persisted query {query_hash} is not registered') from None
+
+        self._documents.move_to_end(query_hash)
+        return document
+
+    def get_plans(self, database, query_hash, operation_name, variables):
+        """Return the plans compiled for the given variables or None."""
+        key = (database, query_hash, operation_name)
+        variants = self._plans.get(key)
+        if variants is not None:
+            for i, (names, values, plans) in enumerate(variants):
+                if tuple(variables.get(n, _missing) for n in names) == values:
+                    variants.append(variants.pop(i))
+                    self._plans.move_to_end(key)
+                    return plans
+
+    def add_plans(self, database, query_hash, operation_name, variables,
+                  critvars, plans):
+        """Store *plans* compiled for a persisted query.
+
+        *plans* is a list of (plan, parameter defaults) tuples, one for
+        every operation in the document.
+
+        *critvars* are the names of variables critical to the shape of
+        the compiled query, the plans are reused for other executions
+        with the same values of these variables.  At most *max_variants*
+        plans are kept for an operation, and at most *size* in total,
+        the least recently used ones are dropped first.
+        """
+        if query_hash not in self._documents:
+            return
+
+        if self.get_plans(
+                database, query_hash, operation_name, variables) is not None:
+            return
+
+        names = tuple(sorted(critvars))
+        values = tuple(variables.get(n, _missing) for n in names)
+
+        key = (database, query_hash, operation_name)
+        variants = self._plans.setdefault(key, [])
+        variants.append((names, values, plans))
+        self._plans.move_to_end(key)
+        self._plan_count += 1
+
+        if len(variants) > self._max_variants:
+            variants.pop(0)
+            self._plan_count -= 1
+
+        while self._plan_count > self._size:
+            lru_key, lru_variants = next(iter(self._plans.items()))
+            lru_variants.pop(0)
+            self._plan_count -= 1
+            if not lru_variants:
+                del self._plans[lru_key]
+
+    def invalidate_schema(self, database):
+        """Drop the plans compiled against the schema of *database*."""
+        for key in [k for k in self._plans if k[0] == database]:
+            self._drop_plans(key)
+
+    def _drop_plans(self, key):
+        self._plan_count -= len(self._plans.pop(key))
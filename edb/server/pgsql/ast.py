@@ -98,6 +98,8 @@ class OutputVar(BaseExpr):
 class EdgeQLPathInfo(Base):
     """A general mixin providing EdgeQL-specific metadata on certain nodes."""
 
+    __ast_mixin__ = True
+
     # Ignore the below fields in AST visitor/transformer.
     __ast_meta__ = {
         'path_scope', 'path_outputs', 'path_id', 'is_distinct', 'value_scope',
@@ -313,7 +315,7 @@ class Query(BaseRelation, EdgeQLPathInfo):
 
     # Ignore the below fields in AST visitor/transformer.
     __ast_meta__ = {'ptr_join_map', 'path_rvar_map', 'path_namespace',
-                    'view_path_id_map', 'argnames', 'nullable'}
+                    'view_path_id_map', 'argnames', 'constants', 'nullable'}
 
     view_path_id_map: typing.Dict[irast.PathId, irast.PathId]
     # Map of RangeVars corresponding to pointer relations.
@@ -324,6 +326,8 @@ class Query(BaseRelation, EdgeQLPathInfo):
     path_namespace: dict
 
     argnames: typing.Dict[str, int]
+    # Values of the arguments that hold extracted constants.
+    constants: typing.Dict[str, object]
 
     ctes: typing.List[CommonTableExpr]
 
@@ -331,6 +335,8 @@ class Query(BaseRelation, EdgeQLPathInfo):
 class DML(Base):
     """Generic superclass for INSERT/UPDATE/DELETE statements."""
 
+    __ast_mixin__ = True
+
     # Target relation to perform the operation on.
     relation: RangeTypes
     # List of expressions returned
@@ -36,22 +36,27 @@ from edb.server.pgsql import delta as delta_cmds
 from edb.server.pgsql import deltadbops
 
 from . import compiler
+from . import datasources
 from . import deltarepo as pgsql_deltarepo
 from . import intromech
+from . import metaschema
 
 
 class Query(backend_query.Query):
     def __init__(
             self, *, text, argmap, argument_types,
-            output_desc=None, output_format=None):
+            output_desc=None, output_format=None, path_aliases=None,
+            constants=None):
         self.text = text
         self.argmap = argmap
+        self.constants = constants or {}
         self.argument_types = collections.OrderedDict((k, argument_types[k])
                                                       for k in argmap
                                                       if k in argument_types)
 
         self.output_desc = output_desc
         self.output_format = output_format
+        self.path_aliases = path_aliases
 
 
 class TypeDescriptor:
@@ -71,9 +76,13 @@ class OutputDescriptor:
 
 class Backend(s_deltarepo.DeltaProvider):
 
-    def __init__(self, connection):
+    def __init__(self, connection, *, batch_shapes=False,
+                 extract_constants=True):
         self.schema = None
+        self.schema_version = None
         self.modaliases = {None: 'default'}
+        self.batch_shapes = batch_shapes
+        self.extract_constants = extract_constants
 
         self._intro_mech = intromech.IntrospectionMech(connection)
 
@@ -85,9 +94,15 @@ class Backend(s_deltarepo.DeltaProvider):
     async def getschema(self):
         if self.schema is None:
             self.schema = await self._intro_mech.getschema()
+            self.schema_version = self._intro_mech.schema_version
 
         return self.schema
 
+    async def is_schema_outdated(self):
+        """Return True if the schema was changed since it was read."""
+        version = await datasources.schema.version.fetch(self.connection)
+        return version != self.schema_version
+
     def adapt_delta(self, delta):
         return delta_cmds.CommandMeta.adapt(delta)
 
@@ -175,6 +190,10 @@ class Backend(s_deltarepo.DeltaProvider):
                 async with self.connection.transaction():
                     # Execute all pgsql/delta commands.
                     await plan.execute(context)
+                    await metaschema.bump_schema_version(self.connection)
+                    # The introspection views are materialized,
+                    # so they must be refreshed after the changes.
+                    await metaschema.refresh_views(self.connection)
             else:
                 await plan.execute(context)
         except Exception as e:
@@ -186,6 +205,7 @@ class Backend(s_deltarepo.DeltaProvider):
 
     async def invalidate_schema_cache(self):
         self.schema = None
+        self.schema_version = None
         self.invalidate_transient_cache()
 
     def invalidate_transient_cache(self):
@@ -274,7 +294,21 @@ class Backend(s_deltarepo.DeltaProvider):
         return type_desc
 
     def compile(self, query_ir, context=None, *,
-                output_format=None, timer=None):
+                output_format=None, explain=False, batch_shapes=None,
+                timer=None):
+        """Compile IR of a query to SQL.
+
+        If *explain* is True, the compiled query maps the aliases of
+        its range variables to EdgeQL paths (see Query.path_aliases).
+
+        If *batch_shapes* is None, multi links in shapes are batched
+        according to the backend setting (see compile_ir_to_sql_tree).
+
+        If the backend extracts constants, literals are compiled into
+        query arguments, with their values kept in Query.constants, so
+        that the queries that only differ in literal values share the
+        SQL text and the prepared statement.
+        """
         tuples = {}
         type_desc = self._describe_type(
             query_ir.expr.scls, query_ir.view_shapes, tuples)
@@ -282,9 +316,29 @@ class Backend(s_deltarepo.DeltaProvider):
         output_desc = OutputDescriptor(
             type_desc=type_desc, tuple_registry=tuples)
 
-        sql_text, argmap = compiler.compile_ir_to_sql(
-            query_ir, schema=self.schema,
-            output_format=output_format, timer=timer)
+        if batch_shapes is None:
+            batch_shapes = self.batch_shapes
+
+        compile_args = dict(
+            schema=self.schema, output_format=output_format,
+            pointer_ids=self._intro_mech.pointer_cache,
+            batch_shapes=batch_shapes,
+            extract_constants=self.extract_constants)
+
+        if timer is None:
+            qtree = compiler.compile_ir_to_sql_tree(query_ir, **compile_args)
+        else:
+            with timer.timeit('compile_ir_to_sql'):
+                qtree = compiler.compile_ir_to_sql_tree(
+                    query_ir, **compile_args)
+
+        if explain:
+            path_aliases = compiler.get_path_aliases(qtree)
+        else:
+            path_aliases = None
+
+        sql_text, argmap = compiler.generate_sql(
+            qtree, pretty=explain, timer=timer)
 
         argtypes = {}
         for k, v in query_ir.params.items():
@@ -294,13 +348,17 @@ class Backend(s_deltarepo.DeltaProvider):
             text=sql_text, argmap=argmap,
             argument_types=argtypes,
             output_desc=output_desc,
-            output_format=output_format)
+            output_format=output_format,
+            path_aliases=path_aliases,
+            constants=qtree.constants)
 
     async def translate_pg_error(self, query, error):
         return await self._intro_mech.translate_pg_error(query, error)
 
 
-async def open_database(pgconn):
-    bk = Backend(pgconn)
+async def open_database(pgconn, *, batch_shapes=False,
+                        extract_constants=True):
+    bk = Backend(pgconn, batch_shapes=batch_shapes,
+                 extract_constants=extract_constants)
     await bk.getschema()
     return bk
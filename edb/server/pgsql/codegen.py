@@ -63,6 +63,7 @@ class SQLSourceGenerator(codegen.SourceGenerator):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.param_index = {}
+        self.cte_count = 0
 
     @classmethod
     def to_source(
@@ -84,6 +85,7 @@ class SQLSourceGenerator(codegen.SourceGenerator):
     def gen_ctes(self, ctes):
         self.write('WITH')
         count = len(ctes)
+        self.cte_count += count
         for i, cte in enumerate(ctes):
             self.new_lines = 1
             if getattr(cte, 'recursive', None):
@@ -149,7 +151,8 @@ class SQLSourceGenerator(codegen.SourceGenerator):
                     self.write(' ON (')
                     self.visit_list(node.distinct_clause, newlines=False)
                     self.write(')')
-            self.write('/*', repr(node), '*/')
+            if self.pretty:
+                self.write('/*', repr(node), '*/')
             self.new_lines = 1
             self.indentation += 2
 
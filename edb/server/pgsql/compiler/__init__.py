@@ -17,8 +17,11 @@
 #
 
 
+import collections
 import typing
+import uuid
 
+from edb.lang.common import ast
 from edb.lang.common import debug
 from edb.lang.common import exceptions as edgedb_error
 
@@ -33,8 +36,10 @@ from . import expr as _expr_compiler  # NOQA
 from . import stmt as _stmt_compiler  # NOQA
 
 from . import context
+from . import ctes
 from . import dispatch
 from . import errors
+from . import relgen
 
 from .context import OutputFormat  # NOQA
 
@@ -44,13 +49,37 @@ def compile_ir_to_sql_tree(
         schema: s_schema.Schema,
         output_format: typing.Optional[OutputFormat]=None,
         ignore_shapes: bool=False,
-        singleton_mode: bool=False) -> pgast.Base:
+        singleton_mode: bool=False,
+        pointer_ids: typing.Optional[typing.Mapping[str, uuid.UUID]]=None,
+        batch_shapes: bool=False,
+        extract_constants: bool=False) -> pgast.Base:
+    """Compile IR to an SQL tree.
+
+    *pointer_ids* maps the names of pointers to their ids in the backend.
+    The ids of known pointers are inlined into the generated DML instead
+    of being looked up in the edgedb.pointer table at run time, so the
+    tree is only valid for the schema the ids were read with.
+
+    If *batch_shapes* is True, multi links in shapes are fetched for all
+    objects at once by a query grouped by the source object instead of
+    a subquery per object (see relgen.set_as_grouped_array).
+
+    If *extract_constants* is True, scalar literals are passed as query
+    arguments instead of being inlined into the SQL, so that queries
+    that only differ in literal values compile into the same SQL text
+    and can share a prepared statement.  The arguments are added to
+    the argument map, and their values are in the ``constants`` mapping
+    of the returned tree.  Queries with positional arguments are always
+    compiled with inline literals.
+    """
     try:
         # Transform to sql tree
         ctx_stack = context.CompilerContext()
         ctx = ctx_stack.current
         expr_is_stmt = isinstance(ir_expr, irast.Statement)
         if expr_is_stmt:
+            if any(name.isnumeric() for name in ir_expr.params):
+                extract_constants = False
             views = ir_expr.views
             ctx.scope_map = ir_expr.scope_map
             ctx.scope_tree = ir_expr.scope_tree
@@ -60,10 +89,13 @@ def compile_ir_to_sql_tree(
         ctx.env = context.Environment(
             schema=schema, output_format=output_format,
             singleton_mode=singleton_mode,
-            views=views)
+            views=views, pointer_ids=pointer_ids,
+            batch_shapes=batch_shapes, extract_constants=extract_constants)
         if ignore_shapes:
             ctx.expr_exposed = False
         qtree = dispatch.compile(ir_expr, ctx=ctx)
+        relgen.fini_grouped_arrays(env=ctx.env)
+        ctes.inline_ctes(qtree)
 
     except Exception as e:  # pragma: no cover
         try:
@@ -83,17 +115,32 @@ def compile_ir_to_sql(
         schema: s_schema.Schema,
         output_format: typing.Optional[OutputFormat]=None,
         ignore_shapes: bool=False,
+        pointer_ids: typing.Optional[typing.Mapping[str, uuid.UUID]]=None,
+        batch_shapes: bool=False,
+        extract_constants: bool=False,
+        pretty: bool=True,
         timer=None) -> typing.Tuple[str, typing.Dict[str, int]]:
 
     if timer is None:
         qtree = compile_ir_to_sql_tree(
             ir_expr, schema=schema, output_format=output_format,
-            ignore_shapes=ignore_shapes)
+            ignore_shapes=ignore_shapes, pointer_ids=pointer_ids,
+            batch_shapes=batch_shapes, extract_constants=extract_constants)
     else:
         with timer.timeit('compile_ir_to_sql'):
             qtree = compile_ir_to_sql_tree(
                 ir_expr, schema=schema, output_format=output_format,
-                ignore_shapes=ignore_shapes)
+                ignore_shapes=ignore_shapes, pointer_ids=pointer_ids,
+                batch_shapes=batch_shapes,
+                extract_constants=extract_constants)
+
+    return generate_sql(qtree, pretty=pretty, timer=timer)
+
+
+def generate_sql(
+        qtree: pgast.Base, *,
+        pretty: bool=True,
+        timer=None) -> typing.Tuple[str, typing.Dict[str, int]]:
 
     if debug.flags.edgeql_compile:  # pragma: no cover
         debug.header('SQL Tree')
@@ -101,12 +148,17 @@ def compile_ir_to_sql(
 
     argmap = qtree.argnames
 
+    if debug.flags.edgeql_compile:  # pragma: no cover
+        pretty = True
+
     # Generate query text
     if timer is None:
-        codegen = _run_codegen(qtree)
+        codegen = _run_codegen(qtree, pretty=pretty)
     else:
-        with timer.timeit('compile_ir_to_sql'):
-            codegen = _run_codegen(qtree)
+        with timer.timeit('generate_sql'):
+            codegen = _run_codegen(qtree, pretty=pretty)
+
+        timer.count('sql_ctes', codegen.cte_count)
 
     sql_text = ''.join(codegen.result)
 
@@ -117,8 +169,34 @@ def compile_ir_to_sql(
     return sql_text, argmap
 
 
-def _run_codegen(qtree):
-    codegen = pgcodegen.SQLSourceGenerator()
+def get_path_aliases(
+        qtree: pgast.Base) -> typing.Dict[str, typing.List[str]]:
+    """Return EdgeQL paths of the range variables in the SQL tree.
+
+    The returned dict maps the alias of a range variable or the name of
+    a CTE to the (string representations of) path ids it provides.
+    """
+    aliases = collections.defaultdict(set)
+
+    queries = ast.find_children(
+        qtree, lambda n: isinstance(n, pgast.Query), force_traversal=True)
+    if isinstance(qtree, pgast.Query):
+        queries.append(qtree)
+
+    for query in queries:
+        for (path_id, _), rvar in query.path_rvar_map.items():
+            if rvar.alias is not None and rvar.alias.aliasname:
+                aliases[rvar.alias.aliasname].add(str(path_id))
+
+        for cte in query.ctes or ():
+            if cte.query.path_id is not None:
+                aliases[cte.name].add(str(cte.query.path_id))
+
+    return {alias: sorted(paths) for alias, paths in aliases.items()}
+
+
+def _run_codegen(qtree, *, pretty=True):
+    codegen = pgcodegen.SQLSourceGenerator(pretty=pretty)
     try:
         codegen.visit(qtree)
     except pgcodegen.SQLSourceGeneratorError as e:  # pragma: no cover
@@ -42,6 +42,7 @@ def fini_stmt(
         parent_ctx: context.CompilerContextLevel) -> None:
     if stmt is ctx.toplevel_stmt:
         stmt.argnames = ctx.argmap
+        stmt.constants = ctx.env.constants
 
 
 def compile_iterator_expr(
@@ -145,6 +146,11 @@ def compile_orderby_clause(
             value = relgen.set_as_subquery(
                 expr.expr, as_value=True, ctx=orderctx)
 
+            if _is_column_subquery(value):
+                # A plain column reference, sort by it directly, so that
+                # an index can be used to produce the ordered rows.
+                value = value.target_list[0].val
+
             sortexpr = pgast.SortBy(
                 node=value,
                 dir=expr.direction,
@@ -154,6 +160,18 @@ def compile_orderby_clause(
     return sort_clause
 
 
+def _is_column_subquery(query: pgast.Query) -> bool:
+    """Check if *query* is just ``(SELECT <column>)``."""
+    return (
+        isinstance(query, pgast.SelectStmt) and
+        not query.from_clause and
+        query.where_clause is None and
+        not query.ctes and
+        len(query.target_list) == 1 and
+        isinstance(query.target_list[0].val, pgast.ColumnRef)
+    )
+
+
 def compile_limit_offset_clause(
         ir_set: typing.Optional[irast.Base], *,
         ctx: context.CompilerContextLevel) -> pgast.Expr:
@@ -45,6 +45,7 @@ class ShapeFormat(enum.Enum):
 class OutputFormat(enum.Enum):
     NATIVE = enum.auto()
     JSON = enum.auto()
+    JSONB = enum.auto()
 
 
 NO_VOLATILITY = object()
@@ -138,8 +139,16 @@ class CompilerContext(compiler.CompilerContext):
 class Environment:
     """Static compilation environment."""
 
-    def __init__(self, *, schema, output_format, singleton_mode, views):
+    def __init__(self, *, schema, output_format, singleton_mode, views,
+                 pointer_ids=None, batch_shapes=False,
+                 extract_constants=False):
         self.singleton_mode = singleton_mode
+        self.pointer_ids = pointer_ids or {}
+        self.batch_shapes = batch_shapes
+        self.grouped_arrays = []
+        self.extract_constants = extract_constants
+        self.constant_params = {}
+        self.constants = collections.OrderedDict()
         self.aliases = aliases.AliasGenerator()
         self.root_rels = set()
         self.rel_overlays = collections.defaultdict(list)
@@ -0,0 +1,141 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Inlining of common table expressions into the queries using them.
+
+Postgres before version 12 always materializes CTEs, which makes them
+optimization fences: predicates of the outer query are not pushed into
+a CTE, and the CTE result has no indexes.  The CTEs that do not have to
+be materialized are replaced with subqueries, which is what newer
+versions of Postgres do by default.
+
+A CTE must stay materialized if it is a data-modifying statement, if it
+is referenced more than once (to avoid computing it repeatedly), or if
+it calls volatile functions, which must not be called more (or fewer)
+times than the query text implies.
+"""
+
+
+import collections
+import typing
+
+from edb.lang.common import ast
+
+from edb.server.pgsql import ast as pgast
+from edb.server.pgsql import common
+
+
+# Volatile functions used by the compiler and the standard library.
+VOLATILE_FUNCTIONS = frozenset({
+    'random', 'setseed', 'nextval', 'setval', 'clock_timestamp',
+    'timeofday', 'uuid_generate_v1mc', 'uuid_generate_v4',
+})
+
+# Schemas of the functions that are known to be non-volatile, except
+# for the above.  Volatility of functions defined by the users is not
+# known, so such functions are assumed to be volatile.
+KNOWN_FUNCTION_SCHEMAS = frozenset({
+    'edgedb', common.edgedb_module_name_to_schema_name('std'),
+})
+
+
+def inline_ctes(qtree: pgast.Base) -> None:
+    """Replace the CTEs that need not be materialized with subqueries."""
+    ctes = []
+    refs = collections.defaultdict(list)
+    _find_ctes(qtree, ctes, refs)
+
+    for query, cte in ctes:
+        cte_refs = refs.get(cte)
+        if (cte_refs is None or len(cte_refs) != 1 or
+                not _can_inline(cte)):
+            continue
+
+        parent, field, index = cte_refs[0]
+        rvar = _get_child(parent, field, index)
+
+        subselect = pgast.RangeSubselect(
+            subquery=cte.query,
+            alias=rvar.alias or pgast.Alias(aliasname=cte.name),
+            nullable=rvar.nullable,
+        )
+
+        _set_child(parent, field, index, subselect)
+        query.ctes.remove(cte)
+
+
+def _can_inline(cte: pgast.CommonTableExpr) -> bool:
+    if (getattr(cte, 'recursive', None) or
+            not isinstance(cte.query, pgast.SelectStmt)):
+        return False
+
+    calls = ast.find_children(
+        cte.query, lambda n: isinstance(n, pgast.FuncCall),
+        force_traversal=True)
+
+    return not any(_is_volatile_call(call) for call in calls)
+
+
+def _is_volatile_call(call: pgast.FuncCall) -> bool:
+    return (
+        call.name[-1] in VOLATILE_FUNCTIONS or
+        (len(call.name) > 1 and call.name[0] not in KNOWN_FUNCTION_SCHEMAS)
+    )
+
+
+def _find_ctes(
+        node: pgast.Base,
+        ctes: typing.List[typing.Tuple[pgast.Query, pgast.CommonTableExpr]],
+        refs: typing.Dict[pgast.CommonTableExpr, list]) -> None:
+    """Collect the CTEs in *node* along with references to them.
+
+    The references are recorded as (parent, field, index) tuples,
+    where *index* is None for non-list fields.
+    """
+    if isinstance(node, pgast.Query):
+        for cte in node.ctes or ():
+            ctes.append((node, cte))
+
+    for field, value in ast.iter_fields(node, include_meta=False):
+        if isinstance(value, list):
+            children = enumerate(value)
+        else:
+            children = ((None, value),)
+
+        for index, child in children:
+            if not ast.is_ast_node(child):
+                continue
+
+            if isinstance(child, pgast.RangeVar):
+                if isinstance(child.relation, pgast.CommonTableExpr):
+                    refs[child.relation].append((node, field, index))
+            else:
+                _find_ctes(child, ctes, refs)
+
+
+def _get_child(parent, field, index):
+    value = getattr(parent, field)
+    return value if index is None else value[index]
+
+
+def _set_child(parent, field, index, child):
+    if index is None:
+        setattr(parent, field, child)
+    else:
+        getattr(parent, field)[index] = child
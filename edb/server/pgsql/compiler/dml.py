@@ -36,6 +36,7 @@ from edb.lang.common import ast
 
 from edb.lang.ir import ast as irast
 
+from edb.lang.schema import pointers as s_pointers
 from edb.lang.schema import scalars as s_scalars
 
 from edb.server.pgsql import ast as pgast
@@ -52,6 +53,10 @@ from . import relctx
 from . import typecomp
 
 
+# Columns uniquely identifying a record in a link table.
+LINK_KEY_COLS = ('std::source', 'std::target', 'ptr_item_id')
+
+
 def init_dml_stmt(
         ir_stmt: irast.MutatingStmt, dml_stmt: pgast.DML, *,
         ctx: context.CompilerContextLevel,
@@ -597,14 +602,6 @@ def process_link_update(
     """
     toplevel = ctx.toplevel_stmt
 
-    edgedb_ptr_tab = pgast.RangeVar(
-        relation=pgast.Relation(
-            schemaname='edgedb', name='pointer'
-        ),
-        alias=pgast.Alias(aliasname=ctx.env.aliases.get(hint='ptr')))
-
-    ltab_alias = edgedb_ptr_tab.alias.aliasname
-
     rptr = ir_expr.rptr
     ptrcls = rptr.ptrcls
     target_is_scalar = isinstance(ptrcls.target, s_scalars.ScalarType)
@@ -617,27 +614,40 @@ def process_link_update(
     # base material type.
     mptrcls = ptrcls.material_type()
 
-    # Lookup link class id by link name.
-    lname_to_id = pgast.CommonTableExpr(
-        query=pgast.SelectStmt(
-            from_clause=[
-                edgedb_ptr_tab
-            ],
-            target_list=[
-                pgast.ResTarget(
-                    val=pgast.ColumnRef(name=[ltab_alias, 'id']))
-            ],
-            where_clause=astutils.new_binop(
-                lexpr=pgast.ColumnRef(name=[ltab_alias, 'name']),
-                rexpr=pgast.Constant(val=mptrcls.name),
-                op=ast.ops.EQ
-            )
-        ),
-        name=ctx.env.aliases.get(hint='lid')
-    )
+    ptr_id_sources = []
+    ptr_id = get_pointer_id(mptrcls, ctx=ctx)
+    if ptr_id is None:
+        # Lookup link class id by link name.
+        edgedb_ptr_tab = pgast.RangeVar(
+            relation=pgast.Relation(
+                schemaname='edgedb', name='pointer'
+            ),
+            alias=pgast.Alias(aliasname=ctx.env.aliases.get(hint='ptr')))
 
-    lname_to_id_rvar = pgast.RangeVar(relation=lname_to_id)
-    toplevel.ctes.append(lname_to_id)
+        ltab_alias = edgedb_ptr_tab.alias.aliasname
+
+        lname_to_id = pgast.CommonTableExpr(
+            query=pgast.SelectStmt(
+                from_clause=[
+                    edgedb_ptr_tab
+                ],
+                target_list=[
+                    pgast.ResTarget(
+                        val=pgast.ColumnRef(name=[ltab_alias, 'id']))
+                ],
+                where_clause=astutils.new_binop(
+                    lexpr=pgast.ColumnRef(name=[ltab_alias, 'name']),
+                    rexpr=pgast.Constant(val=mptrcls.name),
+                    op=ast.ops.EQ
+                )
+            ),
+            name=ctx.env.aliases.get(hint='lid')
+        )
+
+        ptr_id_sources.append(pgast.RangeVar(relation=lname_to_id))
+        toplevel.ctes.append(lname_to_id)
+
+        ptr_id = pgast.ColumnRef(name=[lname_to_id.name, 'id'])
 
     target_rvar = dbobj.range_for_ptrcls(
         mptrcls, '>', include_overlays=False, env=ctx.env)
@@ -656,55 +666,91 @@ def process_link_update(
     )
 
     col_data = {
-        'ptr_item_id': pgast.ColumnRef(
-            name=[
-                lname_to_id.name,
-                'id'
-            ]
-        ),
+        'ptr_item_id': ptr_id,
         'std::source': pathctx.get_rvar_path_identity_var(
             dml_cte_rvar, ir_stmt.subject.path_id, env=ctx.env)
     }
 
-    # Drop all previous link records for this source.
-    delcte = pgast.CommonTableExpr(
-        query=pgast.DeleteStmt(
-            relation=target_rvar,
-            where_clause=astutils.new_binop(
-                lexpr=col_data['std::source'],
-                op=ast.ops.EQ,
-                rexpr=pgast.ColumnRef(
-                    name=[target_alias, 'std::source'])
-            ),
-            using_clause=[dml_cte_rvar],
-            returning_list=[
-                pgast.ResTarget(
-                    val=pgast.ColumnRef(
-                        name=[target_alias, pgast.Star()]))
-            ]
-        ),
-        name=ctx.env.aliases.get(hint='d')
-    )
-
-    pathctx.put_path_value_rvar(
-        delcte.query, path_id.ptr_path(), target_rvar, env=ctx.env)
-
-    # Record the effect of this removal in the relation overlay
-    # context to ensure that the RETURNING clause potentially
-    # referencing this link yields the expected results.
-    overlays = ctx.env.rel_overlays[ptrcls.shortname]
-    overlays.append(('except', delcte))
-    toplevel.ctes.append(delcte)
+    if isinstance(ir_stmt, irast.UpdateStmt):
+        operation = ir_stmt.shape_ops.get(ptrcls, irast.ShapeOp.ASSIGN)
+    else:
+        operation = irast.ShapeOp.ASSIGN
 
     # Turn the IR of the expression on the right side of :=
     # into a subquery returning records for the link table.
     data_cte, specified_cols = process_link_values(
         ir_stmt, ir_expr, target_tab_name, tab_cols, col_data,
-        dml_cte_rvar, [lname_to_id_rvar],
+        dml_cte_rvar, ptr_id_sources,
         props_only, target_is_scalar, iterator_cte, ctx=ctx)
 
     toplevel.ctes.append(data_cte)
 
+    conflict_cols = list(LINK_KEY_COLS)
+
+    # Link records are updated differentially: records that are
+    # present in the new set as is are left alone, and only the
+    # difference is deleted and inserted.  Links to scalars may
+    # contain duplicate values and are always replaced entirely.
+    differential = not target_is_scalar
+
+    if operation == irast.ShapeOp.SUBTRACT:
+        match_cols = conflict_cols
+    else:
+        match_cols = tab_cols
+
+    # A newly inserted object has no link records to delete.
+    if (operation != irast.ShapeOp.APPEND and
+            not isinstance(ir_stmt, irast.InsertStmt)):
+        # Drop the previous link records for this source that
+        # are not in the new set (or, for -=, the ones that are).
+        del_cond = astutils.new_binop(
+            lexpr=col_data['std::source'],
+            op=ast.ops.EQ,
+            rexpr=pgast.ColumnRef(
+                name=[target_alias, 'std::source'])
+        )
+
+        if operation == irast.ShapeOp.SUBTRACT:
+            del_cond = astutils.extend_binop(
+                del_cond,
+                _link_record_exists(
+                    target_alias, data_cte, match_cols, specified_cols))
+        elif differential:
+            del_cond = astutils.extend_binop(
+                del_cond,
+                astutils.new_unop(
+                    ast.ops.NOT,
+                    _link_record_exists(
+                        target_alias, data_cte, match_cols,
+                        specified_cols)))
+
+        delcte = pgast.CommonTableExpr(
+            query=pgast.DeleteStmt(
+                relation=target_rvar,
+                where_clause=del_cond,
+                using_clause=[dml_cte_rvar],
+                returning_list=[
+                    pgast.ResTarget(
+                        val=pgast.ColumnRef(
+                            name=[target_alias, pgast.Star()]))
+                ]
+            ),
+            name=ctx.env.aliases.get(hint='d')
+        )
+
+        pathctx.put_path_value_rvar(
+            delcte.query, path_id.ptr_path(), target_rvar, env=ctx.env)
+
+        # Record the effect of this removal in the relation overlay
+        # context to ensure that the RETURNING clause potentially
+        # referencing this link yields the expected results.
+        overlays = ctx.env.rel_overlays[ptrcls.shortname]
+        overlays.append(('except', delcte))
+        toplevel.ctes.append(delcte)
+
+    if operation == irast.ShapeOp.SUBTRACT:
+        return data_cte
+
     data_select = pgast.SelectStmt(
         target_list=[
             pgast.ResTarget(
@@ -716,12 +762,24 @@ def process_link_update(
         ]
     )
 
-    # Inserting rows into the link table may produce cardinality
-    # constraint violations, since the INSERT into the link table
-    # is executed in the snapshot where the above DELETE from
-    # the link table is not visible.  Hence, we need to use
-    # the ON CONFLICT clause to resolve this.
-    conflict_cols = ['std::source', 'std::target', 'ptr_item_id']
+    if (differential and operation == irast.ShapeOp.ASSIGN and
+            not isinstance(ir_stmt, irast.InsertStmt)):
+        # Skip the records that exist already.
+        existing_rvar = dbobj.range_for_ptrcls(
+            mptrcls, '>', include_overlays=False, env=ctx.env)
+        data_select.where_clause = astutils.new_unop(
+            ast.ops.NOT,
+            pgast.SubLink(
+                type=pgast.SubLinkType.EXISTS,
+                expr=pgast.SelectStmt(
+                    from_clause=[existing_rvar],
+                    where_clause=_link_record_match(
+                        existing_rvar.alias.aliasname, data_cte.name,
+                        match_cols, specified_cols)
+                )
+            )
+        )
+
     conflict_inference = []
     conflict_exc_row = []
 
@@ -733,41 +791,59 @@ def process_link_update(
             pgast.ColumnRef(name=['excluded', col])
         )
 
-    conflict_data = pgast.SelectStmt(
-        target_list=[
-            pgast.ResTarget(
-                val=pgast.ColumnRef(
-                    name=[data_cte.name, pgast.Star()]))
-        ],
-        from_clause=[
-            pgast.RangeVar(relation=data_cte)
-        ],
-        where_clause=astutils.new_binop(
-            lexpr=pgast.ImplicitRowExpr(args=conflict_inference),
-            rexpr=pgast.ImplicitRowExpr(args=conflict_exc_row),
-            op='='
+    cols = [pgast.ColumnRef(name=[col]) for col in specified_cols]
+
+    if (operation == irast.ShapeOp.APPEND or
+            set(tab_cols) <= set(conflict_cols)):
+        # Links that are already present are kept as is.
+        on_conflict = pgast.OnConflictClause(
+            action='nothing',
+            infer=pgast.InferClause(
+                index_elems=conflict_inference
+            )
+        )
+    else:
+        # Inserting rows into the link table may produce cardinality
+        # constraint violations, since the INSERT into the link table
+        # is executed in the snapshot where the above DELETE from
+        # the link table is not visible.  Hence, we need to use
+        # the ON CONFLICT clause to resolve this.
+        conflict_data = pgast.SelectStmt(
+            target_list=[
+                pgast.ResTarget(
+                    val=pgast.ColumnRef(
+                        name=[data_cte.name, pgast.Star()]))
+            ],
+            from_clause=[
+                pgast.RangeVar(relation=data_cte)
+            ],
+            where_clause=astutils.new_binop(
+                lexpr=pgast.ImplicitRowExpr(args=conflict_inference),
+                rexpr=pgast.ImplicitRowExpr(args=conflict_exc_row),
+                op='='
+            )
+        )
+
+        on_conflict = pgast.OnConflictClause(
+            action='update',
+            infer=pgast.InferClause(
+                index_elems=conflict_inference
+            ),
+            target_list=[
+                pgast.MultiAssignRef(
+                    columns=cols,
+                    source=conflict_data
+                )
+            ]
         )
-    )
 
-    cols = [pgast.ColumnRef(name=[col]) for col in specified_cols]
     updcte = pgast.CommonTableExpr(
         name=ctx.env.aliases.get(hint='i'),
         query=pgast.InsertStmt(
             relation=target_rvar,
             select_stmt=data_select,
             cols=cols,
-            on_conflict=pgast.OnConflictClause(
-                action='update',
-                infer=pgast.InferClause(
-                    index_elems=conflict_inference
-                ),
-                target_list=[
-                    pgast.MultiAssignRef(
-                        columns=cols,
-                        source=conflict_data
-                    )
-                ]
-            ),
+            on_conflict=on_conflict,
             returning_list=[
                 pgast.ResTarget(
                     val=pgast.ColumnRef(name=[pgast.Star()])
@@ -790,6 +866,60 @@ def process_link_update(
     return data_cte
 
 
+def _link_record_match(
+        rec_alias: str, data_alias: str, match_cols: typing.List[str],
+        specified_cols: typing.List[str]) -> pgast.Base:
+    """Return a condition matching a link record with a new record.
+
+    Link properties not specified in the new record must be NULL in
+    the existing record for the records to match.
+    """
+    key_cols = [col for col in match_cols if col in LINK_KEY_COLS]
+
+    cond = astutils.new_binop(
+        lexpr=pgast.ImplicitRowExpr(args=[
+            pgast.ColumnRef(name=[rec_alias, col]) for col in key_cols
+        ]),
+        rexpr=pgast.ImplicitRowExpr(args=[
+            pgast.ColumnRef(name=[data_alias, col]) for col in key_cols
+        ]),
+        op=ast.ops.EQ
+    )
+
+    for col in match_cols:
+        if col in LINK_KEY_COLS:
+            continue
+        elif col in specified_cols:
+            prop_cond = astutils.new_binop(
+                lexpr=pgast.ColumnRef(name=[rec_alias, col]),
+                rexpr=pgast.ColumnRef(name=[data_alias, col]),
+                op='IS NOT DISTINCT FROM'
+            )
+        else:
+            prop_cond = pgast.NullTest(
+                arg=pgast.ColumnRef(name=[rec_alias, col]))
+
+        cond = astutils.extend_binop(cond, prop_cond)
+
+    return cond
+
+
+def _link_record_exists(
+        rec_alias: str, data_cte: pgast.CommonTableExpr,
+        match_cols: typing.List[str],
+        specified_cols: typing.List[str]) -> pgast.Base:
+    """Return an EXISTS condition checking a link record is in *data_cte*.
+    """
+    return pgast.SubLink(
+        type=pgast.SubLinkType.EXISTS,
+        expr=pgast.SelectStmt(
+            from_clause=[pgast.RangeVar(relation=data_cte)],
+            where_clause=_link_record_match(
+                rec_alias, data_cte.name, match_cols, specified_cols)
+        )
+    )
+
+
 def process_linkprop_update(
         ir_stmt: irast.MutatingStmt, ir_expr: irast.Base,
         wrapper: pgast.Query, dml_cte: pgast.CommonTableExpr, *,
@@ -855,6 +985,27 @@ def process_linkprop_update(
     toplevel.ctes.append(updcte)
 
 
+def get_pointer_id(
+        ptrcls: s_pointers.Pointer, *,
+        ctx: context.CompilerContextLevel) -> typing.Optional[pgast.Base]:
+    """Return a constant expression for the backend id of *ptrcls*.
+
+    :param ptrcls:
+        A material (non-derived) pointer class.
+
+    :return:
+        A uuid constant, or `None` if the id of the pointer is not
+        known at compile time.
+    """
+    ptr_id = ctx.env.pointer_ids.get(ptrcls.name)
+    if ptr_id is None:
+        return None
+
+    return pgast.TypeCast(
+        arg=pgast.Constant(val=str(ptr_id)),
+        type_name=pgast.TypeName(name=('uuid',)))
+
+
 def process_link_values(
         ir_stmt, ir_expr, target_tab, tab_cols, col_data,
         dml_rvar, sources, props_only, target_is_scalar, iterator_cte, *,
@@ -103,13 +103,33 @@ def compile_Parameter(
 @dispatch.compile.register(irast.Constant)
 def compile_Constant(
         expr: irast.Base, *, ctx: context.CompilerContextLevel) -> pgast.Base:
-    result = pgast.Constant(val=expr.value)
+    if (ctx.env.extract_constants and expr.value is not None and
+            isinstance(expr.type, s_scalars.ScalarType)):
+        result = _constant_as_param(expr, ctx=ctx)
+    else:
+        result = pgast.Constant(val=expr.value)
+
     result = typecomp.cast(
         result, source_type=expr.type, target_type=expr.type,
         force=True, env=ctx.env)
     return result
 
 
+def _constant_as_param(
+        expr: irast.Constant, *,
+        ctx: context.CompilerContextLevel) -> pgast.ParamRef:
+    # The same constant may be compiled more than once, e.g. in
+    # the target list and in GROUP BY, and the expressions must match.
+    name = ctx.env.constant_params.get(expr)
+    if name is None:
+        name = f'~const{len(ctx.env.constant_params)}'
+        ctx.env.constant_params[expr] = name
+        ctx.env.constants[name] = expr.value
+        ctx.argmap[name] = len(ctx.argmap) + 1
+
+    return pgast.ParamRef(number=ctx.argmap[name])
+
+
 @dispatch.compile.register(irast.TypeCast)
 def compile_TypeCast(
         expr: irast.TypeCast, *,
@@ -304,9 +324,13 @@ def compile_BinOp(
         right = dispatch.compile(expr.right, ctx=newctx)
 
     if isinstance(expr.op, ast.ops.TypeCheckOperator):
-        result = pgast.FuncCall(
-            name=('edgedb', 'issubclass'),
-            args=[left, right])
+        type_ids = _get_type_id_set(expr.right, ctx=ctx)
+        if type_ids is not None:
+            result = astutils.new_binop(left, type_ids, op='=')
+        else:
+            result = pgast.FuncCall(
+                name=('edgedb', 'issubclass'),
+                args=[left, right])
 
         if expr.op == ast.ops.IS_NOT:
             result = astutils.new_unop(ast.ops.NOT, result)
@@ -574,7 +598,10 @@ def _compile_shape(
             ptrdir = rptr.direction or s_pointers.PointerDirection.Outbound
             is_singleton = ptrcls.singular(ptrdir)
 
-            if (irutils.is_subquery_set(el) or
+            if (not is_singleton and ctx.env.batch_shapes and
+                    _can_batch_shape_el(el, ctx=shapectx)):
+                value = relgen.set_as_grouped_array(el, ctx=shapectx)
+            elif (irutils.is_subquery_set(el) or
                     isinstance(el.scls, s_objtypes.ObjectType) or
                     not is_singleton or
                     not ptrcls.required):
@@ -619,6 +646,36 @@ def _compile_shape(
     return result
 
 
+def _can_batch_shape_el(
+        el: irast.Set, *, ctx: context.CompilerContextLevel) -> bool:
+    """Check if a shape element can be compiled by set_as_grouped_array.
+
+    Only plain link paths are batched, and all the nested shapes must
+    consist of plain paths as well, as the batched query is not correlated
+    with the outer relations the nested elements could refer to.
+    """
+    rel = ctx.rel
+    if (not isinstance(rel, pgast.SelectStmt) or not rel.from_clause or
+            rel.group_clause or astutils.is_set_op_query(rel)):
+        return False
+
+    rptr = el.rptr
+    if (rptr.ptrcls.is_link_property() or
+            rptr.direction == s_pointers.PointerDirection.Inbound or
+            not isinstance(rptr.source.scls, s_objtypes.ObjectType)):
+        return False
+
+    return _is_plain_shape_el(el)
+
+
+def _is_plain_shape_el(el: irast.Set) -> bool:
+    if (el.expr is not None or irutils.is_subquery_set(el) or
+            el.path_id.is_type_indirection_path()):
+        return False
+
+    return all(_is_plain_shape_el(sub_el) for sub_el in el.shape)
+
+
 def _compile_set_in_singleton_mode(
         node: irast.Set, *, ctx: context.CompilerContextLevel) -> pgast.Base:
     if isinstance(node, irast.EmptySet):
@@ -656,6 +713,52 @@ def _compile_set_in_singleton_mode(
         return colref
 
 
+def _get_type_id_set(
+        typeref: irast.Base, *,
+        ctx: context.CompilerContextLevel) -> typing.Optional[pgast.Base]:
+    """Return ANY(<ids of typeref and its descendants>) for an object type.
+
+    The set of the descendants is known at compile time, so the type
+    check is compiled into a lookup in a set of type ids that Postgres
+    computes once per query, rather than an ancestry lookup for every
+    checked row.
+    """
+    if not isinstance(typeref, irast.TypeRef) or typeref.subtypes:
+        return None
+
+    scls = ctx.env.schema.get(typeref.maintype, None)
+    if not isinstance(scls, s_objtypes.ObjectType):
+        return None
+
+    names = {scls.name}
+    children = [scls]
+    while children:
+        child = children.pop()
+        for descendant in child.descendants(ctx.env.schema):
+            if descendant.name not in names:
+                names.add(descendant.name)
+                children.append(descendant)
+
+    type_ids = pgast.ArrayExpr(elements=[
+        pgast.FuncCall(
+            name=('edgedb', '_resolve_type_id'),
+            args=[pgast.Constant(val=name)],
+        )
+        for name in sorted(names)
+    ])
+
+    return pgast.SubLink(
+        type=pgast.SubLinkType.ANY,
+        expr=pgast.SelectStmt(
+            target_list=[
+                pgast.ResTarget(
+                    val=pgast.FuncCall(name=('unnest',), args=[type_ids])
+                )
+            ]
+        )
+    )
+
+
 def _infer_type(
         expr: irast.Base, *,
         ctx: context.CompilerContextLevel) -> s_obj.Object:
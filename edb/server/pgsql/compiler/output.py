@@ -25,10 +25,23 @@ from edb.server.pgsql import ast as pgast
 from . import context
 
 
+def _get_json_type(env: context.Environment) -> str:
+    """Return the type of serialized values: json or jsonb.
+
+    The JSON output format builds json values: the output is only ever
+    emitted as text, so there is no need to pay for the conversion to
+    jsonb, which also reorders object keys.
+    """
+    if env.output_format == context.OutputFormat.JSONB:
+        return 'jsonb'
+    else:
+        return 'json'
+
+
 def tuple_var_as_json_object(tvar, *, env):
     if not tvar.named:
         return pgast.FuncCall(
-            name=('jsonb_build_array',),
+            name=(f'{_get_json_type(env)}_build_array',),
             args=[serialize_expr(t.val, nested=True, env=env)
                   for t in tvar.elements],
             null_safe=True, nullable=tvar.nullable)
@@ -51,7 +64,7 @@ def tuple_var_as_json_object(tvar, *, env):
             keyvals.append(val)
 
         return pgast.FuncCall(
-            name=('jsonb_build_object',),
+            name=(f'{_get_json_type(env)}_build_object',),
             args=keyvals, null_safe=True, nullable=tvar.nullable)
 
 
@@ -87,16 +100,18 @@ def serialize_expr(
         nested: bool=False,
         env: context.Environment) -> pgast.Base:
 
-    if env.output_format == context.OutputFormat.JSON:
+    if env.output_format in (context.OutputFormat.JSON,
+                             context.OutputFormat.JSONB):
         if isinstance(expr, pgast.TupleVar):
             val = tuple_var_as_json_object(expr, env=env)
         elif isinstance(expr, pgast.ImplicitRowExpr):
             val = pgast.FuncCall(
-                name=('jsonb_build_array',), args=expr.args,
-                null_safe=True)
+                name=(f'{_get_json_type(env)}_build_array',),
+                args=expr.args, null_safe=True)
         elif not nested:
             val = pgast.FuncCall(
-                name=('to_jsonb',), args=[expr], null_safe=True)
+                name=(f'to_{_get_json_type(env)}',), args=[expr],
+                null_safe=True)
         else:
             val = expr
 
@@ -114,7 +129,8 @@ def top_output_as_value(
         env: context.Environment) -> pgast.Query:
     """Finalize output serialization on the top level."""
 
-    if env.output_format == context.OutputFormat.JSON:
+    if env.output_format in (context.OutputFormat.JSON,
+                             context.OutputFormat.JSONB):
         # For JSON we just want to aggregate the whole thing
         # into a JSON array.
         subrvar = pgast.RangeSubselect(
@@ -157,6 +173,8 @@ def top_output_as_value(
         )
 
         result.ctes = stmt.ctes
+        result.argnames = stmt.argnames
+        result.constants = stmt.constants
         stmt.ctes = []
 
         return result
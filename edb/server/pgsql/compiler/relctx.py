@@ -300,11 +300,17 @@ def new_empty_rvar(
 
 def new_root_rvar(
         ir_set: irast.Set, nullable: bool=False, *,
+        objtype: typing.Optional[s_objtypes.ObjectType]=None,
         ctx: context.CompilerContextLevel) -> pgast.BaseRangeVar:
     if not isinstance(ir_set.scls, s_objtypes.ObjectType):
         raise ValueError('cannot create root rvar for non-object path')
 
-    set_rvar = dbobj.range_for_set(ir_set, env=ctx.env)
+    if objtype is None:
+        set_rvar = dbobj.range_for_set(ir_set, env=ctx.env)
+    else:
+        # The set is known to only contain objects of *objtype*.
+        set_rvar = dbobj.range_for_objtype(
+            objtype, ir_set.path_id, env=ctx.env)
     set_rvar.nullable = nullable
     set_rvar.path_scope.add(ir_set.path_id)
     set_rvar.value_scope.add(ir_set.path_id)
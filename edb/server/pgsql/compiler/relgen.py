@@ -20,6 +20,7 @@
 """Compiler functions to generate SQL relations for IR sets."""
 
 
+import collections
 import contextlib
 import typing
 
@@ -315,6 +316,172 @@ def set_to_array(
     return result
 
 
+def set_as_grouped_array(
+        ir_set: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> pgast.ColumnRef:
+    """Collapse a path set into arrays grouped by the path source.
+
+    Unlike set_to_array(), which is a subquery evaluated for every row
+    of the source, the set is computed for all source objects at once:
+
+        LEFT JOIN (
+            SELECT <source>, array_agg(<set_rel>.v)
+            FROM <source> JOIN <link> JOIN <target>
+            WHERE <source> = ANY(<sources in the current rel>)
+            GROUP BY <source>
+        ) ON <source> = <current rel source>
+
+    The WHERE clause is added by fini_grouped_arrays() once the current
+    relation is complete.
+
+    Return a reference to the array column of the joined query.
+    """
+    ir_source = ir_set.rptr.source
+    src_path_id = ir_source.path_id
+    # The grouped queries of nested shapes are registered while the
+    # set is compiled, and must be restricted after this one.
+    grouped_idx = len(ctx.env.grouped_arrays)
+
+    with ctx.newrel() as subctx:
+        # The query must not be correlated with the current relation,
+        # so start with an empty path scope.
+        subctx.path_scope = collections.ChainMap()
+        wrapper = subctx.rel
+
+        src_rvar = relctx.new_root_rvar(ir_source, ctx=subctx)
+        relctx.include_rvar(wrapper, src_rvar, src_path_id, ctx=subctx)
+        subctx.path_scope[src_path_id] = wrapper
+
+        dispatch.compile(ir_set, ctx=subctx)
+
+        if output.in_serialization_ctx(ctx):
+            pathctx.get_path_serialized_output(
+                rel=wrapper, path_id=ir_set.path_id, env=ctx.env)
+        else:
+            pathctx.get_path_value_output(
+                rel=wrapper, path_id=ir_set.path_id, env=ctx.env)
+
+        pathctx.get_path_identity_output(
+            rel=wrapper, path_id=src_path_id, env=ctx.env)
+
+    grouped = set_to_array(ir_set, wrapper, ctx=ctx)
+
+    src_ref = pathctx.get_path_identity_var(
+        grouped, src_path_id, env=ctx.env)
+    src_alias = pathctx.get_path_output_alias(
+        src_path_id, 'identity', env=ctx.env)
+    grouped.target_list.append(pgast.ResTarget(name=src_alias, val=src_ref))
+    grouped.group_clause = [src_ref]
+
+    arr_alias = ctx.env.aliases.get('arr')
+    grouped.target_list[0].name = arr_alias
+
+    grouped_rvar = dbobj.rvar_for_rel(grouped, env=ctx.env)
+    grouped_rvar.nullable = True
+
+    parent_src_ref = pathctx.get_path_identity_var(
+        ctx.rel, src_path_id, env=ctx.env)
+
+    condition = astutils.new_binop(
+        parent_src_ref, dbobj.get_column(grouped_rvar, src_alias), op='=')
+
+    ctx.rel.from_clause[0] = pgast.JoinExpr(
+        type='left', larg=ctx.rel.from_clause[0], rarg=grouped_rvar,
+        quals=condition)
+
+    wrapper_src_ref = pathctx.get_path_identity_var(
+        wrapper, src_path_id, env=ctx.env)
+    ctx.env.grouped_arrays.insert(
+        grouped_idx,
+        (ctx.rel, parent_src_ref, grouped_rvar, wrapper, wrapper_src_ref))
+
+    return dbobj.get_column(grouped_rvar, arr_alias)
+
+
+def fini_grouped_arrays(*, env: context.Environment) -> None:
+    """Restrict the grouped queries of set_as_grouped_array() to parents.
+
+    The grouped query is joined to the relation it is computed for
+    (the parent) on the source identity, but is not correlated with it,
+    so without a restriction it would aggregate the link for all source
+    objects in the database.  Filter it by a semi-join on the identities
+    of the parent rows, which are only known once the parent relation
+    is complete, i.e. at the end of compilation.  The parents are
+    processed before the grouped queries of their nested shapes, so
+    that every level is restricted by the level above it.
+
+    If the parent rows cannot be selected without the grouped queries,
+    the grouped query is correlated with the parent row instead, like
+    the subquery of set_to_array().
+    """
+    for parent, parent_src_ref, rvar, query, src_ref in env.grouped_arrays:
+        parent_ids = _get_grouped_array_parent_ids(parent, parent_src_ref)
+        if parent_ids is None:
+            rvar.lateral = True
+            condition = astutils.new_binop(src_ref, parent_src_ref, op='=')
+        else:
+            condition = astutils.new_binop(
+                src_ref,
+                pgast.SubLink(type=pgast.SubLinkType.ANY, expr=parent_ids),
+                op='=')
+
+        query.where_clause = astutils.extend_binop(
+            query.where_clause, condition)
+
+
+def _get_grouped_array_parent_ids(
+        parent: pgast.SelectStmt,
+        parent_src_ref: pgast.Base) -> typing.Optional[pgast.SelectStmt]:
+    """Return a query selecting the source identities of *parent* rows.
+
+    This is *parent* without the joined grouped queries.  Return None if
+    the remaining clauses refer to the grouped queries.
+    """
+    grouped_aliases = set()
+    from_clause = list(parent.from_clause)
+    from_clause[0] = _strip_grouped_joins(from_clause[0], grouped_aliases)
+
+    query = pgast.SelectStmt(
+        target_list=[pgast.ResTarget(val=parent_src_ref)],
+        from_clause=from_clause,
+        where_clause=parent.where_clause,
+    )
+
+    if parent.limit_count is not None or parent.limit_offset is not None:
+        query.sort_clause = parent.sort_clause
+        query.limit_count = parent.limit_count
+        query.limit_offset = parent.limit_offset
+
+    refs = ast.find_children(
+        query, lambda n: (isinstance(n, pgast.ColumnRef) and
+                          n.name[0] in grouped_aliases),
+        force_traversal=True)
+    if refs:
+        return None
+
+    return query
+
+
+def _strip_grouped_joins(
+        from_item: pgast.Base, aliases: typing.Set[str]) -> pgast.Base:
+    if not isinstance(from_item, pgast.JoinExpr):
+        return from_item
+
+    larg = _strip_grouped_joins(from_item.larg, aliases)
+
+    if (from_item.type == 'left' and
+            isinstance(from_item.rarg, pgast.RangeSubselect) and
+            from_item.rarg.query.group_clause):
+        aliases.add(from_item.rarg.alias.aliasname)
+        return larg
+    elif larg is from_item.larg:
+        return from_item
+    else:
+        return pgast.JoinExpr(
+            type=from_item.type, larg=larg, rarg=from_item.rarg,
+            quals=from_item.quals)
+
+
 def prepare_optional_rel(
         *, ir_set: irast.Set, stmt: pgast.Query,
         ctx: context.CompilerContextLevel) \
@@ -482,7 +649,8 @@ def process_set_as_root(
         ir_set: irast.Set, stmt: pgast.Query, *,
         ctx: context.CompilerContextLevel) -> SetRVars:
 
-    rvar = relctx.new_root_rvar(ir_set, ctx=ctx)
+    objtype = _get_root_type_indirection_target(ir_set, ctx=ctx)
+    rvar = relctx.new_root_rvar(ir_set, objtype=objtype, ctx=ctx)
     return new_source_set_rvar(ir_set, rvar)
 
 
@@ -543,6 +711,79 @@ def process_set_as_link_property_ref(
     return SetRVars(main=SetRVar(link_rvar, ir_set.path_id), new=rvars)
 
 
+def _get_root_type_indirection_target(
+        ir_set: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> typing.Optional[
+            s_objtypes.ObjectType]:
+    """Return the type a root set can range over instead of its own.
+
+    In ``SELECT (Text[IS Issue].number, Text.body)``, ``Text`` is bound
+    in the same scope as a non-optional ``Text[IS Issue]``, so every
+    ``Text`` element that is not an ``Issue`` produces no result, and
+    ``Text`` can range over the ``Issue`` table instead of over all
+    ``Text`` descendants.  Indirections in fenced or optional subtrees,
+    such as in aggregates, shapes or the ``??`` operator, do not
+    eliminate the elements, and are ignored.
+    """
+    if (not isinstance(ir_set.scls, s_objtypes.ObjectType) or
+            ir_set.scls.is_virtual):
+        return None
+
+    node = ctx.scope_tree.find_visible(ir_set.path_id)
+    if node is None or node.optional or node.parent is None:
+        return None
+
+    nodes = list(node.parent.children)
+    while nodes:
+        child = nodes.pop(0)
+        if child.fenced or child.optional:
+            continue
+
+        path_id = child.path_id
+        if (path_id is not None and
+                path_id.rptr_name() == '__type__::indirection' and
+                path_id.src_path() == ir_set.path_id):
+            target = path_id[-1].material_type()
+            if (target is not ir_set.scls.material_type() and
+                    target.issubclass(ir_set.scls)):
+                return target
+
+        nodes.extend(child.children)
+
+    return None
+
+
+def _can_prune_type_indirection_source(
+        ir_set: irast.Set, *, ctx: context.CompilerContextLevel) -> bool:
+    """Check if the source of *ir_set* type indirection can be pruned.
+
+    In ``Text[IS Issue]``, where ``Text`` is private to the indirection,
+    every ``Text`` element that is not an ``Issue`` is filtered out by
+    the indirection, so ``Text`` can range over the ``Issue`` table
+    instead of over all ``Text`` descendants.  See also
+    _get_root_type_indirection_target() for the case of ``Text``
+    bound in the same scope as the indirection.
+    """
+    rptr = ir_set.rptr
+    ir_source = rptr.source
+
+    if (rptr.ptrcls.shortname != '__type__::indirection' or
+            ir_source.rptr is not None or
+            ir_source.expr is not None or
+            not isinstance(ir_source.scls, s_objtypes.ObjectType) or
+            ir_source.scls.is_virtual or
+            not ir_set.scls.issubclass(ir_source.scls)):
+        return False
+
+    if relctx.maybe_get_path_rvar(
+            ctx.rel, ir_source.path_id, aspect='value', ctx=ctx) is not None:
+        return False
+
+    # If the source is not bound in scope, it is private to
+    # this indirection.
+    return ctx.scope_tree.find_visible(ir_source.path_id) is None
+
+
 def process_set_as_path(
         ir_set: irast.Set, stmt: pgast.Query, *,
         ctx: context.CompilerContextLevel) -> SetRVars:
@@ -561,6 +802,15 @@ def process_set_as_path(
         return new_simple_set_rvar(ir_set, rvar, ['value', 'source'])
 
     if ir_set.path_id.is_type_indirection_path():
+        if _can_prune_type_indirection_source(ir_set, ctx=ctx):
+            # Bind the source set to the range of the target type
+            # instead of joining the target type to the source.
+            poly_rvar = relctx.new_poly_rvar(ir_set, ctx=ctx)
+            relctx.include_rvar(stmt, poly_rvar, ir_set.path_id, ctx=ctx)
+            relctx.include_rvar(stmt, poly_rvar, ir_source.path_id, ctx=ctx)
+            sub_rvar = relctx.new_rel_rvar(ir_set, stmt, ctx=ctx)
+            return new_simple_set_rvar(ir_set, sub_rvar, ['value', 'source'])
+
         get_set_rvar(ir_source, ctx=ctx)
         poly_rvar = relctx.new_poly_rvar(ir_set, nullable=True, ctx=ctx)
         relctx.include_rvar(stmt, poly_rvar, ir_set.path_id, ctx=ctx)
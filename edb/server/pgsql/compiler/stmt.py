@@ -88,11 +88,65 @@ def compile_SelectStmt(
         query.limit_count = clauses.compile_limit_offset_clause(
             stmt.limit, ctx=ctx)
 
+        if query.limit_offset is not None or query.limit_count is not None:
+            _push_down_limit(stmt, query, ctx=ctx)
+
         clauses.fini_stmt(query, ctx, parent_ctx)
 
     return query
 
 
+def _push_down_limit(
+        stmt: irast.SelectStmt, query: pgast.SelectStmt, *,
+        ctx: context.CompilerContextLevel) -> None:
+    """Move OFFSET and LIMIT of *query* into the subquery of its result.
+
+    In ``SELECT Foo {...} ORDER BY ... LIMIT ...`` the ordering is done
+    in the subquery producing the result set, while the shape is computed
+    in the outer query.  With OFFSET and LIMIT in the outer query, the
+    shape is computed for all the skipped rows too, and Postgres cannot
+    use a bounded sort.  When the outer query does not filter or
+    multiply the rows of the subquery, apply OFFSET and LIMIT right
+    after ORDER BY instead.
+    """
+    if (stmt.iterator_stmt is not None or
+            not isinstance(stmt.result.expr, irast.SelectStmt) or
+            query.where_clause is not None or query.sort_clause or
+            query.distinct_clause or query.group_clause or
+            len(query.from_clause) != 1):
+        return
+
+    rvar = pathctx.maybe_get_path_rvar(
+        query, stmt.result.path_id, aspect='value', env=ctx.env)
+    if not isinstance(rvar, pgast.RangeSubselect):
+        return
+
+    subquery = rvar.subquery
+    if (not isinstance(subquery, pgast.SelectStmt) or
+            astutils.is_set_op_query(subquery) or
+            subquery.limit_offset is not None or
+            subquery.limit_count is not None):
+        return
+
+    from_item = query.from_clause[0]
+    while isinstance(from_item, pgast.JoinExpr):
+        # Batched shape elements are LEFT JOINed to the result on the
+        # grouping key, which does not change the number of rows.
+        if (from_item.type != 'left' or
+                not isinstance(from_item.rarg, pgast.RangeSubselect) or
+                not from_item.rarg.query.group_clause):
+            return
+        from_item = from_item.larg
+
+    if from_item is not rvar:
+        return
+
+    subquery.limit_offset = query.limit_offset
+    subquery.limit_count = query.limit_count
+    query.limit_offset = None
+    query.limit_count = None
+
+
 @dispatch.compile.register(irast.GroupStmt)
 def compile_GroupStmt(
         stmt: irast.GroupStmt, *,
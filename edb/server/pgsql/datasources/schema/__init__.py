@@ -27,4 +27,5 @@ from . import objects  # NOQA
 from . import objtypes  # NOQA
 from . import policy  # NOQA
 from . import scalars  # NOQA
+from . import version  # NOQA
 from . import views  # NOQA
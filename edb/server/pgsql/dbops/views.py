@@ -25,10 +25,11 @@ from . import ddl
 
 
 class View(base.DBObject):
-    def __init__(self, name, query):
+    def __init__(self, name, query, *, materialized=False):
         super().__init__()
         self.name = name
         self.query = query
+        self.materialized = materialized
 
 
 class CreateView(ddl.SchemaObjectOperation):
@@ -40,8 +41,10 @@ class CreateView(ddl.SchemaObjectOperation):
 
     async def code(self, context):
         code = (
-            'CREATE VIEW {name} AS\n{query}'
+            'CREATE {kind} {name} AS\n{query}'
         ).format(
+            kind=('MATERIALIZED VIEW' if self.view.materialized
+                  else 'VIEW'),
             name=common.qname(*self.view.name),
             query=textwrap.indent(textwrap.dedent(self.view.query), '    ')
         )
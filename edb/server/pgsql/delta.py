@@ -757,7 +757,45 @@ class ViewCapableObjectMetaCommand(NamedObjectMetaCommand):
         return rec, updates
 
 
-class ScalarTypeMetaCommand(ViewCapableObjectMetaCommand):
+class TypeMetaCommand(ViewCapableObjectMetaCommand):
+    def update_ancestry(self, scls, schema, *, ops=None):
+        """Make the edgedb.type_ancestry rows of *scls* match its mro.
+
+        A change of the bases of *scls* changes the mro of all of its
+        descendants as well, so their rows are updated too.
+        """
+        if ops is None:
+            ops = self.pgops
+
+        for t in [scls, *scls.descendants(schema)]:
+            ancestors = [str(a.name) for a in t.get_mro()[1:]]
+
+            ops.add(dbops.Query('''
+                WITH
+                    t AS (SELECT id FROM edgedb.NamedObject
+                          WHERE name = $1),
+                    a AS (SELECT id FROM edgedb.NamedObject
+                          WHERE name = any($2::text[])),
+                    d AS (DELETE FROM edgedb.type_ancestry ta USING t
+                          WHERE ta.type_id = t.id AND
+                                ta.ancestor_id NOT IN (SELECT id FROM a))
+                INSERT INTO edgedb.type_ancestry (type_id, ancestor_id)
+                SELECT t.id, a.id FROM t, a
+                ON CONFLICT DO NOTHING
+            ''', [str(t.name), ancestors]))
+
+    def delete_ancestry(self, scls, *, ops=None):
+        if ops is None:
+            ops = self.pgops
+
+        ops.add(dbops.Query('''
+            DELETE FROM edgedb.type_ancestry
+            WHERE type_id = (SELECT id FROM edgedb.NamedObject
+                             WHERE name = $1)
+        ''', [str(scls.name)]))
+
+
+class ScalarTypeMetaCommand(TypeMetaCommand):
     table = metaschema.get_metaclass_table(s_scalars.ScalarType)
 
     def is_sequence(self, schema, scalar):
@@ -844,6 +882,7 @@ class CreateScalarType(ScalarTypeMetaCommand,
         ScalarTypeMetaCommand.apply(self, schema, context)
 
         updates = self.create_object(schema, scalar)
+        self.update_ancestry(scalar, schema)
 
         if scalar.is_abstract:
             return scalar
@@ -923,6 +962,9 @@ class AlterScalarType(ScalarTypeMetaCommand, adapts=s_scalars.AlterScalarType):
                 dbops.Update(
                     table=self.table, record=updaterec, condition=condition))
 
+            if 'mro' in updates:
+                self.update_ancestry(new_scalar, schema)
+
         self.alter_scalar(
             self, schema, context, old_scalar, new_scalar, updates=updates)
 
@@ -992,6 +1034,7 @@ class DeleteScalarType(ScalarTypeMetaCommand,
         ops.add(
             dbops.DropDomain(
                 name=old_domain_name, conditions=[cond], priority=3))
+        self.delete_ancestry(scalar, ops=ops)
         ops.add(
             dbops.Delete(
                 table=self.table, condition=[(
@@ -1532,8 +1575,7 @@ class DeleteSourceIndex(SourceIndexCommand, DeleteNamedObject,
         return index
 
 
-class ObjectTypeMetaCommand(ViewCapableObjectMetaCommand,
-                            CompositeObjectMetaCommand):
+class ObjectTypeMetaCommand(TypeMetaCommand, CompositeObjectMetaCommand):
     @property
     def table(self):
         if self.scls.is_virtual:
@@ -1559,6 +1601,7 @@ class CreateObjectType(ObjectTypeMetaCommand,
         if is_virtual or is_derived:
             objtype = s_objtypes.CreateObjectType.apply(self, schema, context)
             self.create_object(schema, objtype)
+            self.update_ancestry(objtype, schema)
             return objtype
 
         new_table_name = common.objtype_name_to_table_name(
@@ -1580,6 +1623,7 @@ class CreateObjectType(ObjectTypeMetaCommand,
         ObjectTypeMetaCommand.apply(self, schema, context)
 
         fields = self.create_object(schema, objtype)
+        self.update_ancestry(objtype, schema)
 
         if objtype.name.module != 'schema':
             constr_name = common.edgedb_name_to_pg_name(
@@ -1707,6 +1751,9 @@ class AlterObjectType(ObjectTypeMetaCommand,
                 dbops.Update(
                     table=self.table, record=updaterec, condition=condition))
 
+            if 'mro' in updates:
+                self.update_ancestry(objtype, schema)
+
         if self.has_table(objtype, schema):
             self.attach_alter_table(context)
 
@@ -1726,6 +1773,7 @@ class DeleteObjectType(ObjectTypeMetaCommand,
         objtype = s_objtypes.DeleteObjectType.apply(self, schema, context)
         ObjectTypeMetaCommand.apply(self, schema, context)
 
+        self.delete_ancestry(objtype)
         self.delete(schema, context, objtype)
 
         if self.has_table(objtype, schema):
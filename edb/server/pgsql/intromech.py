@@ -62,12 +62,14 @@ class IntrospectionMech:
 
     def __init__(self, connection):
         self.schema = None
+        self.schema_version = None
         self._constr_mech = schemamech.ConstraintMech()
         self._type_mech = schemamech.TypeMech()
 
         self.scalar_cache = {}
         self.link_cache = {}
         self.link_property_cache = {}
+        self.pointer_cache = {}
         self.type_cache = {}
         self.table_cache = {}
         self.domain_to_scalar_map = {}
@@ -85,10 +87,12 @@ class IntrospectionMech:
 
     def invalidate_cache(self):
         self.schema = None
+        self.schema_version = None
         self._constr_mech.invalidate_schema_cache()
         self._type_mech.invalidate_schema_cache()
         self.link_cache.clear()
         self.link_property_cache.clear()
+        self.pointer_cache.clear()
         self.type_cache.clear()
         self.scalar_cache.clear()
         self.table_cache.clear()
@@ -154,7 +158,22 @@ class IntrospectionMech:
 
     async def getschema(self):
         if self.schema is None:
-            self.schema = await self.readschema()
+            # The schema is read by many queries, so if a DDL transaction
+            # commits while it is being read, the schema may not match
+            # the version that was read before, and it is read again.
+            version = await datasources.schema.version.fetch(
+                self.connection)
+
+            while True:
+                schema = await self.readschema()
+                new_version = await datasources.schema.version.fetch(
+                    self.connection)
+                if new_version == version:
+                    break
+                version = new_version
+
+            self.schema = schema
+            self.schema_version = version
 
         return self.schema
 
@@ -563,6 +582,8 @@ class IntrospectionMech:
         basemap = {}
 
         for name, r in links_list.items():
+            self.pointer_cache[name] = r['id']
+
             bases = tuple()
 
             if r['source']:
@@ -661,6 +682,7 @@ class IntrospectionMech:
         basemap = {}
 
         for name, r in link_props.items():
+            self.pointer_cache[name] = r['id']
 
             bases = ()
 
@@ -115,6 +115,44 @@ class ObjectTable(dbops.Table):
         )
 
 
+class TypeAncestryTable(dbops.Table):
+    """A flattened (type, ancestor) closure of the type hierarchy.
+
+    The table mirrors the ``mro`` of every inheriting schema object and is
+    maintained by the DDL commands, so that the subclass checks are
+    primary key lookups.
+    """
+    def __init__(self):
+        super().__init__(
+            name=('edgedb', 'type_ancestry'),
+            columns=[
+                dbops.Column(name='type_id', type='uuid', required=True),
+                dbops.Column(name='ancestor_id', type='uuid', required=True),
+            ],
+            constraints=[
+                dbops.PrimaryKey(
+                    ('edgedb', 'type_ancestry'),
+                    columns=('type_id', 'ancestor_id'))
+            ]
+        )
+
+
+class SchemaVersionTable(dbops.Table):
+    """A single-row table holding the current version of the schema.
+
+    The version is a random UUID that is replaced by every DDL
+    transaction, so the caches of data derived from the schema can be
+    shared between connections that see the same schema version.
+    """
+    def __init__(self):
+        super().__init__(
+            name=('edgedb', 'schema_version'),
+            columns=[
+                dbops.Column(name='version', type='uuid', required=True),
+            ]
+        )
+
+
 class RaiseExceptionFunction(dbops.Function):
     text = '''
     BEGIN
@@ -389,10 +427,10 @@ class LinkNameToTableNameFunction(dbops.Function):
 class IssubclassFunction(dbops.Function):
     text = '''
         SELECT
-            clsid = any(classes) OR (
-                SELECT classes && o.mro
-                FROM edgedb.InheritingObject o
-                WHERE o.id = clsid
+            clsid = any(classes) OR EXISTS (
+                SELECT
+                FROM edgedb.type_ancestry a
+                WHERE a.type_id = clsid AND a.ancestor_id = any(classes)
             );
     '''
 
@@ -408,10 +446,10 @@ class IssubclassFunction(dbops.Function):
 class IssubclassFunction2(dbops.Function):
     text = '''
         SELECT
-            clsid = pclsid OR (
-                SELECT pclsid = any(o.mro)
-                FROM edgedb.InheritingObject o
-                WHERE o.id = clsid
+            clsid = pclsid OR EXISTS (
+                SELECT
+                FROM edgedb.type_ancestry a
+                WHERE a.type_id = clsid AND a.ancestor_id = pclsid
             );
     '''
 
@@ -519,6 +557,60 @@ class OrFilterFunction(dbops.Function):
             text='SELECT (a OR b) AND (a::int | b::int)::bool')
 
 
+class RefreshViewsFunction(dbops.Function):
+    """Refresh the materialized introspection views.
+
+    Only the views that read the metadata tables modified by the
+    current transaction are refreshed, as reported by
+    pg_stat_xact_user_tables.  *deps* maps the names of the views to
+    the names of the tables they depend on.  The views are refreshed
+    in the order of their creation, which is the order of their
+    dependencies on each other.
+
+    The views are refreshed CONCURRENTLY, which takes an EXCLUSIVE
+    lock instead of ACCESS EXCLUSIVE, so the DDL transaction does not
+    block the introspection queries of other connections, which see
+    the previous contents of the views until it commits.
+    """
+    text = '''
+        DECLARE
+            changed text[];
+            refresh_all bool;
+        BEGIN
+            -- The modified tables are not known without the statistics.
+            refresh_all := NOT current_setting('track_counts')::bool;
+
+            SELECT array_agg(relname) INTO changed
+                FROM pg_stat_xact_user_tables
+                WHERE schemaname = 'edgedb' AND
+                      n_tup_ins + n_tup_upd + n_tup_del > 0;
+            {refresh}
+        END;
+    '''
+
+    refresh_text = '''
+            IF refresh_all OR changed && ARRAY[{tables}]::text[] THEN
+                REFRESH MATERIALIZED VIEW CONCURRENTLY {view};
+            END IF;
+    '''
+
+    def __init__(self, views, deps):
+        refresh = ''.join(
+            self.refresh_text.format(
+                view=common.qname(*view.name),
+                tables=', '.join(
+                    common.quote_literal(t) for t in sorted(deps[view.name])))
+            for view in views)
+
+        super().__init__(
+            name=('edgedb', '_refresh_views'),
+            args=[],
+            returns='void',
+            volatility='volatile',
+            language='plpgsql',
+            text=self.text.format(refresh=refresh))
+
+
 def _field_to_column(field):
     ftype = field.type[0]
     coltype = None
@@ -569,6 +661,9 @@ def _field_to_column(field):
 
 metaclass_tables = collections.OrderedDict()
 
+# The column numbering the rows of the introspection views.
+VIEW_ROW_KEY = 'edgedb::row'
+
 
 def get_interesting_metaclasses():
     metaclasses = s_obj.ObjectMeta.get_schema_metaclasses()
@@ -636,6 +731,12 @@ async def bootstrap(conn):
         dbops.CreateCompositeType(TypeDescType()),
         dbops.CreateDomain(('edgedb', 'known_record_marker_t'), 'text'),
         dbops.CreateTable(ObjectTable()),
+        dbops.CreateTable(TypeAncestryTable()),
+        dbops.CreateTable(SchemaVersionTable()),
+        dbops.Query('''
+            INSERT INTO edgedb.schema_version (version)
+                VALUES (edgedb.uuid_generate_v1mc())
+        '''),
     ])
 
     commands.add_commands(
@@ -684,16 +785,21 @@ ql = common.quote_literal
 
 
 def _get_link_view(mcls, schema_cls, field, ptr, refdict, schema):
+    """Return the view of the link *ptr* and the metaclasses it reads."""
     pn = ptr.shortname
 
     if refdict:
+        deps = {refdict.ref_cls}
+
         if (issubclass(mcls, s_inheriting.InheritingObject) or
                 mcls is s_named.NamedObject):
 
             if mcls is s_named.NamedObject:
                 schematab = 'edgedb.InheritingObject'
+                deps.add(s_inheriting.InheritingObject)
             else:
                 schematab = 'edgedb.{}'.format(mcls.__name__)
+                deps.add(mcls)
 
             link_query = '''
                 SELECT DISTINCT ON ((cls.id, r.bases[1]))
@@ -761,6 +867,7 @@ def _get_link_view(mcls, schema_cls, field, ptr, refdict, schema):
                 tgt=dbname(sn.Name('std::target')),
                 valprop=dbname(sn.Name('schema::value')),
             )
+            deps.add(s_attrs.AttributeValue)
 
             # In addition to custom attributes returned by the
             # generic refdict query above, collect and return
@@ -816,6 +923,7 @@ def _get_link_view(mcls, schema_cls, field, ptr, refdict, schema):
                     )
 
                     partitions.append(qry)
+                    deps.add(metaclass)
 
             if partitions:
                 union = ('\n' + (' ' * 16) + 'UNION \n').join(partitions)
@@ -841,8 +949,10 @@ def _get_link_view(mcls, schema_cls, field, ptr, refdict, schema):
                     '\n' + (' ' * 16) + 'UNION ALL (\n' + stdattrs +
                     '\n' + (' ' * 16) + ')'
                 )
+                deps.add(s_attrs.Attribute)
 
     else:
+        deps = {mcls}
         link_query = None
         if field is not None:
             ftype = field.type[0]
@@ -953,7 +1063,8 @@ def _get_link_view(mcls, schema_cls, field, ptr, refdict, schema):
                 tgt=dbname(sn.Name('std::target')),
             )
 
-    return dbops.View(name=tabname(ptr), query=link_query)
+    view = dbops.View(name=tabname(ptr), query=link_query, materialized=True)
+    return view, deps
 
 
 def _generate_param_view(schema):
@@ -1016,7 +1127,9 @@ def _generate_param_view(schema):
             ) AS q
     '''
 
-    return dbops.View(name=tabname(FuncParam), query=view_query)
+    view = dbops.View(
+        name=tabname(FuncParam), query=view_query, materialized=True)
+    return view, {s_funcs.Function, s_constraints.Constraint}
 
 
 def _lookup_type(qual):
@@ -1056,13 +1169,13 @@ def _generate_type_element_view(schema, type_fields):
         (SELECT
             t.*
         FROM
-            {table},
-            LATERAL UNNEST (({table}.{q(field)}).types)
+            edgedb.{mcls.__name__},
+            LATERAL UNNEST ((edgedb.{mcls.__name__}.{q(field)}).types)
                 WITH ORDINALITY AS t(
                     id, maintype, name, collection, subtypes,
                     dimensions, is_root, num
                 ))
-    ''' for table, field in type_fields)
+    ''' for mcls, field in type_fields)
 
     view_query = f'''
         WITH
@@ -1082,7 +1195,9 @@ def _generate_type_element_view(schema, type_fields):
             q.name IS NOT NULL
     '''
 
-    return dbops.View(name=tabname(TypeElement), query=view_query)
+    view = dbops.View(
+        name=tabname(TypeElement), query=view_query, materialized=True)
+    return view, {mcls for mcls, _ in type_fields}
 
 
 def _generate_types_views(schema, type_fields):
@@ -1095,13 +1210,13 @@ def _generate_types_views(schema, type_fields):
         (SELECT
             t.*
         FROM
-            {table},
-            LATERAL UNNEST (({table}.{q(field)}).types)
+            edgedb.{mcls.__name__},
+            LATERAL UNNEST ((edgedb.{mcls.__name__}.{q(field)}).types)
                 AS t(
                     id, maintype, name, collection, subtypes,
                     dimensions, is_root
                 ))
-    ''' for table, field in type_fields)
+    ''' for mcls, field in type_fields)
 
     view_query = f'''
         WITH
@@ -1122,7 +1237,8 @@ def _generate_types_views(schema, type_fields):
             q.collection = 'array'
     '''
 
-    views.append(dbops.View(name=tabname(Array), query=view_query))
+    views.append(dbops.View(
+        name=tabname(Array), query=view_query, materialized=True))
 
     view_query = f'''
         WITH
@@ -1143,9 +1259,22 @@ def _generate_types_views(schema, type_fields):
             q.collection = 'tuple'
     '''
 
-    views.append(dbops.View(name=tabname(Tuple), query=view_query))
+    views.append(dbops.View(
+        name=tabname(Tuple), query=view_query, materialized=True))
+
+    return views, {mcls for mcls, _ in type_fields}
 
-    return views
+
+def _get_view_deps(metaclasses):
+    """Return the names of the tables of *metaclasses* and their children.
+
+    A query of a parent table also reads the rows of the tables
+    inheriting from it, so these are dependencies of the view too.
+    """
+    return {
+        table.name[1] for m, table in metaclass_tables.items()
+        if issubclass(m, tuple(metaclasses))
+    }
 
 
 async def generate_views(conn, schema):
@@ -1153,7 +1282,9 @@ async def generate_views(conn, schema):
 
     The introspection views emulate regular type and link tables
     for the classes in the "schema" module by querying the actual
-    metadata tables.
+    metadata tables.  The views are materialized and indexed like
+    the regular tables, and are refreshed by refresh_views() after
+    the schema changes.
     """
     commands = dbops.CommandGroup()
 
@@ -1162,6 +1293,12 @@ async def generate_views(conn, schema):
 
     metaclasses = get_interesting_metaclasses()
     views = collections.OrderedDict()
+    # The metaclasses whose tables are read by the views.  The ids
+    # of the introspection types are looked up by name in
+    # edgedb.NamedObject, such lookups are not dependencies of the
+    # views, as the introspection types only change at bootstrap.
+    view_deps = {}
+    link_views = set()
     type_fields = []
 
     for mcls in metaclasses:
@@ -1230,9 +1367,7 @@ async def generate_views(conn, schema):
                 if (issubclass(ft, (s_obj.Object, s_obj.ObjectCollection)) and
                         not issubclass(ft, (s_obj.ObjectSet,
                                             s_obj.ObjectList))):
-                    type_fields.append(
-                        (f'edgedb.{mcls.__name__}', pn.name)
-                    )
+                    type_fields.append((mcls, pn.name))
 
             ptrstor = types.get_pointer_storage_info(ptr, schema=schema)
 
@@ -1246,10 +1381,12 @@ async def generate_views(conn, schema):
 
                 cols.append((col_expr, dbname(ptr.shortname)))
             else:
-                view = _get_link_view(mcls, schema_cls, field, ptr, refdict,
-                                      schema)
+                view, deps = _get_link_view(mcls, schema_cls, field, ptr,
+                                            refdict, schema)
                 if view.name not in views:
                     views[view.name] = view
+                    view_deps[view.name] = deps
+                    link_views.add(view.name)
 
         coltext = textwrap.indent(
             ',\n'.join(('{} AS {}'.format(*c) for c in cols)), ' ' * 16)
@@ -1268,19 +1405,23 @@ async def generate_views(conn, schema):
                     ON (no.name = cmt.description)
         '''
 
-        view = dbops.View(name=tabname(schema_cls), query=view_query)
+        view = dbops.View(
+            name=tabname(schema_cls), query=view_query, materialized=True)
 
         views[view.name] = view
+        view_deps[view.name] = {mcls}
 
-    type_views = _generate_types_views(schema, type_fields)
+    type_views, type_deps = _generate_types_views(schema, type_fields)
     views.update({v.name: v for v in type_views})
     for v in type_views:
         views.move_to_end(v.name, last=False)
+        view_deps[v.name] = type_deps
 
-    te_view = _generate_type_element_view(schema, type_fields)
+    te_view, view_deps[te_view.name] = _generate_type_element_view(
+        schema, type_fields)
     views[te_view.name] = te_view
 
-    fp_view = _generate_param_view(schema)
+    fp_view, view_deps[fp_view.name] = _generate_param_view(schema)
     views[fp_view.name] = fp_view
 
     types_view = views[tabname(schema.get('schema::Type'))]
@@ -1295,8 +1436,60 @@ async def generate_views(conn, schema):
                 {common.qname(*view.name)}
         )
     ''' for view in type_views)
+    view_deps[types_view.name] = view_deps[types_view.name] | type_deps
+
+    deps = {}
 
     for view in views.values():
+        deps[view.name] = _get_view_deps(view_deps[view.name])
+
+        # REFRESH MATERIALIZED VIEW CONCURRENTLY requires a unique
+        # index on the view, which the rows of the views do not
+        # otherwise have, so every row is numbered.
+        view.query = f'''
+            SELECT
+                q.*,
+                row_number() OVER ()  AS {q(VIEW_ROW_KEY)}
+            FROM
+                ({view.query}
+                ) AS q
+        '''
         commands.add_command(dbops.CreateView(view))
 
+        index_name = common.edgedb_name_to_pg_name(
+            f'{view.name[1]}_{VIEW_ROW_KEY}_idx')
+        index = dbops.Index(
+            index_name, view.name, unique=True, columns=[VIEW_ROW_KEY])
+        commands.add_command(dbops.CreateIndex(index))
+
+        if view.name in link_views:
+            index_col = 'std::source'
+        else:
+            index_col = 'std::id'
+
+        index_name = common.edgedb_name_to_pg_name(
+            f'{view.name[1]}_{index_col}_idx')
+        index = dbops.Index(
+            index_name, view.name, unique=False, columns=[index_col])
+        commands.add_command(dbops.CreateIndex(index))
+
+    commands.add_command(
+        dbops.CreateFunction(RefreshViewsFunction(views.values(), deps)))
+
     await commands.execute(Context(conn))
+
+
+async def bump_schema_version(conn):
+    """Assign a new version to the schema."""
+    await conn.execute('''
+        UPDATE edgedb.schema_version SET version = edgedb.uuid_generate_v1mc()
+    ''')
+
+
+async def refresh_views(conn):
+    """Refresh the introspection views affected by the transaction."""
+    exists = await dbops.FunctionExists(
+        ('edgedb', '_refresh_views'), args=[]).execute(Context(conn))
+
+    if exists:
+        await conn.execute('SELECT edgedb._refresh_views()')
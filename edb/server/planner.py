@@ -41,8 +41,25 @@ class TransactionStatement:
         return '<{} {!r} at 0x{:x}>'.format(self.__name__, self.op, id(self))
 
 
-def plan_statement(stmt, backend, flags={}, *, timer):
+class ExplainStatement:
+    def __init__(self, query, *, analyze):
+        self.query = query
+        self.analyze = analyze
+
+
+def is_query(stmt):
+    """Return True if *stmt* is a query, i.e. not DDL or a session command."""
+    return not isinstance(stmt, (qlast.Database, qlast.Delta, qlast.DDL,
+                                 qlast.Transaction, qlast.SessionStateDecl,
+                                 qlast.ExplainStmt))
+
+
+def plan_statement(stmt, backend, flags={}, *, timer, arg_types=None):
     schema = backend.schema
+    if flags and 'batch_shapes' in flags:
+        batch_shapes = True
+    else:
+        batch_shapes = None
     modaliases = backend.modaliases
 
     if isinstance(stmt, qlast.Database):
@@ -61,6 +78,13 @@ def plan_statement(stmt, backend, flags={}, *, timer):
         # BEGIN/COMMIT
         return TransactionStatement(stmt)
 
+    elif isinstance(stmt, qlast.ExplainStmt):
+        # EXPLAIN [ANALYZE]
+        query = _compile_query(
+            stmt.query, backend, timer=timer, arg_types=arg_types,
+            batch_shapes=batch_shapes, explain=True)
+        return ExplainStatement(query, analyze=stmt.analyze)
+
     elif isinstance(stmt, qlast.SessionStateDecl):
         # SET ...
         with timer.timeit('compile_eql_to_ir'):
@@ -71,10 +95,20 @@ def plan_statement(stmt, backend, flags={}, *, timer):
 
     else:
         # Queries
-        with timer.timeit('compile_eql_to_ir'):
-            ir = ql_compiler.compile_ast_to_ir(
-                stmt, schema=schema, modaliases=modaliases,
-                implicit_id_in_shapes=False)
+        return _compile_query(
+            stmt, backend, timer=timer, arg_types=arg_types,
+            batch_shapes=batch_shapes)
+
+
+def _compile_query(stmt, backend, *, timer, arg_types, batch_shapes=None,
+                   explain=False):
+    with timer.timeit('compile_eql_to_ir'):
+        ir = ql_compiler.compile_ast_to_ir(
+            stmt, schema=backend.schema, modaliases=backend.modaliases,
+            arg_types=arg_types, implicit_id_in_shapes=False)
+
+    timer.count('ir_sets', ir.set_count)
 
-        return backend.compile(ir, output_format=compiler.OutputFormat.JSON,
-                               timer=timer)
+    return backend.compile(ir, output_format=compiler.OutputFormat.JSON,
+                           explain=explain, batch_shapes=batch_shapes,
+                           timer=timer)
@@ -30,7 +30,9 @@ from edb.lang import graphql as graphql_compiler
 
 from edb.server import pgsql as backend
 from edb.server import executor
+from edb.server import persistedqueries
 from edb.server import planner
+from edb.server import querystats
 
 from edb.lang.schema import database as s_db
 from edb.lang.schema import delta as s_delta
@@ -44,14 +46,30 @@ from edb.lang.common import parsing
 
 msg_header = struct.Struct('!L')
 
+message_types = frozenset({
+    'init', 'query', 'gql_query', 'script', 'gql_register', 'gql_persisted',
+    'list_dbs', 'get_pgcon', 'get_stats',
+})
+
 
 class Timer:
-    __slots__ = ('parse_eql', 'compile_eql_to_ir', 'compile_ir_to_sql',
-                 'graphql_translation', 'execution')
+    """Timings and object counts of statement processing stages.
+
+    A timer is kept for every statement of a script (its profile), as
+    well as for the script as a whole.
+    """
+
+    stages = ('graphql_translation', 'parse_eql', 'compile_eql_to_ir',
+              'compile_ir_to_sql', 'generate_sql', 'prepare', 'execution',
+              'decode_result')
+
+    __slots__ = stages + ('counts', 'statements')
 
     def __init__(self):
-        for attr in self.__slots__:
+        for attr in self.stages:
             setattr(self, attr, 0)
+        self.counts = {}
+        self.statements = []
 
     @contextlib.contextmanager
     def timeit(self, name):
@@ -63,8 +81,35 @@ class Timer:
             prev = getattr(self, name)
             setattr(self, name, prev + delta)
 
+    def count(self, name, value):
+        self.counts[name] = self.counts.get(name, 0) + value
+
     def as_dict(self):
-        return {k: getattr(self, k) for k in self.__slots__}
+        return {k: getattr(self, k) for k in self.stages}
+
+    def as_profile(self):
+        return {'timings': self.as_dict(), 'counts': dict(self.counts)}
+
+    def add_timings(self, timings):
+        for k, v in timings.items():
+            setattr(self, k, getattr(self, k) + v)
+
+    def add_profile(self, profile):
+        self.add_timings(profile['timings'])
+        for k, v in profile['counts'].items():
+            self.count(k, v)
+
+    def add_statement(self, timer):
+        """Account for a statement *timer* in the script total."""
+        profile = timer.as_profile()
+        self.add_profile(profile)
+        self.statements.append(profile)
+
+
+def _get_source(statement):
+    ctx = statement.context
+    if ctx is not None and ctx.start is not None and ctx.end is not None:
+        return ctx.buffer[ctx.start.pointer:ctx.end.pointer]
 
 
 class ConnectionState(enum.Enum):
@@ -84,10 +129,29 @@ def is_ddl(plan):
 
 
 class Protocol(asyncio.Protocol):
-    def __init__(self, pg_cluster, loop):
+    def __init__(self, pg_cluster, loop, *,
+                 compiler_pool=None, coordinator=None,
+                 persisted_queries=None, query_stats=None,
+                 slow_log=None, batch_shapes=False,
+                 extract_constants=True):
         self._pg_cluster = pg_cluster
         self._loop = loop
+        self._compiler_pool = compiler_pool
+        self._coordinator = coordinator
+        if persisted_queries is None:
+            persisted_queries = persistedqueries.PersistedQueries()
+        self._persisted_queries = persisted_queries
+        if query_stats is None:
+            query_stats = querystats.QueryStats()
+        self._query_stats = query_stats
+        self._slow_log = slow_log
+        self._batch_shapes = batch_shapes
+        self._extract_constants = extract_constants
+        self._schema_stale = False
+        self._schema_changed_in_transaction = False
         self.pgconn = None
+        self.database = None
+        self.user = None
         self.state = ConnectionState.NOT_CONNECTED
         self.transactions = []
         self.buffer = bytearray()
@@ -95,13 +159,21 @@ class Protocol(asyncio.Protocol):
     def connection_made(self, transport):
         self.transport = transport
         self.state = ConnectionState.NEW
+        self._query_stats.connections += 1
+        self._query_stats.connections_active += 1
+        if self._coordinator is not None:
+            self._coordinator.register(self)
 
     def connection_lost(self, exc):
+        self._query_stats.connections_active -= 1
+        if self._coordinator is not None:
+            self._coordinator.unregister(self)
         self.transport.close()
         if self.pgconn is not None:
             self.pgconn.terminate()
 
     def data_received(self, data):
+        self._query_stats.bytes_received += len(data)
         self.buffer.extend(data)
         buf_len = len(self.buffer)
         header_size = msg_header.size
@@ -114,6 +186,11 @@ class Protocol(asyncio.Protocol):
                 self._loop.call_soon(self.process_message, msg)
 
     def process_message(self, message):
+        msg_type = message['__type__']
+        if msg_type not in message_types:
+            msg_type = 'unknown'
+        self._query_stats.messages[msg_type] += 1
+
         if message['__type__'] == 'init':
             database = message.get('database')
             user = message.get('user')
@@ -121,6 +198,9 @@ class Protocol(asyncio.Protocol):
             if not database or not user:
                 raise ProtocolError('invalid startup packet')
 
+            self.database = database
+            self.user = user
+
             fut = self._loop.create_task(
                 self._pg_cluster.connect(
                     database=database, user=user, loop=self._loop))
@@ -157,9 +237,41 @@ class Protocol(asyncio.Protocol):
             if not script:
                 raise ProtocolError('invalid script message')
 
+            if message.get('__graphql__'):
+                fut = self._loop.create_task(
+                    self._run_graphql(
+                        script, variables=message.get('variables') or {},
+                        operation_name=message.get('operation_name')))
+            else:
+                fut = self._loop.create_task(
+                    self._run_script(script, flags=message.get('__flags__')))
+            fut.add_done_callback(self._on_script_done)
+
+        elif message['__type__'] == 'gql_register':
+            if self.state != ConnectionState.READY:
+                raise ProtocolError('unexpected message: gql_register')
+
+            query = message.get('query')
+            if not query:
+                raise ProtocolError('invalid graphql register message')
+
+            fut = self._loop.create_task(self._register_graphql(query))
+            fut.add_done_callback(self._on_script_done)
+
+        elif message['__type__'] == 'gql_persisted':
+            if self.state != ConnectionState.READY:
+                raise ProtocolError('unexpected message: gql_persisted')
+
+            query_hash = message.get('hash')
+            query = message.get('query')
+            if not query_hash and not query:
+                raise ProtocolError('invalid persisted graphql query message')
+
             fut = self._loop.create_task(
-                self._run_script(script, graphql=message.get('__graphql__'),
-                                 flags=message.get('__flags__')))
+                self._run_graphql(
+                    query, query_hash=query_hash,
+                    variables=message.get('variables') or {},
+                    operation_name=message.get('operation_name')))
             fut.add_done_callback(self._on_script_done)
 
         elif message['__type__'] == 'list_dbs':
@@ -170,8 +282,13 @@ class Protocol(asyncio.Protocol):
             fut = self._loop.create_task(self._get_pgcon())
             fut.add_done_callback(self._on_script_done)
 
+        elif message['__type__'] == 'get_stats':
+            fut = self._loop.create_task(self._get_stats())
+            fut.add_done_callback(self._on_script_done)
+
     def send_message(self, msg):
         msg = json.dumps(msg).encode('utf-8')
+        self._query_stats.bytes_sent += msg_header.size + len(msg)
         self.transport.write(msg_header.pack(len(msg)) + msg)
 
     def send_error(self, err):
@@ -214,7 +331,11 @@ class Protocol(asyncio.Protocol):
         with timer.timeit('execution'):
             result = self._pg_cluster.get_connection_spec()
 
-        return result, timer.as_dict()
+        return result, timer
+
+    async def _get_stats(self):
+        timer = Timer()
+        return self._query_stats.as_dict(), timer
 
     async def _list_dbs(self):
         timer = Timer()
@@ -230,47 +351,219 @@ class Protocol(asyncio.Protocol):
             ''')
 
         result = [r['datname'] for r in result]
-        return result, timer.as_dict()
-
-    async def _run_script(self, script, *, graphql=False, flags={}):
+        return result, timer
+
+    def invalidate_schema(self):
+        """Reload the schema before running the next script."""
+        self._schema_stale = True
+
+    async def _reload_schema_if_stale(self):
+        if (not self._schema_stale and self._coordinator is not None and
+                self._coordinator.check_schema_version):
+            # The notifications from other server workers may be lost,
+            # so the version of the schema is checked as well.
+            if await self.backend.is_schema_outdated():
+                self._coordinator.schema_outdated(self.database)
+
+        if self._schema_stale:
+            self._schema_stale = False
+            self._query_stats.schema_reloads += 1
+            await self.backend.invalidate_schema_cache()
+            await self.backend.getschema()
+
+    def _get_graphql_modules(self):
+        return {
+            m.name for m in self.backend.schema.get_modules()
+        } - {'schema', 'graphql'}
+
+    async def _register_graphql(self, query):
         timer = Timer()
+        query_hash = self._persisted_queries.register(query)
+        return query_hash, timer
+
+    async def _run_graphql(self, query, *, query_hash=None, variables,
+                           operation_name=None):
+        """Run a GraphQL query.
+
+        The query is either given by its text, in which case it is
+        registered as a persisted query, or by its hash.  Compiled plans
+        of persisted queries are reused for all values of non-critical
+        variables, which are passed to Postgres as query arguments.
+        """
+        timer = Timer()
+
+        await self._reload_schema_if_stale()
+
+        persisted = self._persisted_queries
+
+        if query is not None:
+            query_hash = persisted.register(query, query_hash=query_hash)
+        else:
+            query = persisted.get_document(query_hash)
+
+        gql_variables = {'$' + k: v for k, v in variables.items()}
+
+        plans = None
+        if not self.transactions:
+            # Plans compiled in a transaction may depend on
+            # uncommitted DDL, so they are never shared.
+            plans = persisted.get_plans(
+                self.database, query_hash, operation_name, gql_variables)
+
+        if plans is not None:
+            self._query_stats.persisted_plan_hits += 1
+            stmt_timers = [Timer() for _ in plans]
+
+        else:
+            self._query_stats.persisted_plan_misses += 1
 
-        if graphql:
             with timer.timeit('graphql_translation'):
-                modules = {
-                    m.name for m in
-                    self.backend.schema.get_modules()
-                } - {'schema', 'graphql'}
-                script = graphql_compiler.translate(
-                    self.backend.schema, script,
-                    variables={},
-                    modules=modules) + ';'
-
-        with timer.timeit('parse_eql'):
-            statements = edgeql.parse_block(script)
+                translated = graphql_compiler.translate_ast(
+                    self.backend.schema, query,
+                    variables=gql_variables,
+                    operation_name=operation_name,
+                    modules=self._get_graphql_modules(),
+                    schema_version=self.backend.schema_version)
+
+            # GraphQL queries are always compiled in-process, as the
+            # compiler workers only accept EdgeQL source, which cannot
+            # carry the types of query parameters.
+            stmt_timers = [Timer() for _ in translated]
+            plans = [
+                (planner.plan_statement(
+                    op.stmt, self.backend, timer=stmt_timer,
+                    arg_types=op.argtypes), op.argdefaults)
+                for op, stmt_timer in zip(translated, stmt_timers)
+            ]
+
+            if not self.transactions:
+                critvars = {
+                    vname for op in translated for vname, _ in op.critvars
+                }
+                persisted.add_plans(
+                    self.database, query_hash, operation_name,
+                    gql_variables, critvars, plans)
 
         results = []
 
-        for statement in statements:
-            plan = planner.plan_statement(
-                statement, self.backend, flags, timer=timer)
+        for (plan, argdefaults), stmt_timer in zip(plans, stmt_timers):
+            result = await executor.execute_plan(
+                plan, self, variables={**argdefaults, **variables},
+                timer=stmt_timer)
+            results.append(self._load_result(result, timer=stmt_timer))
+            self._add_statement(timer, stmt_timer, plan=plan, source=query)
+
+        return results, timer
+
+    async def _run_script(self, script, *, flags={}):
+        timer = Timer()
+
+        await self._reload_schema_if_stale()
+
+        plans = None
+
+        if self._compiler_pool is not None and not self.transactions:
+            # Uncommitted DDL is not visible to the compiler workers,
+            # so scripts in a transaction are always compiled here.
+            queries, timings, profiles = \
+                await self._compiler_pool.compile_script(
+                    script, database=self.database, user=self.user,
+                    schema=self.backend.schema,
+                    modaliases=self.backend.modaliases, flags=flags)
 
-            with timer.timeit('execution'):
-                result = await executor.execute_plan(plan, self)
+            if queries is not None:
+                self._query_stats.pool_compilations += 1
+                timer.add_timings(timings)
+                # The text of individual statements is not known
+                # here, so the whole script is their source.
+                plans = []
+                for query, profile in zip(queries, profiles):
+                    stmt_timer = Timer()
+                    stmt_timer.add_profile(profile)
+                    plans.append((query, stmt_timer, script))
 
-            if result is not None and isinstance(result, list):
-                loaded = []
+        if plans is None:
+            self._query_stats.local_compilations += 1
+
+            with timer.timeit('parse_eql'):
+                statements = edgeql.parse_block(script)
+
+            plans = self._plan_statements(statements, flags)
+
+        results = []
+
+        for plan, stmt_timer, source in plans:
+            result = await executor.execute_plan(
+                plan, self, timer=stmt_timer)
+
+            if isinstance(plan, s_delta.Command):
+                if self.transactions:
+                    self._schema_changed_in_transaction = True
+                else:
+                    self._schema_changed()
+
+            elif (isinstance(plan, planner.TransactionStatement) and
+                    not self.transactions and
+                    self._schema_changed_in_transaction):
+                self._schema_changed_in_transaction = False
+                self._schema_changed()
+
+            results.append(self._load_result(result, timer=stmt_timer))
+            self._add_statement(timer, stmt_timer, plan=plan, source=source)
+
+        return results, timer
+
+    def _load_result(self, result, *, timer):
+        if result is not None and isinstance(result, list):
+            size = 0
+            loaded = []
+            with timer.timeit('decode_result'):
                 for row in result:
                     if isinstance(row, str):
                         # JSON result
+                        size += len(row)
                         row = json.loads(row)
                         loaded.extend(row)
                     else:
                         loaded.append(row)
-                result = loaded
-            results.append(result)
-
-        return results, timer.as_dict()
+            timer.count('result_size', size)
+            timer.count('result_rows', len(loaded))
+            result = loaded
+
+        return result
+
+    def _add_statement(self, timer, stmt_timer, *, plan, source):
+        timer.add_statement(stmt_timer)
+        self._query_stats.add_statement(stmt_timer)
+
+        if isinstance(plan, s_delta.Command):
+            self._query_stats.ddl.add(stmt_timer.execution)
+
+        if self._slow_log is not None:
+            self._slow_log.record(
+                database=self.database, source=source, plan=plan,
+                timer=stmt_timer)
+
+    def _schema_changed(self):
+        if self._coordinator is not None:
+            self._coordinator.schema_changed(self.database, origin=self)
+        else:
+            if self._compiler_pool is not None:
+                self._compiler_pool.invalidate_schema(self.database)
+            self._persisted_queries.invalidate_schema(self.database)
+
+    def _plan_statements(self, statements, flags):
+        # Statements are planned lazily, as the schema may be
+        # changed by the execution of the preceding statements.
+        for statement in statements:
+            stmt_timer = Timer()
+            plan = planner.plan_statement(
+                statement, self.backend, flags, timer=stmt_timer)
+            if self._slow_log is not None:
+                source = _get_source(statement)
+            else:
+                source = None
+            yield plan, stmt_timer, source
 
     def _on_pg_connect(self, fut):
         try:
@@ -281,7 +574,10 @@ class Protocol(asyncio.Protocol):
             self.send_error(e)
             return
 
-        fut = self._loop.create_task(backend.open_database(self.pgconn))
+        fut = self._loop.create_task(
+            backend.open_database(
+                self.pgconn, batch_shapes=self._batch_shapes,
+                extract_constants=self._extract_constants))
 
         fut.add_done_callback(self._on_edge_connect)
 
@@ -300,14 +596,22 @@ class Protocol(asyncio.Protocol):
 
     def _on_script_done(self, fut):
         try:
-            result, timings = fut.result()
+            result, timer = fut.result()
         except asyncio.CancelledError:
             return
         except Exception as e:
+            self._query_stats.add_error()
             self.send_error(e)
             return
 
         self.state = ConnectionState.READY
 
+        self._query_stats.add_script(timer)
+
+        start = time.monotonic()
         self.send_message({'__type__': 'result', 'result': result,
-                           'timings': timings})
+                           'timings': timer.as_dict(),
+                           'profile': timer.statements})
+        if timer.statements:
+            self._query_stats.add_timing(
+                'encode_result', time.monotonic() - start)
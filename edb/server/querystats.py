@@ -0,0 +1,159 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Server-wide query statistics.
+
+The profiles of all statements executed by a server process are
+aggregated into histograms: one for the time spent in every stage
+of statement processing and one for every object count (IR sets,
+SQL CTEs, size of the result etc).  Every server worker process
+keeps its own statistics.
+"""
+
+
+import bisect
+import collections
+import os
+import time
+
+
+# Histogram bucket upper bounds for durations (in seconds).
+DURATION_BOUNDS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Histogram bucket upper bounds for object counts.
+COUNT_BOUNDS = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 10000, 100000, 1000000,
+)
+
+
+class Histogram:
+
+    __slots__ = ('bounds', 'buckets', 'count', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def add(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        """Return the histogram with cumulative bucket counts.
+
+        Buckets are (upper bound, count) pairs, the last bucket has
+        the bound of '+Inf'.
+        """
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.buckets):
+            total += count
+            buckets.append((bound, total))
+
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class QueryStats:
+    """Statistics of a server process.
+
+    Besides the statement profile histograms, the stats object keeps
+    plain counters that are updated by the server protocol directly.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.started_at = time.time()
+
+        self.connections = 0
+        self.connections_active = 0
+        self.messages = collections.Counter()
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.errors = 0
+        self.schema_reloads = 0
+        self.persisted_plan_hits = 0
+        self.persisted_plan_misses = 0
+        self.pool_compilations = 0
+        self.local_compilations = 0
+
+        self.statements = 0
+        self.stages = {}
+        self.counts = {}
+        self.ddl = Histogram(DURATION_BOUNDS)
+
+    def add_statement(self, timer):
+        """Record the profile of an executed statement."""
+        self.statements += 1
+
+        total = 0
+        for stage in timer.stages:
+            duration = getattr(timer, stage)
+            if duration:
+                self.add_timing(stage, duration)
+                total += duration
+        self.add_timing('total', total)
+
+        for name, count in timer.counts.items():
+            hist = self.counts.get(name)
+            if hist is None:
+                hist = self.counts[name] = Histogram(COUNT_BOUNDS)
+            hist.add(count)
+
+    def add_script(self, timer):
+        """Record the stages that apply to a script as a whole."""
+        for stage in ('graphql_translation', 'parse_eql'):
+            duration = getattr(timer, stage)
+            if duration:
+                self.add_timing(stage, duration)
+
+    def add_timing(self, stage, duration):
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = Histogram(DURATION_BOUNDS)
+        hist.add(duration)
+
+    def add_error(self):
+        self.errors += 1
+
+    def as_dict(self):
+        return {
+            'pid': self.pid,
+            'started_at': self.started_at,
+            'connections': self.connections,
+            'connections_active': self.connections_active,
+            'messages': dict(self.messages),
+            'bytes_received': self.bytes_received,
+            'bytes_sent': self.bytes_sent,
+            'errors': self.errors,
+            'schema_reloads': self.schema_reloads,
+            'persisted_plan_hits': self.persisted_plan_hits,
+            'persisted_plan_misses': self.persisted_plan_misses,
+            'pool_compilations': self.pool_compilations,
+            'local_compilations': self.local_compilations,
+            'statements': self.statements,
+            'stages': {k: v.as_dict() for k, v in self.stages.items()},
+            'counts': {k: v.as_dict() for k, v in self.counts.items()},
+            'ddl': self.ddl.as_dict(),
+        }
@@ -0,0 +1,100 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Slow query log.
+
+Statements that take longer than the configured threshold to compile
+and execute are logged to the "edb.server.slowlog" logger along with
+their source, the generated SQL and the statement profile.  Only a
+fraction of slow statements can be logged (sampling), and the number
+of entries logged per minute can be limited, in which case the number
+of suppressed entries is reported with the next logged entry.
+"""
+
+
+import logging
+import random
+import time
+
+
+logger = logging.getLogger('edb.server.slowlog')
+
+
+COMPILE_STAGES = ('compile_eql_to_ir', 'compile_ir_to_sql', 'generate_sql')
+EXECUTE_STAGES = ('prepare', 'execution', 'decode_result')
+
+
+class SlowQueryLog:
+
+    def __init__(self, *, threshold, sample_rate=1.0, rate_limit=None):
+        """Create a slow query log.
+
+        *threshold* is the statement duration in seconds, *rate_limit*
+        is the maximum number of entries logged per minute.
+        """
+        self._threshold = threshold
+        self._sample_rate = sample_rate
+        self._rate_limit = rate_limit
+        self._period_start = time.monotonic()
+        self._logged = 0
+        self._suppressed = 0
+
+    def record(self, *, database, source, plan, timer):
+        timings = timer.as_dict()
+        duration = sum(timings.values())
+        if duration < self._threshold:
+            return
+
+        if self._sample_rate < 1 and random.random() >= self._sample_rate:
+            return
+
+        if self._rate_limit is not None:
+            now = time.monotonic()
+            if now - self._period_start >= 60:
+                self._period_start = now
+                self._logged = 0
+
+            if self._logged >= self._rate_limit:
+                self._suppressed += 1
+                return
+
+            self._logged += 1
+
+        suppressed, self._suppressed = self._suppressed, 0
+
+        compile_time = sum(timings[stage] for stage in COMPILE_STAGES)
+        execute_time = sum(timings[stage] for stage in EXECUTE_STAGES)
+
+        stages = ', '.join(
+            f'{stage}={value * 1000:.3f}ms'
+            for stage, value in timings.items() if value)
+        counts = ', '.join(
+            f'{name}={value}' for name, value in timer.counts.items())
+
+        logger.warning(
+            'slow query in %r: %.3fms (compile %.3fms, execute %.3fms)%s\n'
+            '  stages: %s\n'
+            '  counts: %s\n'
+            '  query: %s\n'
+            '  sql: %s',
+            database, duration * 1000, compile_time * 1000,
+            execute_time * 1000,
+            f' ({suppressed} entries suppressed)' if suppressed else '',
+            stages, counts or 'n/a', source or 'n/a',
+            getattr(plan, 'text', None) or 'n/a')
@@ -0,0 +1,256 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Multi-process server support.
+
+The server can run as a number of forked worker processes sharing the
+listening port (via SO_REUSEPORT).  The parent process supervises the
+workers, replaces the ones that crash, and relays schema change
+notifications between them: each worker is connected to the parent by
+a datagram socket pair, and a datagram containing a database name
+means that the schema of that database has been changed by DDL
+executed in the sending worker.
+
+The notifications are only a hint, as they can be lost (e.g. when a
+worker is being replaced), so the workers also check the version of
+the schema before running every request.
+"""
+
+
+import errno
+import logging
+import os
+import selectors
+import signal
+import socket
+import time
+import weakref
+
+
+logger = logging.getLogger('edb.server')
+
+
+MAX_MESSAGE_SIZE = 1024
+
+# Workers that fail sooner than this many seconds after they are
+# started are not replaced.
+MIN_WORKER_UPTIME = 5
+
+
+class Coordinator:
+    """Propagate schema changes to connections and other server workers.
+
+    There is one coordinator per server process.
+    """
+
+    def __init__(self, *, loop, channel=None, compiler_pool=None,
+                 persisted_queries=None):
+        self._loop = loop
+        self._channel = channel
+        self._compiler_pool = compiler_pool
+        self._persisted_queries = persisted_queries
+        self._protocols = weakref.WeakSet()
+
+        if channel is not None:
+            channel.setblocking(False)
+            loop.add_reader(channel.fileno(), self._on_channel_readable)
+
+    @property
+    def check_schema_version(self):
+        """Whether the schema can be changed by other server workers."""
+        return self._channel is not None
+
+    def register(self, protocol):
+        self._protocols.add(protocol)
+
+    def unregister(self, protocol):
+        self._protocols.discard(protocol)
+
+    def schema_changed(self, database, *, origin=None):
+        """Signal that the schema of *database* has been modified.
+
+        *origin* is the protocol that executed the DDL, its schema
+        is already up to date.
+        """
+        self._invalidate(database, origin=origin)
+
+        if self._channel is not None:
+            try:
+                self._channel.send(database.encode('utf-8'))
+            except OSError as e:
+                logger.warning(
+                    'could not notify server workers about schema '
+                    'changes in %r: %s', database, e)
+
+    def schema_outdated(self, database):
+        """Signal that the schema of *database* was changed elsewhere."""
+        self._invalidate(database)
+
+    def close(self):
+        if self._channel is not None:
+            self._loop.remove_reader(self._channel.fileno())
+            self._channel.close()
+            self._channel = None
+
+    def _invalidate(self, database, *, origin=None):
+        if self._compiler_pool is not None:
+            self._compiler_pool.invalidate_schema(database)
+
+        if self._persisted_queries is not None:
+            self._persisted_queries.invalidate_schema(database)
+
+        for protocol in self._protocols:
+            if protocol is not origin and protocol.database == database:
+                protocol.invalidate_schema()
+
+    def _on_channel_readable(self):
+        while True:
+            try:
+                data = self._channel.recv(MAX_MESSAGE_SIZE)
+            except (BlockingIOError, InterruptedError):
+                break
+
+            self._invalidate(data.decode('utf-8'))
+
+
+def run_workers(num_workers, serve):
+    """Fork *num_workers* server processes and supervise them.
+
+    *serve* is called in every worker process with the worker's end of
+    the coordination channel and the worker number (from 0 to
+    *num_workers* - 1), and must block until the worker is shut down.
+    Workers that exit with an error or are killed by a signal are
+    replaced by new processes with the same worker number.  Returns
+    when all workers have exited.
+    """
+    # Maps the pids of the workers to (worker_id, channel, start time).
+    workers = {}
+    sel = selectors.DefaultSelector()
+    shutting_down = False
+
+    def _spawn(worker_id):
+        parent_sock, worker_sock = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_DGRAM)
+
+        pid = os.fork()
+
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            sel.close()
+            parent_sock.close()
+            for _, sock, _ in workers.values():
+                sock.close()
+
+            status = 0
+            try:
+                serve(channel=worker_sock, worker_id=worker_id)
+            except BaseException:
+                logger.exception('server worker %d failed', os.getpid())
+                status = 1
+            finally:
+                # Do not run any of the parent's cleanup code
+                # (atexit handlers, pidfile removal, etc).
+                os._exit(status)
+
+        worker_sock.close()
+        workers[pid] = (worker_id, parent_sock, time.monotonic())
+        sel.register(parent_sock, selectors.EVENT_READ, pid)
+        return pid
+
+    for worker_id in range(num_workers):
+        _spawn(worker_id)
+
+    logger.info('Started %d server workers.', num_workers)
+
+    def _terminate_workers(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _terminate_workers)
+
+    try:
+        while workers:
+            try:
+                events = sel.select(timeout=1)
+            except KeyboardInterrupt:
+                # SIGINT is delivered to the whole process group,
+                # so just wait for the workers to exit.
+                shutting_down = True
+                events = []
+
+            for key, _ in events:
+                try:
+                    data = key.fileobj.recv(MAX_MESSAGE_SIZE)
+                except OSError:
+                    continue
+
+                for pid, (_, sock, _) in workers.items():
+                    if pid != key.data:
+                        _send(sock, data)
+
+            while workers:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    workers.clear()
+                    break
+
+                if pid == 0:
+                    break
+
+                worker = workers.pop(pid, None)
+                if worker is None:
+                    continue
+
+                worker_id, sock, started_at = worker
+                sel.unregister(sock)
+                sock.close()
+
+                failed = not (os.WIFEXITED(status) and
+                              os.WEXITSTATUS(status) == 0)
+
+                if not failed or shutting_down:
+                    logger.info('Server worker %d exited.', pid)
+                elif time.monotonic() - started_at < MIN_WORKER_UPTIME:
+                    # Do not restart workers that fail on startup
+                    # (e.g. when the port is in use) over and over.
+                    logger.error(
+                        'Server worker %d failed on startup (status %d).',
+                        pid, status)
+                else:
+                    new_pid = _spawn(worker_id)
+                    logger.warning(
+                        'Server worker %d exited unexpectedly (status %d), '
+                        'replaced by worker %d.', pid, status, new_pid)
+    finally:
+        sel.close()
+
+
+def _send(sock, data):
+    try:
+        sock.send(data)
+    except OSError as e:
+        if e.errno not in (errno.EPIPE, errno.ECONNREFUSED):
+            logger.warning('could not relay a schema change '
+                           'notification: %s', e)
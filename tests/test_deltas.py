@@ -147,6 +147,194 @@ class TestDeltas(tb.DDLTestCase):
             []
         ])
 
+    async def test_delta_introspection_01(self):
+        # Check that the introspection views are refreshed
+        # after the types are created, altered and dropped.
+        result = await self.con.execute("""
+            CREATE TYPE test::Intro01 {
+                SET description := 'created';
+            };
+
+            WITH MODULE schema
+            SELECT ObjectType {name, description}
+            FILTER ObjectType.name = 'test::Intro01';
+
+            ALTER TYPE test::Intro01 {
+                SET description := 'altered';
+            };
+
+            WITH MODULE schema
+            SELECT ObjectType {name, description}
+            FILTER ObjectType.name = 'test::Intro01';
+
+            DROP TYPE test::Intro01;
+
+            WITH MODULE schema
+            SELECT ObjectType {name, description}
+            FILTER ObjectType.name = 'test::Intro01';
+        """)
+
+        self.assert_data_shape(result, [
+            None,
+
+            [{
+                'name': 'test::Intro01',
+                'description': 'created',
+            }],
+
+            None,
+
+            [{
+                'name': 'test::Intro01',
+                'description': 'altered',
+            }],
+
+            None,
+
+            []
+        ])
+
+    async def test_delta_introspection_02(self):
+        query = """
+            WITH MODULE schema
+            SELECT ObjectType {
+                links: {
+                    name,
+                    description,
+                    target: {name}
+                } FILTER .name = 'test::intro_link'
+            }
+            FILTER ObjectType.name = 'test::Intro02';
+        """
+
+        result = await self.con.execute(f"""
+            CREATE TYPE test::Intro02Target;
+            CREATE TYPE test::Intro02;
+
+            ALTER TYPE test::Intro02 {{
+                CREATE LINK test::intro_link -> test::Intro02Target {{
+                    SET description := 'created';
+                }};
+            }};
+
+            {query}
+
+            ALTER TYPE test::Intro02 {{
+                ALTER LINK test::intro_link {{
+                    SET description := 'altered';
+                }};
+            }};
+
+            {query}
+
+            ALTER TYPE test::Intro02 {{
+                DROP LINK test::intro_link;
+            }};
+
+            {query}
+        """)
+
+        self.assert_data_shape(result, [
+            None,
+
+            None,
+
+            None,
+
+            [{
+                'links': [{
+                    'name': 'test::intro_link',
+                    'description': 'created',
+                    'target': {'name': 'test::Intro02Target'},
+                }],
+            }],
+
+            None,
+
+            [{
+                'links': [{
+                    'name': 'test::intro_link',
+                    'description': 'altered',
+                    'target': {'name': 'test::Intro02Target'},
+                }],
+            }],
+
+            None,
+
+            [{
+                'links': [],
+            }]
+        ])
+
+    async def test_delta_introspection_03(self):
+        query = """
+            WITH MODULE schema
+            SELECT ObjectType {
+                properties: {
+                    name,
+                    description,
+                    target: {name}
+                } FILTER .name = 'test::intro_prop'
+            }
+            FILTER ObjectType.name = 'test::Intro03';
+        """
+
+        result = await self.con.execute(f"""
+            CREATE TYPE test::Intro03;
+
+            ALTER TYPE test::Intro03 {{
+                CREATE PROPERTY test::intro_prop -> std::str {{
+                    SET description := 'created';
+                }};
+            }};
+
+            {query}
+
+            ALTER TYPE test::Intro03 {{
+                ALTER PROPERTY test::intro_prop {{
+                    SET description := 'altered';
+                }};
+            }};
+
+            {query}
+
+            ALTER TYPE test::Intro03 {{
+                DROP PROPERTY test::intro_prop;
+            }};
+
+            {query}
+        """)
+
+        self.assert_data_shape(result, [
+            None,
+
+            None,
+
+            [{
+                'properties': [{
+                    'name': 'test::intro_prop',
+                    'description': 'created',
+                    'target': {'name': 'std::str'},
+                }],
+            }],
+
+            None,
+
+            [{
+                'properties': [{
+                    'name': 'test::intro_prop',
+                    'description': 'altered',
+                    'target': {'name': 'std::str'},
+                }],
+            }],
+
+            None,
+
+            [{
+                'properties': [],
+            }]
+        ])
+
     async def test_delta_unicode_01(self):
         result = await self.con.execute(r"""
             # setup delta
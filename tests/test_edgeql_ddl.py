@@ -520,3 +520,103 @@ class TestEdgeQLDDL(tb.DDLTestCase):
                 }
             ]
         ])
+
+    async def test_edgeql_ddl_type_ancestry_01(self):
+        # Checks against several types are done by edgedb.issubclass(),
+        # which looks the ancestors up in edgedb.type_ancestry, so the
+        # results must follow the changes of the type hierarchy.
+        await self.con.execute("""
+            SET MODULE test;
+
+            CREATE TYPE Anc1;
+            CREATE TYPE Anc2;
+            CREATE TYPE AncOther;
+            CREATE TYPE AncChild EXTENDING Anc1;
+            CREATE TYPE AncGrandChild EXTENDING AncChild;
+
+            INSERT AncChild;
+            INSERT AncGrandChild;
+        """)
+
+        query = r"""
+            WITH MODULE test
+            SELECT AncChild {
+                name := AncChild.__type__.name,
+                is1 := AncChild IS (Anc1, AncOther),
+                is2 := AncChild IS (Anc2, AncOther),
+                is_single1 := AncChild IS Anc1,
+                is_single2 := AncChild IS Anc2,
+            }
+            ORDER BY .name;
+        """
+
+        await self.assert_query_result(query, [[
+            {'name': 'test::AncChild', 'is1': True, 'is2': False,
+             'is_single1': True, 'is_single2': False},
+            {'name': 'test::AncGrandChild', 'is1': True, 'is2': False,
+             'is_single1': True, 'is_single2': False},
+        ]])
+
+        await self.con.execute("""
+            ALTER TYPE test::AncChild EXTENDING test::Anc2;
+        """)
+
+        await self.assert_query_result(query, [[
+            {'name': 'test::AncChild', 'is1': True, 'is2': True,
+             'is_single1': True, 'is_single2': True},
+            {'name': 'test::AncGrandChild', 'is1': True, 'is2': True,
+             'is_single1': True, 'is_single2': True},
+        ]])
+
+        await self.con.execute("""
+            ALTER TYPE test::AncChild DROP EXTENDING test::Anc1;
+        """)
+
+        await self.assert_query_result(query, [[
+            {'name': 'test::AncChild', 'is1': False, 'is2': True,
+             'is_single1': False, 'is_single2': True},
+            {'name': 'test::AncGrandChild', 'is1': False, 'is2': True,
+             'is_single1': False, 'is_single2': True},
+        ]])
+
+    async def test_edgeql_ddl_type_ancestry_02(self):
+        await self.con.execute("""
+            SET MODULE test;
+
+            CREATE TYPE AncBase;
+            CREATE TYPE AncOther2;
+            CREATE TYPE AncDerived EXTENDING AncBase;
+
+            INSERT AncDerived;
+        """)
+
+        query = r"""
+            WITH MODULE test
+            SELECT AncDerived {
+                is_base := AncDerived IS (AncBase, AncOther2),
+                is_std := AncDerived IS (std::Object, AncOther2),
+            };
+        """
+
+        await self.assert_query_result(query, [[
+            {'is_base': True, 'is_std': True},
+        ]])
+
+        # A type re-created with the same name and other bases must
+        # not inherit the ancestry of the deleted one.
+        await self.con.execute("""
+            DROP TYPE test::AncDerived;
+            CREATE TYPE test::AncDerived EXTENDING test::AncOther2;
+            INSERT test::AncDerived;
+        """)
+
+        await self.assert_query_result(query, [[
+            {'is_base': False, 'is_std': True},
+        ]])
+
+        await self.assert_query_result(r"""
+            WITH MODULE test
+            SELECT count(AncBase);
+        """, [
+            [0],
+        ])
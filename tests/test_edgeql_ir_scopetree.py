@@ -24,6 +24,7 @@ import textwrap
 from edb.lang import _testbase as tb
 
 from edb.lang.edgeql import compiler, errors
+from edb.lang.ir import pathid, scopetree
 
 
 class TestEdgeQLIRScopeTree(tb.BaseEdgeQLCompilerTest):
@@ -48,6 +49,137 @@ class TestEdgeQLIRScopeTree(tb.BaseEdgeQLCompilerTest):
                 f'\nEXPECTED:\n{expected_scope}\nACTUAL:\n{path_scope}'
                 f'\nDIFF:\n{diff}')
 
+    def _walk_find_visible(self, node, path_id):
+        # The lookup by tree walk that the index replaces.
+        namespaces = set()
+
+        for ancestor, ans in node.ancestors_and_namespaces:
+            if scopetree._paths_equal(ancestor.path_id, path_id, namespaces):
+                return ancestor
+
+            for child in ancestor.children:
+                if scopetree._paths_equal(child.path_id, path_id, namespaces):
+                    return child
+
+            namespaces |= ans
+
+        return None
+
+    def _walk_find_by_unique_id(self, node, unique_id):
+        for descendant in node.descendants:
+            if descendant.unique_id == unique_id:
+                return descendant
+
+        return None
+
+    def assert_lookups_match_walk(self, tree, path_ids, unique_ids):
+        # Nodes that left the tree must also be dropped from the index.
+        index = tree._get_index()
+        rebuilt = scopetree._ScopeTreeIndex()
+        rebuilt.add_subtree(tree)
+        self.assertEqual(index.paths, rebuilt.paths)
+        self.assertEqual(index.unique_ids, rebuilt.unique_ids)
+
+        for node in tree.descendants:
+            for path_id in path_ids:
+                self.assertIs(
+                    node.find_visible(path_id),
+                    self._walk_find_visible(node, path_id),
+                    f'find_visible({path_id}) in {node!r}')
+
+            for unique_id in unique_ids:
+                self.assertIs(
+                    node.find_by_unique_id(unique_id),
+                    self._walk_find_by_unique_id(node, unique_id),
+                    f'find_by_unique_id({unique_id}) in {node!r}')
+
+    def test_edgeql_ir_scope_tree_index_01(self):
+        user = self.schema.get('test::User')
+        user_id = pathid.PathId(user)
+        deck_id = user_id.extend(user.getptr(self.schema, 'deck'))
+        card_id = pathid.PathId(self.schema.get('test::Card'))
+        ns_card_id = card_id.replace_namespace({'ns'})
+
+        path_ids = [user_id, deck_id, card_id, ns_card_id,
+                    user_id.replace_namespace({'ns'})]
+        unique_ids = range(8)
+
+        root = scopetree.ScopeTreeNode(fenced=True)
+        user_node = scopetree.ScopeTreeNode(path_id=user_id, unique_id=1)
+        root.attach_child(user_node)
+        fence1 = root.attach_fence()
+        fence1.unique_id = 2
+        deck_node = scopetree.ScopeTreeNode(path_id=deck_id, unique_id=3)
+        fence1.attach_child(deck_node)
+        fence2 = fence1.attach_fence()
+        fence2.unique_id = 4
+        fence2.namespaces.add('ns')
+        fence2.attach_child(
+            scopetree.ScopeTreeNode(path_id=ns_card_id, unique_id=5))
+        fence3 = fence2.attach_fence()
+        fence3.attach_child(
+            scopetree.ScopeTreeNode(path_id=card_id, unique_id=6))
+
+        # The first lookup builds the index, which must then be kept
+        # up to date by every modification below.
+        self.assert_lookups_match_walk(root, path_ids, unique_ids)
+        self.assertEqual(fence3.find_visible(card_id).unique_id, 6)
+        self.assertIsNone(fence1.find_visible(card_id))
+
+        # Move a subtree.
+        root.attach_child(fence2)
+        self.assertIs(fence2.parent, root)
+        self.assert_lookups_match_walk(root, path_ids, unique_ids)
+
+        # Fence a node.
+        user_node.attach_fence().attach_child(deck_node)
+        self.assertIsNot(deck_node.parent, fence1)
+        self.assert_lookups_match_walk(root, path_ids, unique_ids)
+
+        # Change the indexed attributes.
+        deck_node.path_id = card_id
+        deck_node.unique_id = 7
+        fence1.unique_id = None
+        self.assert_lookups_match_walk(root, path_ids, unique_ids)
+
+        # Remove a subtree: both trees are indexed separately.
+        fence2.remove()
+        self.assertIsNone(root.find_by_unique_id(5))
+        self.assertEqual(fence2.find_by_unique_id(5).path_id, ns_card_id)
+        self.assert_lookups_match_walk(root, path_ids, unique_ids)
+        self.assert_lookups_match_walk(fence2, path_ids, unique_ids)
+
+        # Modify the detached subtree and attach it back.
+        fence3.unique_id = 3
+        fence1.attach_child(fence2)
+        self.assert_lookups_match_walk(root, path_ids, unique_ids)
+
+        root.remove_descendants(card_id)
+        self.assertIsNone(root.find_by_unique_id(7))
+        self.assert_lookups_match_walk(root, path_ids, unique_ids)
+
+    def test_edgeql_ir_scope_tree_index_02(self):
+        ir = compiler.compile_to_ir('''
+            WITH
+                MODULE test,
+                U2 := User
+            SELECT User {
+                name,
+                deck: {
+                    name,
+                    owners := (SELECT User FILTER User.deck = Card)
+                } FILTER .element = 'Fire'
+            }
+            FILTER User.name = 'Alice' AND EXISTS U2.deck
+        ''', self.schema)
+
+        tree = ir.scope_tree
+        nodes = list(tree.descendants)
+        path_ids = {n.path_id for n in nodes if n.path_id is not None}
+        unique_ids = {n.unique_id for n in nodes if n.unique_id is not None}
+
+        self.assert_lookups_match_walk(tree, path_ids, unique_ids)
+
     def test_edgeql_ir_scope_tree_01(self):
         """
         WITH MODULE test
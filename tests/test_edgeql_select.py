@@ -1145,6 +1145,36 @@ class TestEdgeQLSelect(tb.QueryTestCase):
             ],
         ])
 
+    async def test_edgeql_select_instance_04(self):
+        await self.assert_query_result(r'''
+            WITH MODULE test
+            SELECT
+                count(Named) =
+                count((SELECT Named FILTER Named IS Dictionary)) +
+                count((SELECT Named FILTER Named IS NOT Dictionary));
+
+            WITH MODULE test
+            SELECT
+                count((SELECT Named FILTER Named IS Dictionary)) =
+                count(User) + count(Status) + count(Priority);
+        ''', [
+            [True],
+            [True],
+        ])
+
+    async def test_edgeql_select_instance_05(self):
+        await self.assert_sorted_query_result(r'''
+            WITH MODULE test
+            SELECT (Text[IS Issue].number, Text.body);
+        ''', lambda x: x[0], [
+            [
+                ['1', 'Initial public release of EdgeDB.'],
+                ['2', 'We need to be able to render data in tabular format.'],
+                ['3', 'Minor lexer tweaks.'],
+                ['4', 'Fix regression introduced by lexer tweak.'],
+            ],
+        ])
+
     @unittest.expectedFailure
     async def test_edgeql_select_setops_01(self):
         await self.assert_sorted_query_result(r"""
@@ -4184,3 +4214,176 @@ class TestEdgeQLSelect(tb.QueryTestCase):
                 WITH MODULE test
                 SELECT User.nam;
             """)
+
+    async def test_edgeql_select_explain_01(self):
+        res = await self.con.execute("""
+            EXPLAIN ANALYZE WITH MODULE test
+            SELECT Issue {
+                name,
+                owner: {
+                    name
+                }
+            } FILTER .owner.name = 'Elvis';
+        """)
+
+        explain = res[0][0]
+        self.assertIn('SELECT', explain['sql'])
+        self.assertIn('Actual Rows', explain['plan'][0]['Plan'])
+        self.assertGreater(explain['timings']['compile_eql_to_ir'], 0)
+
+        paths = set()
+        for rvar_paths in explain['paths'].values():
+            paths.update(rvar_paths)
+        self.assertIn('(test::Issue)', paths)
+
+    async def test_edgeql_select_explain_02(self):
+        await self.con.execute("""
+            EXPLAIN ANALYZE WITH MODULE test
+            INSERT Status {
+                name := 'explained'
+            };
+        """)
+
+        # EXPLAIN ANALYZE has no side effects.
+        await self.assert_query_result("""
+            WITH MODULE test
+            SELECT Status FILTER .name = 'explained';
+        """, [
+            [],
+        ])
+
+    async def test_edgeql_select_explain_03(self):
+        res = await self.con.execute("""
+            EXPLAIN ANALYZE WITH MODULE test
+            SELECT Issue {
+                name,
+                watchers: {
+                    name
+                }
+            } ORDER BY .number OFFSET 2 LIMIT 1;
+        """)
+
+        def subplans(node):
+            for child in node.get('Plans', ()):
+                if child.get('Parent Relationship') == 'SubPlan':
+                    yield child
+                yield from subplans(child)
+
+        # The shape must only be computed for the returned object,
+        # and not for the objects skipped by OFFSET.
+        plan = res[0][0]['plan'][0]['Plan']
+        loops = [node['Actual Loops'] for node in subplans(plan)]
+        self.assertTrue(loops)
+        self.assertEqual(max(loops), 1)
+
+    async def test_edgeql_select_explain_04(self):
+        def relations(node):
+            if 'Relation Name' in node:
+                yield node['Relation Name']
+            for child in node.get('Plans', ()):
+                yield from relations(child)
+
+        for query in ['SELECT Text[IS Issue].number',
+                      'SELECT (Text[IS Issue].number, Text.body)']:
+            res = await self.con.execute(f"""
+                EXPLAIN WITH MODULE test {query};
+            """)
+
+            # Text elements that are not Issues cannot be in the
+            # result, so the other Text tables must not be scanned.
+            plan = res[0][0]['plan'][0]['Plan']
+            self.assertEqual(set(relations(plan)), {'Issue_data'}, query)
+
+    async def test_edgeql_select_batch_shapes_01(self):
+        def sort_links(data):
+            # Multi links are unordered, so compare them as sorted lists.
+            if isinstance(data, dict):
+                return {k: sort_links(v) for k, v in data.items()}
+            elif isinstance(data, list):
+                return sorted((sort_links(el) for el in data), key=repr)
+            else:
+                return data
+
+        queries = [
+            '''
+            SELECT User {
+                name,
+                todo: {
+                    number,
+                    watchers: {name}
+                }
+            } ORDER BY .name;
+            ''',
+            '''
+            SELECT User {
+                name,
+                todo: {number}
+            } FILTER .name = 'Elvis';
+            ''',
+            '''
+            SELECT Issue {
+                number,
+                watchers: {name},
+                related_to: {number}
+            } ORDER BY .number OFFSET 1 LIMIT 2;
+            ''',
+            '''
+            SELECT Issue {
+                number,
+                owner: {
+                    name,
+                    todo: {number}
+                },
+                watchers: {
+                    name,
+                    todo: {number}
+                }
+            } FILTER .status.name = 'Open' ORDER BY .number;
+            ''',
+        ]
+
+        for query in queries:
+            query = f'WITH MODULE test {query}'
+            res = await self.con.execute(query)
+            batched = await self.con.execute(query, flags={'batch_shapes'})
+
+            self.assertEqual(
+                [[sort_links(el) for el in r] for r in batched],
+                [[sort_links(el) for el in r] for r in res],
+                query)
+
+        res = await self.con.execute('''
+            WITH MODULE test
+            SELECT User {
+                name,
+                todo: {number}
+            } FILTER .name = 'Elvis';
+        ''', flags={'batch_shapes'})
+
+        self.assertEqual(sort_links(res), [[{
+            'name': 'Elvis',
+            'todo': [{'number': '1'}, {'number': '2'}],
+        }]])
+
+    async def test_edgeql_select_batch_shapes_02(self):
+        res = await self.con.execute("""
+            EXPLAIN ANALYZE WITH MODULE test
+            SELECT User {
+                name,
+                todo: {
+                    number,
+                    watchers: {name}
+                }
+            } FILTER .name = 'Elvis';
+        """, flags={'batch_shapes'})
+
+        def group_rows(node):
+            if node['Node Type'] == 'Aggregate' and 'Group Key' in node:
+                yield node['Actual Rows']
+            for child in node.get('Plans', ()):
+                yield from group_rows(child)
+
+        # The links must only be aggregated for the selected user
+        # and for the issues of that user, not for all objects.
+        plan = res[0][0]['plan'][0]['Plan']
+        self.assertEqual(sorted(group_rows(plan)), [1, 2])
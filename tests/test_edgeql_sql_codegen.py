@@ -0,0 +1,233 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+
+from edb.lang import _testbase as tb
+
+from edb.lang.edgeql import compiler
+
+from edb.server.pgsql import ast as pgast
+from edb.server.pgsql import compiler as pg_compiler
+from edb.server.pgsql.compiler import ctes
+
+
+class TestEdgeQLSQLCodegen(tb.BaseEdgeQLCompilerTest):
+    """Unit tests for the SQL generated from EdgeQL."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'issues.eschema')
+
+    def _compile(self, source, *, arg_types=None,
+                 output_format=pg_compiler.OutputFormat.JSON, **kwargs):
+        ir = compiler.compile_to_ir(
+            source, self.schema, arg_types=arg_types)
+        qtree = pg_compiler.compile_ir_to_sql_tree(
+            ir, schema=self.schema, output_format=output_format, **kwargs)
+        text, argmap = pg_compiler.generate_sql(qtree, pretty=False)
+        return text, argmap, qtree.constants
+
+    def test_edgeql_sql_codegen_constants_01(self):
+        text1, argmap1, constants1 = self._compile('''
+            WITH MODULE test
+            SELECT Issue {name}
+            FILTER .owner.name = 'Elvis' AND .time_estimate > 1000
+            LIMIT 2
+        ''', extract_constants=True)
+
+        text2, argmap2, constants2 = self._compile('''
+            WITH MODULE test
+            SELECT Issue {name}
+            FILTER .owner.name = 'Yury' AND .time_estimate > 3000
+            LIMIT 10
+        ''', extract_constants=True)
+
+        self.assertEqual(text1, text2)
+        self.assertEqual(argmap1, argmap2)
+        self.assertEqual(list(constants1), list(argmap1))
+        self.assertEqual(list(constants2), list(argmap2))
+        self.assertEqual(list(constants1.values()), ['Elvis', 1000, 2])
+        self.assertEqual(list(constants2.values()), ['Yury', 3000, 10])
+
+        self.assertNotIn('Elvis', text1)
+        self.assertNotIn('Yury', text2)
+
+    def test_edgeql_sql_codegen_constants_02(self):
+        text1, argmap1, constants1 = self._compile('''
+            WITH MODULE test
+            SELECT Issue {name} FILTER .owner.name = 'Elvis'
+        ''')
+
+        text2, argmap2, constants2 = self._compile('''
+            WITH MODULE test
+            SELECT Issue {name} FILTER .owner.name = 'Yury'
+        ''')
+
+        # Literals are inlined unless extraction is requested.
+        self.assertNotEqual(text1, text2)
+        self.assertIn('Elvis', text1)
+        self.assertEqual(argmap1, {})
+        self.assertEqual(constants1, {})
+
+    def test_edgeql_sql_codegen_constants_03(self):
+        text, argmap, constants = self._compile('''
+            WITH MODULE test
+            SELECT Issue {name}
+            FILTER .owner.name = $name AND .time_estimate > 1000
+        ''', arg_types={'name': self.schema.get('std::str')},
+            extract_constants=True)
+
+        self.assertEqual(list(argmap), ['name', '~const0'])
+        self.assertEqual(constants, {'~const0': 1000})
+
+    def _select_from_cte(self, cte_query, *, refs=1):
+        """Return a query reading the CTE of *cte_query* *refs* times."""
+        cte = pgast.CommonTableExpr(name='c', query=cte_query)
+
+        return pgast.SelectStmt(
+            ctes=[cte],
+            target_list=[
+                pgast.ResTarget(val=pgast.ColumnRef(name=[pgast.Star()])),
+            ],
+            from_clause=[
+                pgast.RangeVar(
+                    relation=cte, alias=pgast.Alias(aliasname=f'c{i}'))
+                for i in range(refs)
+            ],
+        )
+
+    def _select_func(self, *name):
+        return pgast.SelectStmt(
+            target_list=[
+                pgast.ResTarget(val=pgast.FuncCall(name=name, args=[])),
+            ],
+        )
+
+    def test_edgeql_sql_codegen_inline_ctes_01(self):
+        query = self._select_from_cte(self._select_func('edgedb', 'f'))
+        cte_query = query.ctes[0].query
+
+        ctes.inline_ctes(query)
+
+        # A SELECT used once is inlined as a subquery.
+        self.assertEqual(query.ctes, [])
+        self.assertIsInstance(query.from_clause[0], pgast.RangeSubselect)
+        self.assertIs(query.from_clause[0].subquery, cte_query)
+        self.assertEqual(query.from_clause[0].alias.aliasname, 'c0')
+
+        text, _ = pg_compiler.generate_sql(query, pretty=False)
+        self.assertNotIn('WITH', text)
+
+    def test_edgeql_sql_codegen_inline_ctes_02(self):
+        query = self._select_from_cte(
+            self._select_func('edgedb', 'f'), refs=2)
+        cte = query.ctes[0]
+
+        ctes.inline_ctes(query)
+
+        # CTEs used more than once are not computed repeatedly.
+        self.assertEqual(query.ctes, [cte])
+        for rvar in query.from_clause:
+            self.assertIsInstance(rvar, pgast.RangeVar)
+            self.assertIs(rvar.relation, cte)
+
+    def test_edgeql_sql_codegen_inline_ctes_03(self):
+        for name in [('random',), ('edgedb', 'uuid_generate_v4'),
+                     ('public', 'f')]:
+            with self.subTest(name=name):
+                query = self._select_from_cte(self._select_func(*name))
+                cte = query.ctes[0]
+
+                ctes.inline_ctes(query)
+
+                # Volatile functions and functions of unknown
+                # volatility must be called as many times as the
+                # query text implies.
+                self.assertEqual(query.ctes, [cte])
+                self.assertIsInstance(query.from_clause[0], pgast.RangeVar)
+
+    def test_edgeql_sql_codegen_inline_ctes_04(self):
+        insert = pgast.InsertStmt(
+            relation=pgast.RangeVar(
+                relation=pgast.Relation(schemaname='edgedb', name='t')),
+            select_stmt=self._select_func('edgedb', 'f'),
+        )
+        query = self._select_from_cte(insert)
+        cte = query.ctes[0]
+
+        ctes.inline_ctes(query)
+
+        # Data-modifying statements must stay in WITH.
+        self.assertEqual(query.ctes, [cte])
+        self.assertIsInstance(query.from_clause[0], pgast.RangeVar)
+
+    def test_edgeql_sql_codegen_batch_shapes_01(self):
+        text, _, _ = self._compile('''
+            WITH MODULE test
+            SELECT User {
+                name,
+                todo: {number}
+            }
+            FILTER .name = 'Elvis'
+        ''', batch_shapes=True)
+
+        # The grouped query is restricted to the selected users
+        # rather than correlated with every one of them.
+        self.assertIn('= ANY (', text)
+        self.assertNotIn('JOIN LATERAL', text)
+
+    def test_edgeql_sql_codegen_json_01(self):
+        query = '''
+            WITH MODULE test
+            SELECT User {
+                name,
+                todo: {number},
+                tup := (1, 'a')
+            }
+        '''
+
+        text, _, _ = self._compile(query)
+
+        # JSON output is built as json directly, without a round trip
+        # through jsonb.
+        self.assertIn('json_build_object(', text)
+        self.assertIn('json_build_array(', text)
+        self.assertIn('json_agg(', text)
+        self.assertNotIn('jsonb', text)
+
+        text, _, _ = self._compile(
+            query, output_format=pg_compiler.OutputFormat.JSONB)
+
+        self.assertIn('jsonb_build_object(', text)
+        self.assertIn('jsonb_build_array(', text)
+        self.assertNotIn('json_build_object(', text)
+        self.assertNotIn('to_json(', text)
+
+    def test_edgeql_sql_codegen_json_02(self):
+        text, _, _ = self._compile('''
+            WITH MODULE test
+            SELECT array_agg(DISTINCT User {name})
+        ''')
+
+        # There is no equality operator for json, so DISTINCT must
+        # be applied to the identity of the objects, not to their
+        # serialized shapes.
+        self.assertIn('array_agg(json_build_object(', text)
+        self.assertNotIn('array_agg(DISTINCT', text)
+        self.assertIn('DISTINCT ON', text)
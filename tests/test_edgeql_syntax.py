@@ -1985,6 +1985,25 @@ class TestEdgeSchemaParser(EdgeQLSyntaxTest):
         };
         """
 
+    def test_edgeql_syntax_update_08(self):
+        """
+        UPDATE Foo
+        FILTER (Foo.bar = 24)
+        SET {
+            bar += (SELECT Bar FILTER (Bar.name = 'spam')),
+            baz -= (SELECT Baz FILTER (Baz.name = 'ham'))
+        };
+        """
+
+    def test_edgeql_syntax_update_09(self):
+        """
+        UPDATE Foo SET {bar+=Bar, baz-=Baz};
+
+% OK %
+
+        UPDATE Foo SET {bar += Bar, baz -= Baz};
+        """
+
     def test_edgeql_syntax_insertfor_01(self):
         """
         FOR name IN {'a', 'b', 'c'}
@@ -2785,6 +2804,25 @@ class TestEdgeSchemaParser(EdgeQLSyntaxTest):
         SET MODULE default, foo := (SELECT User);
         """
 
+    def test_edgeql_syntax_explain_01(self):
+        """
+        EXPLAIN SELECT User{name} FILTER (User.name = 'foo');
+        EXPLAIN ANALYZE WITH MODULE test SELECT User;
+        EXPLAIN ANALYZE INSERT User{name := 'foo'};
+        """
+
+    @tb.must_fail(errors.EdgeQLSyntaxError,
+                  "Unexpected 'EXPLAIN'", line=2, col=17)
+    def test_edgeql_syntax_explain_02(self):
+        """
+        EXPLAIN EXPLAIN SELECT User;
+        """
+
+    def test_edgeql_syntax_explain_03(self):
+        """
+        SELECT analyze;
+        """
+
     def test_edgeql_syntax_ddl_view_01(self):
         """
         CREATE VIEW Foo := (SELECT User);
@@ -20,6 +20,7 @@
 import os.path
 import unittest
 
+from edb.client import exceptions as exc
 from edb.server import _testbase as tb
 
 
@@ -953,6 +954,139 @@ class TestUpdate(tb.QueryTestCase):
             ],
         ])
 
+    async def test_edgeql_update_multiple_11(self):
+        await self.assert_query_result(r"""
+            WITH MODULE test
+            UPDATE UpdateTest
+            FILTER UpdateTest.name = 'update-test1'
+            SET {
+                tags := (SELECT Tag FILTER Tag.name = 'fun')
+            };
+
+            # add tags, 'fun' is already there
+            WITH MODULE test
+            UPDATE UpdateTest
+            FILTER UpdateTest.name = 'update-test1'
+            SET {
+                tags += (SELECT Tag FILTER Tag.name IN {'fun', 'wow'})
+            };
+
+            WITH MODULE test
+            SELECT UpdateTest {
+                name,
+                tags: {
+                    name
+                } ORDER BY .name
+            } FILTER UpdateTest.name = 'update-test1';
+        """, [
+            [1],
+            [1],
+            [{
+                'name': 'update-test1',
+                'tags': [{
+                    'name': 'fun',
+                }, {
+                    'name': 'wow',
+                }],
+            }],
+        ])
+
+    async def test_edgeql_update_multiple_12(self):
+        await self.assert_query_result(r"""
+            WITH MODULE test
+            UPDATE UpdateTest
+            FILTER UpdateTest.name = 'update-test1'
+            SET {
+                tags := (SELECT Tag)
+            };
+
+            # remove tags, 'boring' and 'wow' remain
+            WITH MODULE test
+            UPDATE UpdateTest
+            FILTER UpdateTest.name = 'update-test1'
+            SET {
+                tags -= (SELECT Tag FILTER Tag.name = 'fun')
+            };
+
+            WITH MODULE test
+            SELECT UpdateTest {
+                name,
+                tags: {
+                    name
+                } ORDER BY .name
+            } FILTER UpdateTest.name = 'update-test1';
+        """, [
+            [1],
+            [1],
+            [{
+                'name': 'update-test1',
+                'tags': [{
+                    'name': 'boring',
+                }, {
+                    'name': 'wow',
+                }],
+            }],
+        ])
+
+    async def test_edgeql_update_multiple_13(self):
+        await self.assert_query_result(r"""
+            WITH MODULE test
+            UPDATE UpdateTest
+            FILTER UpdateTest.name = 'update-test1'
+            SET {
+                tags := (SELECT Tag FILTER Tag.name IN {'fun', 'wow'})
+            };
+
+            # 'wow' is kept, 'fun' is replaced with 'boring'
+            WITH MODULE test
+            UPDATE UpdateTest
+            FILTER UpdateTest.name = 'update-test1'
+            SET {
+                tags := (SELECT Tag FILTER Tag.name IN {'boring', 'wow'})
+            };
+
+            WITH MODULE test
+            SELECT UpdateTest {
+                name,
+                tags: {
+                    name
+                } ORDER BY .name
+            } FILTER UpdateTest.name = 'update-test1';
+        """, [
+            [1],
+            [1],
+            [{
+                'name': 'update-test1',
+                'tags': [{
+                    'name': 'boring',
+                }, {
+                    'name': 'wow',
+                }],
+            }],
+        ])
+
+    async def test_edgeql_update_multiple_14(self):
+        with self.assertRaisesRegex(
+                exc.EdgeQLError,
+                r"\+= cannot be applied to the singular link 'status'"):
+            await self.con.execute(r"""
+                WITH MODULE test
+                UPDATE UpdateTest
+                SET {
+                    status += (SELECT Status FILTER Status.name = 'Open')
+                };
+            """)
+
+        with self.assertRaisesRegex(
+                exc.EdgeQLError, r'-= is only allowed in UPDATE shapes'):
+            await self.con.execute(r"""
+                WITH MODULE test
+                INSERT UpdateTest {
+                    name := 'update-test-bad',
+                    tags -= (SELECT Tag)
+                };
+            """)
+
     async def test_edgeql_update_props_01(self):
         await self.assert_query_result(r"""
             WITH MODULE test
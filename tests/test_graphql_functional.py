@@ -17,8 +17,10 @@
 #
 
 
+import hashlib
 import uuid
 
+from edb.client import exceptions as exc
 from edb.server import _testbase as tb
 
 
@@ -465,3 +467,108 @@ class TestGraphQLFunctional(tb.QueryTestCase):
                 }
             }
         }]])
+
+    async def test_graphql_functional_persisted_01(self):
+        query_hash = await self.con.register_graphql(r"""
+            query($name: String) {
+                User(name: $name) {
+                    name
+                    age
+                }
+            }
+        """)
+
+        result = await self.con.execute_persisted(
+            query_hash, variables={'name': 'John'})
+
+        self.assert_data_shape(result, [[{
+            'User': [{
+                'name': 'John',
+                'age': 25,
+            }],
+        }]])
+
+        result = await self.con.execute_persisted(
+            query_hash, variables={'name': 'Jane'})
+
+        self.assert_data_shape(result, [[{
+            'User': [{
+                'name': 'Jane',
+                'age': 26,
+            }],
+        }]])
+
+    async def test_graphql_functional_persisted_02(self):
+        query = r"""
+            query($groups: Boolean!) {
+                User(name: "John") {
+                    name
+                    groups @include(if: $groups) {
+                        name
+                    }
+                }
+            }
+        """
+
+        with self.assertRaisesRegex(
+                exc.PersistedQueryNotFoundError, 'is not registered'):
+            await self.con.execute_persisted(
+                '0' * 64, variables={'groups': True})
+
+        with self.assertRaisesRegex(
+                exc.PersistedQueryHashMismatchError, 'mismatch'):
+            await self.con.execute_persisted(
+                '0' * 64, query=query, variables={'groups': True})
+
+        # Register on first use.
+        query_hash = hashlib.sha256(query.encode('utf-8')).hexdigest()
+        result = await self.con.execute_persisted(
+            query_hash, query=query, variables={'groups': True})
+
+        self.assert_data_shape(result, [[{
+            'User': [{
+                'name': 'John',
+                'groups': [{
+                    'name': 'basic',
+                }],
+            }],
+        }]])
+
+        result = await self.con.execute_persisted(
+            query_hash, variables={'groups': False})
+
+        self.assert_data_shape(result, [[{
+            'User': [{
+                'name': 'John',
+            }],
+        }]])
+
+    async def test_graphql_functional_variables_01(self):
+        query = r"""
+            query($name: String, $age: Int = 26) {
+                User(name: $name, age: $age) {
+                    name
+                    age
+                }
+            }
+        """
+
+        result = await self.con.execute(
+            query, graphql=True, variables={'name': 'Jane'})
+
+        self.assert_data_shape(result, [[{
+            'User': [{
+                'name': 'Jane',
+                'age': 26,
+            }],
+        }]])
+
+        result = await self.con.execute(
+            query, graphql=True, variables={'name': 'John', 'age': 25})
+
+        self.assert_data_shape(result, [[{
+            'User': [{
+                'name': 'John',
+                'age': 25,
+            }],
+        }]])
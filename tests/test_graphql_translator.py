@@ -22,11 +22,13 @@ import os
 import re
 import textwrap
 import unittest  # NOQA
+import uuid
 
 from edb.lang import _testbase as tb
 from edb.lang.common import markup
 from edb.lang import graphql as edge_graphql
 from edb.lang import edgeql as edge_edgeql
+from edb.lang.graphql import types as gql_types
 from edb.lang.graphql.errors import GraphQLValidationError, GraphQLCoreError
 from edb.lang.schema import declarative as s_decl
 from edb.lang.schema import std as s_std
@@ -3825,3 +3827,80 @@ class TestGraphQLTranslation(TranslatorTest):
             }
           }
         """
+
+    def test_graphql_translation_cache_01(self):
+        query = r"""
+            query($val: Boolean!) {
+                User {
+                    name @include(if: $val),
+                    id
+                }
+            }
+        """
+
+        modules = {'test', 'default'}
+
+        with_name = edge_graphql.translate_ast(
+            self.schema, query, variables={'$val': True}, modules=modules)
+        without_name = edge_graphql.translate_ast(
+            self.schema, query, variables={'$val': False}, modules=modules)
+
+        self.assertEqual(with_name[0].critvars, [('$val', True)])
+        self.assertEqual(without_name[0].critvars, [('$val', False)])
+        self.assertNotEqual(
+            edge_edgeql.generate_source(with_name[0].stmt),
+            edge_edgeql.generate_source(without_name[0].stmt))
+
+        cached = edge_graphql.translate_ast(
+            self.schema, query, variables={'$val': True}, modules=modules)
+
+        # Cached translations are returned as copies.
+        self.assertIsNot(cached[0].stmt, with_name[0].stmt)
+        self.assertEqual(
+            edge_edgeql.generate_source(cached[0].stmt),
+            edge_edgeql.generate_source(with_name[0].stmt))
+
+    def test_graphql_translation_cache_02(self):
+        query = r"""
+            query($name: String, $age: Int = 20) {
+                User(name: $name, age: $age) {
+                    id
+                }
+            }
+        """
+
+        modules = {'test', 'default'}
+
+        first = edge_graphql.translate_ast(
+            self.schema, query, variables={'$name': 'John'}, modules=modules)
+        second = edge_graphql.translate_ast(
+            self.schema, query, variables={'$name': 'Jane'}, modules=modules)
+
+        # Non-critical variables are query parameters, so the
+        # translation does not depend on their values.
+        self.assertEqual(first[0].critvars, [])
+        self.assertEqual(
+            edge_edgeql.generate_source(first[0].stmt),
+            edge_edgeql.generate_source(second[0].stmt))
+
+        self.assertEqual(
+            {k: v.name for k, v in first[0].argtypes.items()},
+            {'name': 'std::str', 'age': 'std::int64'})
+        self.assertEqual(first[0].argdefaults, {'age': 20})
+
+    def test_graphql_translation_cache_03(self):
+        modules = {'test', 'default'}
+        version = uuid.uuid4()
+
+        # Schema objects of the same version, e.g. the ones introspected
+        # by different connections, share the cached GraphQL schema.
+        core = gql_types.get_core_schema(
+            self.schema, modules, schema_version=version)
+        self.assertIs(
+            gql_types.get_core_schema(
+                self.schema.get_overlay(), modules, schema_version=version),
+            core)
+        self.assertIsNot(
+            gql_types.get_core_schema(
+                self.schema, modules, schema_version=uuid.uuid4()),
+            core)
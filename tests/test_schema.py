@@ -19,6 +19,8 @@
 
 from edb.lang import _testbase as tb
 from edb.lang.schema import error as s_err
+from edb.lang.schema import name as s_name
+from edb.lang.schema import objtypes as s_objtypes
 from edb.lang.schema import pointers as s_pointers
 
 
@@ -129,3 +131,51 @@ class TestSchema(tb.BaseSchemaTest):
         obj = schema.get('test::Object')
         self.assertEqual(obj.getptr(schema, 'foo_plus_bar').cardinality,
                          s_pointers.PointerCardinality.ManyToMany)
+
+    def test_schema_overlay_01(self):
+        schema = self.load_schema("""
+            type Object:
+                property foo -> str
+        """)
+
+        obj = schema.get('test::Object')
+        overlay = schema.get_overlay()
+
+        view = s_objtypes.ObjectType(
+            name=s_name.Name(module='test', name='View'))
+        overlay.add(view)
+        overlay.delete(obj)
+
+        self.assertIs(overlay.get('test::View'), view)
+        self.assertIsNone(overlay.get('test::Object', default=None))
+        self.assertNotIn(
+            obj, list(overlay.get_module('test').get_objects()))
+
+        # The base schema must not be affected by the overlay.
+        self.assertIs(schema.get('test::Object'), obj)
+        self.assertIsNone(schema.get('test::View', default=None))
+        self.assertIn(
+            obj, list(schema.get_module('test').get_objects()))
+
+    def test_schema_overlay_02(self):
+        schema = self.load_schema("""
+            type A
+            type B
+            type C
+        """)
+
+        a, b, c = (schema.get(f'test::{n}') for n in 'ABC')
+        virt = s_objtypes.ObjectType(
+            name=s_name.Name(module='test', name='Virtual'),
+            is_abstract=True, is_virtual=True)
+        schema.add(virt)
+        schema.update_virtual_inheritance(virt, [a, b])
+
+        overlay = schema.get_overlay()
+        overlay.update_virtual_inheritance(virt, [a, c])
+
+        self.assertEqual(virt.children(overlay), {a, c})
+
+        # The base schema must not be affected by the overlay.
+        self.assertEqual(virt._virtual_children, {a, b})
+        self.assertEqual(virt.children(schema), {a, b})
@@ -0,0 +1,112 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import os.path
+
+from edb.client import exceptions as exc
+from edb.server import _testbase as tb
+
+
+class TestServerCompilerPool(tb.QueryTestCase):
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'issues.eschema')
+
+    SETUP = os.path.join(os.path.dirname(__file__), 'schemas',
+                         'issues_setup.eql')
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool_server = tb.start_server(cls.cluster, compiler_pool_size=2)
+        cls.pool_con = cls.loop.run_until_complete(
+            cls.pool_server.connect(
+                database=cls.get_database_name(), user='edgedb',
+                loop=cls.loop))
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            cls.pool_con.close()
+            cls.loop.run_until_complete(asyncio.sleep(0, loop=cls.loop))
+            cls.pool_server.stop()
+        finally:
+            super().tearDownClass()
+
+    async def _get_compilations(self):
+        stats = await self.pool_con.get_server_stats()
+        return stats['pool_compilations'], stats['local_compilations']
+
+    async def test_server_compiler_pool_01(self):
+        query = '''
+            WITH MODULE test
+            SELECT User {
+                name,
+                todo: {number} ORDER BY .number
+            } ORDER BY .name;
+        '''
+
+        pool_before, local_before = await self._get_compilations()
+        res = await self.pool_con.execute(query)
+        pool_after, local_after = await self._get_compilations()
+
+        self.assertEqual(pool_after, pool_before + 1)
+        self.assertEqual(local_after, local_before)
+        self.assertEqual(res, await self.con.execute(query))
+
+    async def test_server_compiler_pool_02(self):
+        pool_before, local_before = await self._get_compilations()
+
+        # Errors are reported by compiling the script in the server.
+        with self.assertRaisesRegex(exc.EdgeQLError, 'NotAType'):
+            await self.pool_con.execute('''
+                WITH MODULE test SELECT NotAType;
+            ''')
+
+        pool_after, local_after = await self._get_compilations()
+        self.assertEqual(pool_after, pool_before)
+        self.assertEqual(local_after, local_before + 1)
+
+    async def test_server_compiler_pool_03(self):
+        query = '''
+            WITH MODULE test
+            SELECT PoolTest {name};
+        '''
+
+        with self.assertRaisesRegex(exc.EdgeQLError, 'PoolTest'):
+            await self.pool_con.execute(query)
+
+        await self.pool_con.execute('''
+            CREATE TYPE test::PoolTest {
+                CREATE PROPERTY test::name -> std::str;
+            };
+        ''')
+
+        try:
+            # The workers must re-read the schema after DDL.
+            pool_before, _ = await self._get_compilations()
+            res = await self.pool_con.execute(query)
+            pool_after, _ = await self._get_compilations()
+
+            self.assertEqual(res, [[]])
+            self.assertEqual(pool_after, pool_before + 1)
+        finally:
+            await self.pool_con.execute('''
+                DROP TYPE test::PoolTest;
+            ''')
@@ -0,0 +1,99 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import types
+import unittest
+
+from edb.server import metrics
+from edb.server import querystats
+
+
+class TestServerMetrics(unittest.TestCase):
+
+    def _render(self, stats, **kwargs):
+        return metrics.render(stats, **kwargs).splitlines()
+
+    def test_server_metrics_counters_01(self):
+        stats = querystats.QueryStats()
+        stats.connections = 3
+        stats.errors = 1
+
+        lines = self._render(stats)
+
+        self.assertIn('# TYPE edgedb_connections_total counter', lines)
+        self.assertIn('edgedb_connections_total 3', lines)
+        self.assertIn('edgedb_errors_total 1', lines)
+        self.assertIn('edgedb_statements_total 0', lines)
+        self.assertNotIn('edgedb_compiler_pool_size', '\n'.join(lines))
+
+    def test_server_metrics_gauges_01(self):
+        stats = querystats.QueryStats()
+        stats.connections_active = 2
+        pool = types.SimpleNamespace(size=4, pending=1)
+
+        lines = self._render(stats, compiler_pool=pool)
+
+        self.assertIn('# TYPE edgedb_connections gauge', lines)
+        self.assertIn('edgedb_connections 2', lines)
+        self.assertIn('edgedb_compiler_pool_size 4', lines)
+        self.assertIn('edgedb_compiler_pool_pending 1', lines)
+
+    def test_server_metrics_labels_01(self):
+        stats = querystats.QueryStats()
+        stats.messages['Q'] += 2
+        stats.messages['a\\b"c\nd'] += 1
+
+        lines = self._render(stats)
+
+        self.assertIn('edgedb_messages_total{type="Q"} 2', lines)
+        self.assertIn(r'edgedb_messages_total{type="a\\b\"c\nd"} 1', lines)
+
+    def test_server_metrics_histogram_01(self):
+        stats = querystats.QueryStats()
+        stats.add_timing('execution', 0.003)
+        stats.add_timing('execution', 0.2)
+
+        name = 'edgedb_statement_stage_duration_seconds'
+        lines = self._render(stats)
+        buckets = [
+            line for line in lines
+            if line.startswith(f'{name}_bucket{{stage="execution",')
+        ]
+
+        # Buckets are cumulative, with the bounds in increasing order.
+        self.assertEqual(len(buckets), len(querystats.DURATION_BOUNDS) + 1)
+        self.assertEqual(
+            buckets[0], f'{name}_bucket{{stage="execution",le="0.0001"}} 0')
+        self.assertIn(
+            f'{name}_bucket{{stage="execution",le="0.0025"}} 0', buckets)
+        self.assertIn(
+            f'{name}_bucket{{stage="execution",le="0.005"}} 1', buckets)
+        self.assertIn(
+            f'{name}_bucket{{stage="execution",le="0.1"}} 1', buckets)
+        self.assertIn(
+            f'{name}_bucket{{stage="execution",le="0.25"}} 2', buckets)
+        self.assertEqual(
+            buckets[-1], f'{name}_bucket{{stage="execution",le="+Inf"}} 2')
+        self.assertIn(f'{name}_count{{stage="execution"}} 2', lines)
+        self.assertIn(f'{name}_sum{{stage="execution"}} 0.203', lines)
+
+        # Histograms without labels have no braces in sum and count.
+        self.assertIn('edgedb_ddl_duration_seconds_bucket{le="+Inf"} 0',
+                      lines)
+        self.assertIn('edgedb_ddl_duration_seconds_count 0', lines)
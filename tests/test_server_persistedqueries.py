@@ -0,0 +1,103 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import unittest
+
+from edb.lang.common import exceptions
+from edb.server import persistedqueries
+
+
+class TestPersistedQueries(unittest.TestCase):
+
+    def test_server_persisted_queries_register_01(self):
+        pq = persistedqueries.PersistedQueries()
+        query_hash = pq.register('{ User { name } }')
+
+        self.assertEqual(
+            query_hash, persistedqueries.get_query_hash('{ User { name } }'))
+        self.assertEqual(pq.get_document(query_hash), '{ User { name } }')
+
+        with self.assertRaises(exceptions.PersistedQueryNotFoundError):
+            pq.get_document('0' * 64)
+
+    def test_server_persisted_queries_register_02(self):
+        pq = persistedqueries.PersistedQueries()
+
+        with self.assertRaisesRegex(
+                exceptions.PersistedQueryHashMismatchError, 'mismatch'):
+            pq.register('{ User { name } }', query_hash='0' * 64)
+
+    def test_server_persisted_queries_plans_01(self):
+        pq = persistedqueries.PersistedQueries()
+        query_hash = pq.register('query')
+
+        pq.add_plans('db', query_hash, None, {'$a': 1, '$b': 1}, {'$a'},
+                     ['plan1'])
+        pq.add_plans('db', query_hash, None, {'$a': 2, '$b': 1}, {'$a'},
+                     ['plan2'])
+
+        # Non-critical variables do not affect the choice of the plan.
+        self.assertEqual(
+            pq.get_plans('db', query_hash, None, {'$a': 1, '$b': 2}),
+            ['plan1'])
+        self.assertEqual(
+            pq.get_plans('db', query_hash, None, {'$a': 2}), ['plan2'])
+        self.assertIsNone(
+            pq.get_plans('db', query_hash, None, {'$a': 3}))
+        self.assertIsNone(
+            pq.get_plans('other', query_hash, None, {'$a': 1}))
+
+        pq.invalidate_schema('db')
+        self.assertIsNone(
+            pq.get_plans('db', query_hash, None, {'$a': 1}))
+
+    def test_server_persisted_queries_plans_02(self):
+        pq = persistedqueries.PersistedQueries(max_variants=2)
+        query_hash = pq.register('query')
+
+        for i in range(3):
+            if i == 2:
+                # Use the first variant, so that the second one
+                # is the least recently used.
+                pq.get_plans('db', query_hash, None, {'$a': 0})
+            pq.add_plans('db', query_hash, None, {'$a': i}, {'$a'}, [i])
+
+        self.assertEqual(pq.get_plans('db', query_hash, None, {'$a': 0}), [0])
+        self.assertIsNone(pq.get_plans('db', query_hash, None, {'$a': 1}))
+        self.assertEqual(pq.get_plans('db', query_hash, None, {'$a': 2}), [2])
+
+    def test_server_persisted_queries_plans_03(self):
+        pq = persistedqueries.PersistedQueries(size=3)
+        hash1 = pq.register('query1')
+        hash2 = pq.register('query2')
+
+        for i in range(3):
+            pq.add_plans('db', hash1, None, {'$a': i}, {'$a'}, [i])
+        pq.add_plans('db', hash2, None, {'$a': 0}, {'$a'}, ['q2'])
+
+        # The plans of all documents count against the size.
+        self.assertIsNone(pq.get_plans('db', hash1, None, {'$a': 0}))
+        self.assertEqual(pq.get_plans('db', hash1, None, {'$a': 1}), [1])
+        self.assertEqual(pq.get_plans('db', hash1, None, {'$a': 2}), [2])
+        self.assertEqual(pq.get_plans('db', hash2, None, {'$a': 0}), ['q2'])
+
+        pq.invalidate_schema('db')
+        for i in range(3):
+            pq.add_plans('db', hash2, None, {'$a': i}, {'$a'}, [i])
+        self.assertEqual(pq.get_plans('db', hash2, None, {'$a': 0}), [0])
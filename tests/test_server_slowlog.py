@@ -0,0 +1,94 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import logging
+import random
+import types
+import unittest
+
+from edb.server import protocol
+from edb.server import slowlog
+
+
+class TestServerSlowLog(unittest.TestCase):
+
+    def _record(self, log, *durations):
+        """Record statements taking *durations*, return logged messages."""
+        records = []
+
+        handler = logging.Handler()
+        handler.emit = records.append
+        slowlog.logger.addHandler(handler)
+
+        try:
+            for duration in durations:
+                timer = protocol.Timer()
+                timer.compile_eql_to_ir = duration / 2
+                timer.execution = duration / 2
+                timer.count('result_rows', 1)
+
+                log.record(
+                    database='db', source='SELECT 1;',
+                    plan=types.SimpleNamespace(text='SELECT 1'),
+                    timer=timer)
+        finally:
+            slowlog.logger.removeHandler(handler)
+
+        return [r.getMessage() for r in records]
+
+    def test_server_slowlog_threshold_01(self):
+        log = slowlog.SlowQueryLog(threshold=0.1)
+
+        self.assertEqual(self._record(log, 0.05, 0.099), [])
+
+        messages = self._record(log, 0.2)
+        self.assertEqual(len(messages), 1)
+        self.assertIn(
+            "slow query in 'db': 200.000ms "
+            "(compile 100.000ms, execute 100.000ms)", messages[0])
+        self.assertIn('query: SELECT 1;', messages[0])
+        self.assertIn('sql: SELECT 1', messages[0])
+        self.assertIn('counts: result_rows=1', messages[0])
+
+    def test_server_slowlog_sampling_01(self):
+        log = slowlog.SlowQueryLog(threshold=0, sample_rate=0)
+        self.assertEqual(self._record(log, *[1] * 100), [])
+
+        log = slowlog.SlowQueryLog(threshold=0, sample_rate=1)
+        self.assertEqual(len(self._record(log, *[1] * 100)), 100)
+
+        random.seed(0)
+        log = slowlog.SlowQueryLog(threshold=0, sample_rate=0.5)
+        self.assertTrue(25 < len(self._record(log, *[1] * 100)) < 75)
+
+    def test_server_slowlog_rate_limit_01(self):
+        log = slowlog.SlowQueryLog(threshold=0, rate_limit=2)
+
+        messages = self._record(log, *[1] * 5)
+        self.assertEqual(len(messages), 2)
+        self.assertNotIn('suppressed', messages[0])
+        self.assertNotIn('suppressed', messages[1])
+
+        # Start the next minute.
+        log._period_start -= 60
+
+        messages = self._record(log, *[1] * 3)
+        self.assertEqual(len(messages), 2)
+        self.assertIn('(3 entries suppressed)', messages[0])
+        self.assertNotIn('suppressed', messages[1])
@@ -0,0 +1,101 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import os.path
+
+from edb.client import exceptions as exc
+from edb.server import _testbase as tb
+
+
+class TestServerWorkers(tb.QueryTestCase):
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'issues.eschema')
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.workers_server = tb.start_server(cls.cluster, workers=2)
+        cls.worker_cons = cls.loop.run_until_complete(cls._connect_workers())
+
+    @classmethod
+    async def _connect_workers(cls):
+        # The connections are distributed between the workers by
+        # the kernel, so connect until both workers are connected to.
+        cons = {}
+
+        for _ in range(32):
+            con = await cls.workers_server.connect(
+                database=cls.get_database_name(), user='edgedb',
+                loop=cls.loop)
+            stats = await con.get_server_stats()
+
+            if stats['pid'] in cons:
+                con.close()
+            else:
+                cons[stats['pid']] = con
+                if len(cons) == 2:
+                    break
+
+        return list(cons.values())
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            for con in cls.worker_cons:
+                con.close()
+            cls.loop.run_until_complete(asyncio.sleep(0, loop=cls.loop))
+            cls.workers_server.stop()
+        finally:
+            super().tearDownClass()
+
+    async def test_server_workers_01(self):
+        self.assertEqual(len(self.worker_cons), 2)
+        ddl_con, query_con = self.worker_cons
+
+        query = '''
+            WITH MODULE test
+            SELECT WorkersTest {name};
+        '''
+
+        with self.assertRaisesRegex(exc.EdgeQLError, 'WorkersTest'):
+            await query_con.execute(query)
+
+        await ddl_con.execute('''
+            CREATE TYPE test::WorkersTest {
+                CREATE PROPERTY test::name -> std::str;
+            };
+
+            INSERT test::WorkersTest {
+                name := 'test'
+            };
+        ''')
+
+        try:
+            # The DDL executed in one worker must be visible
+            # in the other one.
+            res = await query_con.execute(query)
+            self.assert_data_shape(res, [[{'name': 'test'}]])
+        finally:
+            await ddl_con.execute('''
+                DROP TYPE test::WorkersTest;
+            ''')
+
+        with self.assertRaisesRegex(exc.EdgeQLError, 'WorkersTest'):
+            await query_con.execute(query)
@@ -117,3 +117,20 @@ class TestSession(tb.QueryTestCase):
 
             [['entity', 'user']]
         ])
+
+    async def test_session_profile_01(self):
+        await self.con.execute("""
+            SET MODULE foo;
+
+            SELECT Entity {name};
+        """)
+
+        profile = self.con.get_last_profile()
+        self.assertEqual(len(profile), 2)
+        self.assertGreater(profile[1]['timings']['compile_eql_to_ir'], 0)
+        self.assertGreater(profile[1]['counts']['ir_sets'], 0)
+        self.assertGreater(profile[1]['counts']['result_size'], 0)
+
+        stats = await self.con.get_server_stats()
+        self.assertGreaterEqual(stats['statements'], 2)
+        self.assertGreaterEqual(stats['stages']['execution']['count'], 2)